@@ -0,0 +1 @@
+# 크롤러 공용 모듈 (HTTP 세션, 요청 제어 등)
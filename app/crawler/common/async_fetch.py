@@ -0,0 +1,107 @@
+import atexit
+import logging
+import os
+import threading
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from urllib.parse import urlparse
+
+from common import metrics, timing
+from common.rate_limiter import get_site_key
+from common.seen_store import is_failed_content
+
+# 호스트별 동시 상세 페이지 요청 수 (요청 간격은 fetch()의 사이트별 토큰 버킷이 제어)
+MAX_PER_HOST = int(os.environ.get("CRAWLER_DETAIL_CONCURRENCY", 4))
+# 프로세스 전체의 상세 페이지 수집 스레드 수 (모든 호출이 하나의 스레드 풀을 나눠 씀)
+MAX_WORKERS = int(os.environ.get("CRAWLER_DETAIL_WORKERS", 16))
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_executor():
+    """상세 페이지 수집용 스레드 풀 (처음 쓸 때 만들고 프로세스가 끝날 때까지 재사용)"""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=MAX_WORKERS, thread_name_prefix="detail")
+        return _executor
+
+
+def shutdown():
+    """진행 중인 상세 수집이 끝나기를 기다린 뒤 스레드 풀 종료 (프로세스 종료 시 자동 호출)"""
+    global _executor
+    with _executor_lock:
+        executor, _executor = _executor, None
+    if executor is not None:
+        executor.shutdown(wait=True)
+
+
+atexit.register(shutdown)
+
+
+def failed_content(error):
+    """get_post_content가 예외를 던졌을 때 대신 돌려줄 결과 (크롤러들이 읽는 키를 모두 포함, failed로 수집 실패 표시)"""
+    return {"text": f"로드 오류: {str(error)}", "images": [], "recommend": "0", "actual_date": None, "post_id": None,
+            "failed": True}
+
+
+def is_failed_result(result):
+    """get_post_content 결과가 수집 실패인지 (failed 표시, 빈 본문 또는 오류 메시지 본문)"""
+    if isinstance(result, dict):
+        return bool(result.get("failed")) or is_failed_content(result.get("text"))
+    return is_failed_content(result)
+
+
+def _fetch_counted(func, url, kwargs):
+    try:
+        # 이 스레드의 fetch/parse_html 시간은 detail_* 단계로 기록
+        with timing.stage("detail"), timing.phase("detail_total"):
+            result = func(url, **kwargs)
+    except Exception as e:
+        # 게시글 하나의 예외가 같은 페이지의 다른 결과까지 버리지 않도록 실패 결과로 대체
+        metrics.inc("crawler_detail_fetch_failures_total", site=get_site_key(url))
+        logging.getLogger("crawler.async_fetch").warning(f"상세 페이지 수집 중 예외: {url}, 오류: {str(e)}")
+        return failed_content(e)
+    if is_failed_result(result):
+        metrics.inc("crawler_detail_fetch_failures_total", site=get_site_key(url))
+    return result
+
+
+def fetch_post_contents(func, urls, max_per_host=None, on_result=None, **kwargs):
+    """상세 페이지 수집 함수(get_post_content)를 호스트별 동시성 제한 하에 공용 스레드 풀에서 병렬 실행
+
+    결과는 입력한 urls 순서대로 반환되므로 기존 순차 루프를 그대로 대체할 수 있다.
+    get_post_content가 예외를 던진 URL은 failed_content() 결과(로드 오류)로 채워지고 나머지 결과는 그대로 남는다.
+    on_result(url, result)는 게시글 하나의 수집이 끝날 때마다 완료된 순서대로 호출된다 (호출한 스레드에서 하나씩).
+    """
+    urls = list(urls)
+    if not urls:
+        return []
+    if max_per_host is None:
+        max_per_host = MAX_PER_HOST
+    executor = get_executor()
+    results = [None] * len(urls)
+    waiting = {}  # 호스트별로 아직 제출하지 않은 urls 인덱스
+    for index, url in enumerate(urls):
+        waiting.setdefault(urlparse(url).netloc.lower(), deque()).append(index)
+    running = {}  # future -> (인덱스, 호스트)
+
+    def submit(host):
+        index = waiting[host].popleft()
+        running[executor.submit(_fetch_counted, func, urls[index], kwargs)] = (index, host)
+
+    # 호스트마다 max_per_host개까지만 제출하고, 하나가 끝나면 같은 호스트의 다음 URL을 제출
+    for host, indexes in waiting.items():
+        for _ in range(min(max_per_host, len(indexes))):
+            submit(host)
+    while running:
+        done, _ = wait(running, return_when=FIRST_COMPLETED)
+        for future in done:
+            index, host = running.pop(future)
+            results[index] = future.result()
+            if on_result is not None:
+                on_result(urls[index], results[index])
+            if waiting[host]:
+                submit(host)
+    return results
@@ -0,0 +1,44 @@
+import os
+import random
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+
+# 재시도 대상 상태 코드
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+# 기본 재시도 횟수 / 지수 백오프 기준 지연 / 최대 지연 (초)
+MAX_RETRIES = int(os.environ.get("CRAWLER_MAX_RETRIES", 2))
+BASE_DELAY = float(os.environ.get("CRAWLER_BACKOFF_BASE", 1.0))
+MAX_DELAY = float(os.environ.get("CRAWLER_BACKOFF_MAX", 60.0))
+
+
+def parse_retry_after(value):
+    """Retry-After 헤더(초 또는 HTTP 날짜)를 대기 시간(초)으로 변환"""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+def backoff_delay(attempt, retry_after=None):
+    """attempt번째 재시도 전 대기 시간 (지수 백오프 + 지터, Retry-After가 있으면 우선)"""
+    if retry_after is not None:
+        return min(retry_after, MAX_DELAY)
+    delay = min(MAX_DELAY, BASE_DELAY * (2 ** (attempt - 1)))
+    return random.uniform(delay / 2, delay)
+
+
+def wait_before_retry(attempt, retry_after=None):
+    """재시도 전 대기 후 실제 대기 시간(초) 반환"""
+    delay = backoff_delay(attempt, retry_after)
+    time.sleep(delay)
+    return delay
@@ -0,0 +1,305 @@
+"""HTTP 기록/재생 (카세트)
+
+record: fetch()로 받은 모든 응답(요청 헤더, 상태 코드, 응답 헤더, 본문, 소요 시간)을 카세트 파일에 기록
+replay: 네트워크 대신 카세트의 응답을 돌려줌 (사이트별 요청 간격 / 재시도 대기 없음, 지연 시간은 설정값)
+
+스케줄러 전체를 기록/재생할 때는 환경 변수로 지정한다 (서브프로세스/워커 프로세스에 그대로 전달됨).
+    CRAWLER_CASSETTE_MODE=record CRAWLER_CASSETTE=/code/data/cassette.db python3 crawler_schedule.py
+
+크롤러 하나를 재생해서 시간을 재거나 프로파일링할 때 (app/crawler 에서, 수집 상태 DB / 기록 파일은 임시 디렉터리를 쓰고
+증분 수집 / 체크포인트 / HTTP 캐시는 꺼서 매번 같은 결과가 나오고 운영 상태를 바꾸지 않음):
+    python3 -m common.cassette record politics/fmkorea_politics.py
+    python3 -m common.cassette replay politics/fmkorea_politics.py --latency 0.05 --profile
+    python3 -m common.cassette info
+"""
+import argparse
+import cProfile
+import importlib
+import importlib.util
+import json
+import logging
+import os
+import pstats
+import random
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+import zlib
+from datetime import datetime
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from common import timing
+from common.isolation import isolate_crawler_state
+
+# 동작 모드 (off / record / replay)
+CASSETTE_MODE = os.environ.get("CRAWLER_CASSETTE_MODE", "off")
+CASSETTE_PATH = os.environ.get("CRAWLER_CASSETTE", "/code/data/cassette.db")
+# 재생 지연 시간: 초("0.2"), 범위("0.05-0.3", 균등 분포), 기록된 시간("recorded"), 기록된 시간의 배수("recorded*0.5")
+CASSETTE_LATENCY = os.environ.get("CRAWLER_CASSETTE_LATENCY", "0")
+
+CRAWLER_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def request_key(url, params=None):
+    """카세트 조회 키 (쿼리 파라미터를 따로 넘긴 요청은 최종 URL로)"""
+    if not params:
+        return url
+    prepared = requests.models.PreparedRequest()
+    prepared.prepare_url(url, params)
+    return prepared.url
+
+
+def parse_latency(spec):
+    """재생 지연 설정을 (기록된 소요 시간 -> 대기 시간(초)) 함수로 변환"""
+    spec = str(spec or "0").strip()
+    if spec.startswith("recorded"):
+        scale = float(spec.split("*", 1)[1]) if "*" in spec else 1.0
+        return lambda recorded: (recorded or 0.0) * scale
+    if "-" in spec:
+        low, high = (float(value) for value in spec.split("-", 1))
+        return lambda recorded: random.uniform(low, high)
+    fixed = float(spec)
+    return lambda recorded: fixed
+
+
+class Cassette:
+    """요청 URL별 응답 기록 (SQLite 파일 하나, 본문은 zlib 압축)
+
+    같은 URL을 여러 번 기록하면 마지막 응답이 남는다. 여러 크롤러 프로세스가 동시에 기록해도 되도록 WAL 모드를 사용한다.
+    """
+
+    def __init__(self, path=None, mode="record", latency=None):
+        self.path = path or CASSETTE_PATH
+        self.mode = mode
+        self.latency = parse_latency(CASSETTE_LATENCY if latency is None else latency)
+        self.lock = threading.Lock()
+        self.misses = 0
+
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS responses (
+                url TEXT PRIMARY KEY,
+                final_url TEXT,
+                status INTEGER NOT NULL,
+                reason TEXT,
+                request_headers TEXT,
+                response_headers TEXT,
+                encoding TEXT,
+                body BLOB NOT NULL,
+                elapsed REAL,
+                recorded_at REAL NOT NULL
+            )
+            """
+        )
+        self.conn.commit()
+
+    @property
+    def replaying(self):
+        return self.mode == "replay"
+
+    @property
+    def recording(self):
+        return self.mode == "record"
+
+    def record(self, url, response, request_headers=None, elapsed=None, params=None):
+        """최종 응답 하나 기록 (304를 캐시로 채운 응답은 채워진 200 응답으로)"""
+        with self.lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO responses (url, final_url, status, reason, request_headers, response_headers, "
+                "encoding, body, elapsed, recorded_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    request_key(url, params),
+                    response.url,
+                    response.status_code,
+                    response.reason,
+                    json.dumps(dict(request_headers or {}), ensure_ascii=False),
+                    json.dumps(dict(response.headers), ensure_ascii=False),
+                    response.encoding,
+                    sqlite3.Binary(zlib.compress(response.content)),
+                    elapsed,
+                    time.time(),
+                ),
+            )
+            self.conn.commit()
+
+    def lookup(self, url, params=None):
+        """기록된 항목 반환 (없으면 None)"""
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT final_url, status, reason, response_headers, encoding, body, elapsed FROM responses WHERE url = ?",
+                (request_key(url, params),),
+            ).fetchone()
+        if row is None:
+            return None
+        return {"url": row[0], "status": row[1], "reason": row[2], "headers": json.loads(row[3] or "{}"),
+                "encoding": row[4], "body": zlib.decompress(row[5]), "elapsed": row[6]}
+
+    def replay(self, url, params=None):
+        """기록된 응답을 requests.Response로 반환 (설정된 지연 후, 기록이 없으면 404)"""
+        entry = self.lookup(url, params)
+        response = requests.Response()
+        if entry is None:
+            with self.lock:
+                self.misses += 1
+            logging.warning(f"카세트에 기록되지 않은 요청, 404로 응답: {request_key(url, params)}")
+            response.status_code = 404
+            response.reason = "Not Recorded"
+            response._content = b""
+            response.url = request_key(url, params)
+            return response
+
+        delay = self.latency(entry["elapsed"])
+        if delay > 0:
+            time.sleep(delay)
+        response.status_code = entry["status"]
+        response.reason = entry["reason"]
+        response.headers = CaseInsensitiveDict(entry["headers"])
+        response._content = entry["body"]
+        response.url = entry["url"] or request_key(url, params)
+        response.encoding = entry["encoding"]
+        response.from_cassette = True
+        return response
+
+    def recorded_at(self):
+        """가장 먼저 기록된 응답의 시각 (재생할 때 크롤러의 '오늘'로 사용, 기록이 없으면 None)"""
+        with self.lock:
+            row = self.conn.execute("SELECT MIN(recorded_at) FROM responses").fetchone()
+        return datetime.fromtimestamp(row[0]) if row and row[0] else None
+
+    def summary(self):
+        """사이트(호스트)별 기록 수 / 본문 크기(압축 후)"""
+        with self.lock:
+            rows = self.conn.execute("SELECT url, status, LENGTH(body) FROM responses").fetchall()
+        hosts = {}
+        for url, status, size in rows:
+            host = requests.utils.urlparse(url).netloc
+            entry = hosts.setdefault(host, {"responses": 0, "errors": 0, "bytes": 0})
+            entry["responses"] += 1
+            entry["errors"] += 1 if status >= 400 else 0
+            entry["bytes"] += size
+        return hosts
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
+
+
+_cassette = None
+_cassette_lock = threading.Lock()
+
+
+def get_cassette():
+    """프로세스 공용 카세트 반환 (CRAWLER_CASSETTE_MODE가 off이면 None)"""
+    global _cassette
+    if CASSETTE_MODE not in ("record", "replay"):
+        return None
+    if _cassette is None:
+        with _cassette_lock:
+            if _cassette is None:
+                _cassette = Cassette(mode=CASSETTE_MODE)
+    return _cassette
+
+
+def use_cassette(mode, path=None, latency=None):
+    """이 프로세스의 기록/재생 모드 전환 (mode가 off이면 해제)"""
+    global _cassette, CASSETTE_MODE
+    with _cassette_lock:
+        if _cassette is not None:
+            _cassette.close()
+        CASSETTE_MODE = mode
+        _cassette = Cassette(path, mode, latency) if mode in ("record", "replay") else None
+    return _cassette
+
+
+def frozen_datetime(moment):
+    """now()가 moment를 돌려주는 datetime 클래스 (재생할 때 크롤러의 '오늘 날짜' 판정을 기록 시점에 맞춤)"""
+
+    class FrozenDatetime(datetime):
+        @classmethod
+        def now(cls, tz=None):
+            return cls(*moment.timetuple()[:6], tzinfo=tz)
+
+    return FrozenDatetime
+
+
+def _load_crawler_module(script_path):
+    module_name = "cassette_" + os.path.splitext(os.path.basename(script_path))[0]
+    spec = importlib.util.spec_from_file_location(module_name, script_path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def run_crawler(script, mode, path=None, latency=None, profile=False):
+    """크롤러 run()을 기록/재생 모드로 한 번 실행하고 (수집 행 수, 소요 시간(초)) 반환"""
+    cassette = use_cassette(mode, path, latency)
+    script_path = script if os.path.isabs(script) else os.path.join(CRAWLER_DIR, script)
+    module = _load_crawler_module(script_path)
+    if cassette.replaying:
+        moment = cassette.recorded_at()
+        if moment is None:
+            raise SystemExit(f"카세트에 기록된 응답이 없습니다: {cassette.path}")
+        # 설정(SPEC)으로 정의된 크롤러는 공용 엔진이 날짜를 판정 (엔진은 http_client를 거쳐 이 모듈을 import하므로 여기서 import)
+        from common import crawl_engine
+        target = crawl_engine if hasattr(module, "SPEC") else module
+        target.datetime = frozen_datetime(moment)
+
+    profiler = cProfile.Profile() if profile else None
+    timing.reset()
+    start_time = time.perf_counter()
+    if profiler:
+        profiler.enable()
+    try:
+        result = module.run()
+    finally:
+        if profiler:
+            profiler.disable()
+    elapsed = time.perf_counter() - start_time
+
+    records = 0 if result is None else len(result)
+    print(f"{os.path.basename(script_path)} ({mode}): {records}건, {elapsed:.2f}초"
+          + (f", 기록 없는 요청 {cassette.misses}건" if cassette.replaying else ""))
+    for name, entry in timing.build_report(script_path)["phases"].items():
+        print(f"  {name:<16} {entry['count']:>6}회  합계 {entry['total']:>9.3f}초  p50 {entry['p50']:.4f}  p99 {entry['p99']:.4f}")
+    if profiler:
+        pstats.Stats(profiler, stream=sys.stdout).sort_stats("cumulative").print_stats(30)
+    return records, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="HTTP 기록/재생으로 크롤러 실행")
+    parser.add_argument("command", choices=("record", "replay", "info"))
+    parser.add_argument("scripts", nargs="*", help="크롤러 스크립트 (app/crawler 기준 경로, 예: hotissue/instiz_issue.py)")
+    parser.add_argument("--cassette", default=None, help=f"카세트 파일 (기본값 {CASSETTE_PATH})")
+    parser.add_argument("--latency", default=None, help="재생 지연 (0.2 / 0.05-0.3 / recorded / recorded*0.5)")
+    parser.add_argument("--profile", action="store_true", help="cProfile 결과 출력 (누적 시간 상위 30개)")
+    args = parser.parse_args()
+
+    if args.command == "info":
+        cassette = Cassette(args.cassette, mode="replay")
+        print(f"{cassette.path} (기록 시작 {cassette.recorded_at()})")
+        for host, entry in sorted(cassette.summary().items()):
+            print(f"  {host:<24} 응답 {entry['responses']:>5}  오류 {entry['errors']:>4}  {entry['bytes'] / 1024:>9.1f}KB")
+        return
+
+    with tempfile.TemporaryDirectory(prefix="crawler_cassette_") as work_dir:
+        # 크롤러 모듈(seen_store 등)을 import하기 전에 운영 상태 DB 대신 임시 디렉터리를 쓰도록 설정
+        isolate_crawler_state(work_dir)
+        # python3 -m common.cassette로 실행하면 이 파일은 __main__ 모듈이라 여기서 use_cassette를 부르면
+        # http_client가 import한 common.cassette에는 카세트가 설정되지 않으므로 그 모듈의 run_crawler를 호출
+        cassette_module = importlib.import_module("common.cassette")
+        for script in args.scripts:
+            cassette_module.run_crawler(script, args.command, args.cassette, args.latency, args.profile)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,250 @@
+"""크롤러별 진행 상황 체크포인트 (중단된 수집을 다음 실행에서 이어서)
+
+상세 페이지 수집이 하나 끝날 때마다 그 결과를, 게시글 처리가 하나 끝날 때마다 그 링크를 (크롤러, 링크) 행 하나로 기록한다.
+수집에 실패한 게시글은 기록하지 않으므로 이어서 수집할 때 다시 요청한다.
+컨테이너 재시작이나 워커 종료로 중단되면 다음 실행은 평소처럼 첫 페이지부터 목록을 다시 훑어 그 사이 올라온 글도 수집하고,
+이전 실행이 끝낸 게시글은 건너뛰며, 상세 수집까지 마친 게시글은 기록된 결과를 다시 요청하지 않고 사용한다.
+끝까지 수집하면 체크포인트를 지운다. 오래된 체크포인트(CHECKPOINT_MAX_AGE_MINUTES, 날짜가 바뀐 경우 포함)는 버리고 처음부터 수집한다.
+
+    checkpoint = Checkpoint.for_script(__file__)
+    data = checkpoint.previous_records()          # 중단된 실행이 기록해 두고 DB에 넣지 못한 게시글
+    ...
+    posts = checkpoint.remaining(posts)           # 중단된 실행이 끝낸 게시글 제외
+    checkpoint.save(page, [post["Link"] for post in posts])
+    contents = checkpoint.fetch_contents(get_post_content, [post["Link"] for post in posts])
+    ... checkpoint.done(post["Link"], content)     # 게시글 하나 수집 완료 (content가 수집 실패 결과면 기록하지 않음)
+    checkpoint.clear()                            # 끝까지 수집
+"""
+import json
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime
+
+from common.async_fetch import fetch_post_contents, is_failed_result
+from common.crawl_log import get_logger
+from common.record_sink import current_run_id, read_records, remove_sink, sink_path
+from common.seen_store import STATE_DB_PATH
+
+# 체크포인트 저장 위치 (기본은 수집 상태 DB와 같은 파일)
+CHECKPOINT_DB_PATH = os.environ.get("CRAWLER_CHECKPOINT_DB", STATE_DB_PATH)
+# 이보다 오래된 체크포인트는 이어서 수집하지 않음 (게시판 목록이 그 사이 많이 밀려남)
+CHECKPOINT_MAX_AGE_MINUTES = float(os.environ.get("CRAWLER_CHECKPOINT_MAX_AGE_MINUTES", 120))
+# 0이면 체크포인트를 쓰지 않고 항상 처음부터 수집
+CHECKPOINT_ENABLED = os.environ.get("CRAWLER_CHECKPOINT", "1") != "0"
+
+
+def _encode(value):
+    """상세 수집 결과를 JSON으로 저장할 때 datetime(루리웹/인벤의 actual_date 등)은 표시해서 저장"""
+    if isinstance(value, datetime):
+        return {"$datetime": value.isoformat()}
+    return str(value)
+
+
+def _decode(obj):
+    return datetime.fromisoformat(obj["$datetime"]) if set(obj) == {"$datetime"} else obj
+
+
+def _expired(updated_at):
+    """이어서 수집하기엔 오래된 체크포인트인지 (CHECKPOINT_MAX_AGE_MINUTES 초과 또는 날짜가 바뀜)"""
+    age_minutes = (time.time() - updated_at) / 60
+    return age_minutes > CHECKPOINT_MAX_AGE_MINUTES or datetime.fromtimestamp(updated_at).date() != datetime.now().date()
+
+
+def resumable_crawlers(path=None):
+    """이어서 수집할 체크포인트가 남아 있는 크롤러 이름 (스케줄러가 재시작 후 바로 실행하는 데 사용)"""
+    if not CHECKPOINT_ENABLED:
+        return set()
+    try:
+        conn = sqlite3.connect(path or CHECKPOINT_DB_PATH, timeout=30)
+        try:
+            rows = conn.execute("SELECT crawler, updated_at FROM crawl_checkpoints").fetchall()
+        finally:
+            conn.close()
+    except sqlite3.Error:
+        # 체크포인트 파일/테이블이 아직 없음
+        return set()
+    return {crawler for crawler, updated_at in rows if not _expired(updated_at)}
+
+
+class Checkpoint:
+    """크롤러 하나의 진행 상황
+
+    crawl_checkpoints: crawler -> 페이지, 마지막 게시글, 남은 상세 URL, 실행 ID, 갱신 시각 (한 행)
+    crawl_checkpoint_posts: (crawler, link) -> 끝낸 게시글 또는 상세 수집 결과 (게시글마다 한 행씩 추가)
+    """
+
+    def __init__(self, script_path, path=None):
+        self.script_path = script_path
+        self.crawler = os.path.splitext(os.path.basename(script_path))[0]
+        self.path = path or CHECKPOINT_DB_PATH
+        self.lock = threading.Lock()
+        self.log = get_logger(self.crawler)
+        self.page = None
+        self.pending = []
+        self.last_post = None
+        self.done_links = set()
+        self.fetched = {}
+
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        # 게시글마다 커밋하므로 커밋마다 fsync하지 않음 (WAL에서는 프로세스가 죽어도 커밋한 기록은 남음)
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS crawl_checkpoints (
+                crawler TEXT PRIMARY KEY,
+                run_id TEXT,
+                page INTEGER NOT NULL,
+                last_post TEXT,
+                pending TEXT,
+                updated_at REAL NOT NULL
+            )
+            """
+        )
+        self.conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS crawl_checkpoint_posts (
+                crawler TEXT NOT NULL,
+                link TEXT NOT NULL,
+                done INTEGER NOT NULL,
+                result TEXT,
+                PRIMARY KEY (crawler, link)
+            )
+            """
+        )
+        self.conn.commit()
+        self.resumed = self._load() if CHECKPOINT_ENABLED else None
+
+    @classmethod
+    def for_script(cls, script_path, **kwargs):
+        """크롤러 스크립트 경로(__file__)로 체크포인트 생성 (이전 체크포인트가 있으면 읽어 둠)"""
+        return cls(script_path, **kwargs)
+
+    def _load(self):
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT run_id, page, last_post, updated_at FROM crawl_checkpoints WHERE crawler = ?",
+                (self.crawler,),
+            ).fetchone()
+            posts = self.conn.execute(
+                "SELECT link, done, result FROM crawl_checkpoint_posts WHERE crawler = ?", (self.crawler,)
+            ).fetchall()
+        if row is None:
+            return None
+        run_id, page, last_post, updated_at = row
+        if _expired(updated_at):
+            self.log.info(f"오래된 체크포인트({(time.time() - updated_at) / 60:.0f}분 전)는 버리고 처음부터 수집합니다.")
+            self.clear()
+            return None
+        # 이번 실행도 중단되면 그다음 실행이 이어받도록 이전 기록은 지우지 않고 그대로 둠
+        self.done_links = {link for link, done, _ in posts if done}
+        self.fetched = {link: json.loads(result, object_hook=_decode) for link, done, result in posts if not done}
+        self.log.info(f"중단된 수집을 이어서 진행합니다 (중단된 페이지 {page}, 끝낸 게시글 {len(self.done_links)}개, "
+                      f"재사용할 상세 수집 결과 {len(self.fetched)}개, 마지막 게시글 {last_post})")
+        return {"run_id": run_id, "page": page, "last_post": last_post}
+
+    def remaining(self, posts, key=None):
+        """목록 게시글 중 중단된 이전 실행(또는 이번 실행)에서 끝내지 않은 것만 반환
+
+        key: 게시글에서 링크를 꺼내는 함수 (기본은 post["Link"], 예: 인벤의 (행, 제목, 링크, 조회수) 후보는 candidate[2])
+        """
+        if not self.done_links:
+            return posts
+        key = key or (lambda post: post.get("Link"))
+        kept = [post for post in posts if key(post) not in self.done_links]
+        if len(kept) < len(posts):
+            self.log.info(f"이미 수집한 게시글 {len(posts) - len(kept)}개 건너뜀")
+        return kept
+
+    def previous_records(self):
+        """중단된 이전 실행이 기록해 두었지만 DB에 넣지 못한 게시글 (기록 파일은 이번 실행으로 옮기고 삭제)"""
+        if not self.resumed or not self.resumed["run_id"] or self.resumed["run_id"] == current_run_id():
+            return []
+        path = sink_path(self.script_path, self.resumed["run_id"])
+        records = read_records(path)
+        for record in records:
+            if isinstance(record.get("Date"), str):
+                try:
+                    record["Date"] = datetime.strptime(record["Date"], "%Y-%m-%d %H:%M:%S")
+                except ValueError:
+                    pass
+        remove_sink(path)
+        if records:
+            self.log.info(f"중단된 실행의 게시글 {len(records)}건을 이번 결과에 포함합니다.")
+        return records
+
+    def _write(self, link=None, result=None):
+        """진행 상황 갱신 (link가 있으면 그 게시글 한 행만 추가: result가 없으면 끝낸 게시글, 있으면 상세 수집 결과)"""
+        with self.lock:
+            if link is not None:
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO crawl_checkpoint_posts (crawler, link, done, result) VALUES (?, ?, ?, ?)",
+                    (self.crawler, link, int(result is None),
+                     None if result is None else json.dumps(result, ensure_ascii=False, default=_encode)),
+                )
+            self.conn.execute(
+                "INSERT OR REPLACE INTO crawl_checkpoints (crawler, run_id, page, last_post, pending, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (self.crawler, current_run_id(), self.page, self.last_post, json.dumps(self.pending), time.time()),
+            )
+            self.conn.commit()
+
+    def save(self, page, pending=()):
+        """목록 페이지 처리 시작 (이 페이지에서 상세 수집할 URL 목록)"""
+        if not CHECKPOINT_ENABLED:
+            return
+        self.page = page
+        self.pending = list(pending)
+        self._write()
+
+    def fetch_contents(self, func, urls, **kwargs):
+        """fetch_post_contents와 같지만 상세 수집이 하나 끝날 때마다 결과를 기록 (이전 실행이 기록한 결과는 다시 요청하지 않음)"""
+        urls = list(urls)
+        if not CHECKPOINT_ENABLED:
+            return fetch_post_contents(func, urls, **kwargs)
+        cached = {url: self.fetched[url] for url in urls if url in self.fetched}
+        if cached:
+            self.log.info(f"중단된 실행의 상세 수집 결과 {len(cached)}개 재사용")
+        missing = [url for url in urls if url not in cached]
+        results = dict(zip(missing, fetch_post_contents(func, missing, on_result=self._fetched, **kwargs)))
+        return [cached[url] if url in cached else results[url] for url in urls]
+
+    def _fetched(self, url, result):
+        # 수집에 실패한 결과는 기록하지 않음 (이어서 수집할 때 다시 요청)
+        if self.page is None or is_failed_result(result):
+            return
+        self.fetched[url] = result
+        self._write(url, result)
+
+    def done(self, link, content=None):
+        """게시글 하나 수집 완료 (content가 수집 실패 결과면 기록하지 않고 이어서 수집할 때 다시 수집)"""
+        if not CHECKPOINT_ENABLED or self.page is None:
+            return
+        if content is not None and is_failed_result(content):
+            return
+        if link in self.pending:
+            self.pending.remove(link)
+        self.done_links.add(link)
+        self.fetched.pop(link, None)
+        self.last_post = link
+        self._write(link)
+
+    def clear(self):
+        """끝까지 수집함 (다음 실행은 처음부터)"""
+        with self.lock:
+            self.conn.execute("DELETE FROM crawl_checkpoints WHERE crawler = ?", (self.crawler,))
+            self.conn.execute("DELETE FROM crawl_checkpoint_posts WHERE crawler = ?", (self.crawler,))
+            self.conn.commit()
+        self.resumed = None
+        self.page = None
+        self.done_links = set()
+        self.fetched = {}
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
@@ -0,0 +1,238 @@
+"""SiteSpec 설정대로 게시판을 수집하는 공용 엔진
+
+목록 페이지 -> 행 파싱(컴파일된 선택자) -> 날짜/조회수 필터 -> 이전 실행과 같은 글 건너뛰기 -> 상세 본문 병렬 수집 -> 기록
+요청은 모두 fetch()를 거치므로 공유 커넥션 풀, 사이트별 요청 속도 제한, 재시도, 캐시가 그대로 적용된다.
+"""
+import itertools
+import random
+import time
+from datetime import datetime
+
+import pandas as pd
+
+from common.async_fetch import is_failed_result
+from common.checkpoint import Checkpoint
+from common.http_client import fetch
+from common.parser import parse_html
+from common.record_sink import RecordSink
+from common.seen_store import SeenStore
+from common.site_spec import OUTPUT_FIELDS
+
+USER_AGENTS = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36",
+    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/14.0 Safari/605.1.15",
+    "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/88.0.4324.96 Safari/537.36",
+)
+
+
+def get_headers(spec):
+    """요청 헤더 (User-Agent 회전)"""
+    headers = {
+        "User-Agent": random.choice(USER_AGENTS),
+        "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
+        "Accept-Language": "ko-KR,ko;q=0.8,en-US;q=0.5,en;q=0.3",
+        "Connection": "keep-alive",
+        "Upgrade-Insecure-Requests": "1",
+    }
+    if spec.referer:
+        headers["Referer"] = spec.referer
+    headers.update(spec.headers)
+    return headers
+
+
+def parse_date(spec, text, now):
+    """spec.date_formats 중 맞는 형식으로 날짜 파싱 (맞는 형식이 없으면 None)"""
+    for fmt in spec.date_formats:
+        try:
+            parsed = datetime.strptime(text, fmt)
+        except ValueError:
+            continue
+        if "%d" not in fmt:
+            # 시각만 있으면 오늘 글
+            return datetime.combine(now.date(), parsed.time())
+        if "%y" not in fmt and "%Y" not in fmt:
+            return parsed.replace(year=now.year)
+        return parsed
+    return None
+
+
+def get_post_content(post_url, spec):
+    """상세 페이지 본문 텍스트와 이미지 URL ({"text", "images"}와 spec.detail_fields 값, 실패하면 text에 실패 사유와 failed=True)"""
+    log = spec.log
+    if not spec.is_valid_post_url(post_url):
+        log.warning(f"유효하지 않은 URL 건너뜀: {post_url}")
+        return {"text": "유효하지 않은 URL", "images": [], "failed": True}
+
+    try:
+        response = fetch(post_url, headers=get_headers(spec), encoding=spec.encoding)
+        response.raise_for_status()
+        soup = parse_html(response.text, response.url)
+        log.debug(f"크롤링 중: {post_url}")
+    except Exception as e:
+        log.warning(f"게시글 페이지 로드 오류: {post_url} - {str(e)}")
+        return {"text": f"로드 오류: {str(e)}", "images": [], "failed": True}
+    # 본문을 찾지 못해도 상세 페이지에서 읽은 값은 돌려줌 (읽지 못한 값은 None)
+    details = {name: field.extract(soup) for name, field in spec.detail_fields.items()}
+
+    blocks = []
+    for selector in spec.contents:
+        blocks = selector.select(soup) if spec.content_all else [element for element in [selector.select_one(soup)] if element]
+        if blocks:
+            break
+    if not blocks:
+        log.warning(f"내용 영역을 찾을 수 없습니다: {post_url}")
+        return {"text": "내용을 찾을 수 없습니다.", "images": [], "failed": True, **details}
+
+    if spec.texts:
+        parts = [element.get_text(spec.text_separator, strip=True) for block in blocks for element in spec.texts.select(block)]
+        text_content = "\n".join(part for part in parts if part and part != "\xa0") or spec.empty_text
+    else:
+        text_content = "\n".join(block.get_text(separator="\n", strip=True) for block in blocks)
+    if spec.text_filter:
+        text_content = spec.text_filter(text_content)
+    image_urls = [spec.absolute_url(img["src"]) for block in blocks for img in block.find_all("img")
+                  if img.get("src") and not (spec.excluded_images and spec.excluded_images.match(img))]
+    return {"text": text_content, "images": image_urls, **details}
+
+
+def parse_rows(spec, soup, now):
+    """목록 페이지의 게시글 행을 결과 행으로 변환, (조건을 통과한 행 목록, 오늘 글이 있었는지) 반환"""
+    log = spec.log
+    posts = []
+    found_today = False
+    for row in spec.rows.select(soup):
+        if spec.excluded and spec.excluded.select_one(row):
+            continue
+        post = {}
+        for name, field in spec.fields.items():
+            post[name] = field.extract(row)
+        post.update(spec.constants)
+        # default=None인 필드(필수 필드)가 없는 행과 제목/링크가 비어 있는 행은 제외
+        if any(value is None for value in post.values()) or not post.get("Title") or post.get("Link") in ("", "N/A"):
+            continue
+        if any(post.get(name) in values for name, values in spec.skip.items()):
+            continue
+        if spec.strip_category and post.get("Category") not in (None, "N/A"):
+            post["Title"] = post["Title"].replace(f"[{post['Category']}]", "").strip()
+
+        date_str = post.get("Date")
+        if date_str and date_str != "N/A":
+            post_date = parse_date(spec, date_str, now)
+            if post_date is None:
+                log.warning(f"날짜 파싱 오류: {date_str}")
+                continue
+            post["Date"] = post_date
+            if post_date.date() == now.date():
+                found_today = True
+            elif spec.today_only:
+                continue
+
+        views = post.get("Views")
+        if (views if isinstance(views, int) else 0) < spec.min_views:
+            continue
+        post["Link"] = spec.absolute_url(post["Link"])
+        post["Community"] = spec.community
+        posts.append({name: post.get(name, "N/A") for name in OUTPUT_FIELDS})
+    return posts, found_today
+
+
+def crawl(spec, **overrides):
+    """spec 게시판 수집 (DataFrame 또는 None 반환), overrides로 min_views / max_pages 등 일부 설정 변경"""
+    if overrides:
+        spec = spec.replace(**overrides)
+    log = spec.log
+    now = datetime.now()
+    data = []
+    processed_links = set()
+    # 이전 실행에서 수집한 게시글 상태 (게시판마다 글 번호가 따로 매겨지므로 커뮤니티 코드가 같아도 게시판별로 구분)
+    seen_store = SeenStore(f"{spec.community}:{spec.name}")
+    sink = RecordSink.for_script(spec.script)  # 수집 완료한 게시글을 바로 기록 (중단되어도 남음)
+    checkpoint = Checkpoint.for_script(spec.script)  # 중단되면 다음 실행에서 끝낸 게시글은 건너뛰고 이어서 수집
+    for post in checkpoint.previous_records():
+        data.append(post)
+        sink.write(post)
+        processed_links.add(post["Link"])
+    empty_pages = 0
+    old_posts = 0
+    # 목록에 날짜가 없는 게시판은 오늘 글 판정/이전 수집 구간 판정을 상세 페이지의 Date로 함
+    list_dates = "Date" in spec.fields
+    start_time = time.time()
+
+    for page in range(1, spec.max_pages + 1) if spec.max_pages else itertools.count(1):
+        if spec.time_limit and time.time() - start_time > spec.time_limit:
+            log.info(f"수집 시간 제한({spec.time_limit}초)을 넘어 크롤링을 종료합니다.")
+            break
+        page_url = spec.page_url(page)
+        try:
+            response = fetch(page_url, headers=get_headers(spec), encoding=spec.encoding)
+            response.raise_for_status()
+            soup = parse_html(response.text, response.url)
+            log.debug(f"목록 페이지 로드 완료: {page_url}")
+        except Exception as e:
+            log.warning(f"목록 페이지 로드 오류: {page_url} - {str(e)}")
+            break
+
+        posts, found_today = parse_rows(spec, soup, now)
+        if not posts and not spec.rows.select_one(soup):
+            log.warning(f"게시판 데이터를 찾을 수 없습니다: {page_url}")
+            break
+        posts = [post for post in posts if post["Link"] not in processed_links]
+        if spec.today_only and list_dates:
+            # empty_without_posts면 오늘 글이 있어도 조건(조회수)을 통과한 새 글이 없는 페이지는 빈 페이지로 셈
+            empty = not found_today or (spec.empty_without_posts and not posts)
+            empty_pages = empty_pages + 1 if empty else 0
+            if empty_pages >= spec.stop_after_empty_pages:
+                log.info(f"페이지 {page}까지 연속 {empty_pages}페이지 동안 오늘 날짜 게시글이 없어 크롤링을 종료합니다.")
+                break
+
+        posts = checkpoint.remaining(posts)
+        # 이전 실행 이후 조회수/추천수가 바뀌지 않은 게시글은 상세 수집 생략
+        reached_seen = list_dates and seen_store.reached_seen_territory([seen_store.post_key(post) for post in posts])
+        posts = seen_store.filter_changed(posts, compare_recommend="Recommend" not in spec.detail_fields)
+
+        # 게시글 내용 병렬 수집 (목록 순서 유지)
+        checkpoint.save(page, [post["Link"] for post in posts])
+        kept_posts = []
+        contents = checkpoint.fetch_contents(get_post_content, [post["Link"] for post in posts], spec=spec)
+        for post, content_data in zip(posts, contents):
+            for name in spec.detail_fields:
+                if content_data.get(name) is not None:
+                    post[name] = content_data[name]
+            if not list_dates and "Date" in spec.detail_fields:
+                post_date = parse_date(spec, post["Date"], now) if post["Date"] != "N/A" else None
+                if spec.today_only and (post_date is None or post_date.date() != now.date()):
+                    old_posts += 1
+                    checkpoint.done(post["Link"], content_data)
+                    if spec.stop_after_old_posts and old_posts >= spec.stop_after_old_posts:
+                        break
+                    continue
+                old_posts = 0
+                post["Date"] = post_date
+            if spec.drop_failed and is_failed_result(content_data):
+                log.warning(f"게시글 내용 추출 실패, 제외됨: {post['Link']}")
+                continue
+            post["Content"] = content_data["text"]
+            post["Images"] = content_data["images"]
+            data.append(post)
+            sink.write(post)
+            kept_posts.append(post)
+            processed_links.add(post["Link"])
+            checkpoint.done(post["Link"], content_data)
+        seen_store.mark_posts_seen(kept_posts)  # 본문 수집에 실패한 게시글은 다음 실행에서 다시 수집
+
+        if spec.stop_after_old_posts and old_posts >= spec.stop_after_old_posts:
+            log.info(f"연속 {old_posts}개의 오늘 날짜 아닌 게시글이 나와 크롤링을 종료합니다.")
+            break
+        if reached_seen:
+            log.info("이전 실행에서 수집한 구간에 도달하여 크롤링을 종료합니다.")
+            break
+
+    sink.close()
+    checkpoint.clear()
+    checkpoint.close()
+    log.info(f"크롤링 완료. 총 수집된 게시물 수: {len(data)}")
+    if data:
+        df = pd.DataFrame(data)
+        df = df.sort_values(by="Date", ascending=False)
+        return df
+    return None
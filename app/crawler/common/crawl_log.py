@@ -0,0 +1,199 @@
+import atexit
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import sys
+import threading
+from datetime import datetime
+
+# 크롤러 로그 레벨 (DEBUG로 두면 게시글 단위 메시지까지 모두 출력)
+LOG_LEVEL = os.environ.get("CRAWLER_LOG_LEVEL", "INFO").upper()
+# 출력 형식 (text: 사람이 읽는 한 줄, json: 필드별 JSON 한 줄)
+LOG_FORMAT = os.environ.get("CRAWLER_LOG_FORMAT", "text")
+# 같은 위치에서 반복되는 DEBUG 메시지(게시글 단위)는 실행마다 처음 N개만 출력하고 이후에는 M개마다 하나씩 출력 (M=0이면 모두 출력)
+LOG_SAMPLE_FIRST = int(os.environ.get("CRAWLER_LOG_SAMPLE_FIRST", 5))
+LOG_SAMPLE_EVERY = int(os.environ.get("CRAWLER_LOG_SAMPLE_EVERY", 100))
+
+ROOT_LOGGER_NAME = "crawler"
+CONTEXT_FIELDS = ("site", "community")
+
+
+class SamplingFilter(logging.Filter):
+    """게시글마다 반복되는 DEBUG 메시지(같은 파일:줄) 샘플링 (INFO 이상은 항상 통과, 횟수는 실행마다 reset)"""
+
+    def __init__(self, first=None, every=None):
+        super().__init__()
+        self.first = LOG_SAMPLE_FIRST if first is None else first
+        self.every = LOG_SAMPLE_EVERY if every is None else every
+        self.counts = {}
+        self.lock = threading.Lock()
+
+    def filter(self, record):
+        if record.levelno >= logging.INFO or self.every <= 0:
+            return True
+        key = (record.pathname, record.lineno)
+        with self.lock:
+            count = self.counts.get(key, 0) + 1
+            self.counts[key] = count
+        if count <= self.first:
+            return True
+        if (count - self.first) % self.every == 0:
+            record.sampled = count  # 이 위치에서 지금까지 발생한 횟수
+            return True
+        return False
+
+    def reset(self):
+        with self.lock:
+            self.counts = {}
+
+
+class StructuredFormatter(logging.Formatter):
+    """사이트/커뮤니티 등 문맥 필드를 포함해 한 줄로 출력"""
+
+    def __init__(self, fmt_type=None):
+        super().__init__()
+        self.fmt_type = fmt_type or LOG_FORMAT
+
+    def format(self, record):
+        message = record.getMessage()
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        timestamp = datetime.fromtimestamp(record.created).strftime("%Y-%m-%d %H:%M:%S")
+        sampled = getattr(record, "sampled", None)
+
+        if self.fmt_type == "json":
+            entry = {"time": timestamp, "level": record.levelname, "logger": record.name}
+            for field in CONTEXT_FIELDS:
+                value = getattr(record, field, None)
+                if value is not None:
+                    entry[field] = value
+            entry["message"] = message
+            if sampled:
+                entry["sampled"] = sampled
+            if record.exc_text:
+                entry["exc"] = record.exc_text
+            return json.dumps(entry, ensure_ascii=False, default=str)
+
+        context = "/".join(str(getattr(record, field)) for field in CONTEXT_FIELDS if getattr(record, field, None))
+        line = f"{timestamp} {record.levelname:<7} [{context}] {message}"
+        if sampled:
+            line += f" (반복 {sampled}회째)"
+        if record.exc_text:
+            line += "\n" + record.exc_text
+        return line
+
+
+class _StdoutHandler(logging.StreamHandler):
+    """출력 시점의 sys.stdout에 기록 (워커가 크롤러 실행 중 stdout을 바꿔 끼워도 따라가도록)"""
+
+    def __init__(self):
+        logging.Handler.__init__(self)
+
+    @property
+    def stream(self):
+        return sys.stdout
+
+
+class SiteLogger(logging.LoggerAdapter):
+    """호출마다 사이트 문맥 필드를 붙이는 로거 (extra로 필드 추가 가능)"""
+
+    def process(self, msg, kwargs):
+        kwargs["extra"] = {**self.extra, **kwargs.get("extra", {})}
+        return msg, kwargs
+
+
+class _FlushingQueueListener(logging.handlers.QueueListener):
+    """flush_logging()이 넣은 표시 레코드를 만나면 출력하지 않고 대기 중인 호출자를 깨움"""
+
+    def handle(self, record):
+        flushed = getattr(record, "flushed", None)
+        if flushed is not None:
+            flushed.set()
+            return
+        super().handle(record)
+
+
+_listener = None
+_log_queue = None
+_queue_handler = None
+_listener_running = False
+_sampling_filter = None
+_configure_lock = threading.Lock()
+
+
+def configure_logging(level=None):
+    """크롤러 로거 설정 (프로세스당 한 번)
+
+    기록은 큐에만 넣고 실제 출력은 별도 스레드(QueueListener)가 하므로 수집 루프가 출력 I/O를 기다리지 않는다.
+    """
+    global _listener, _log_queue, _queue_handler, _listener_running, _sampling_filter
+    with _configure_lock:
+        if _listener is not None:
+            return
+        _log_queue = queue.SimpleQueue()
+        queue_handler = _queue_handler = logging.handlers.QueueHandler(_log_queue)
+        _sampling_filter = SamplingFilter()
+        queue_handler.addFilter(_sampling_filter)
+
+        output_handler = _StdoutHandler()
+        output_handler.setFormatter(StructuredFormatter())
+
+        logger = logging.getLogger(ROOT_LOGGER_NAME)
+        logger.setLevel(level or LOG_LEVEL)
+        logger.addHandler(queue_handler)
+        logger.propagate = False
+
+        _listener = _FlushingQueueListener(_log_queue, output_handler)
+        _listener.start()
+        _listener_running = True
+        atexit.register(stop_logging)
+
+
+def configure_worker_logging():
+    """워커 프로세스 로깅 설정: 루트 로거(공용 모듈의 logging.warning 등)도 크롤러 로거와 같은 큐로 보냄
+
+    로그 파일/콘솔 핸들러는 스케줄러 프로세스에서만 설정하고, 워커의 기록은 모두 실행 중인 크롤러의 로그 파일에 남는다.
+    """
+    configure_logging()
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.addHandler(_queue_handler)
+    root.setLevel(LOG_LEVEL)
+
+
+def flush_logging(timeout=5):
+    """지금까지 큐에 들어간 기록이 모두 출력될 때까지 대기 (출력 스레드는 계속 실행)
+
+    큐 끝에 표시 레코드를 넣고 출력 스레드가 거기까지 처리하기를 기다린다 (큐는 순서대로 처리됨).
+    """
+    if not _listener_running:
+        return
+    flushed = threading.Event()
+    marker = logging.makeLogRecord({"msg": "", "flushed": flushed})
+    _log_queue.put(marker)
+    flushed.wait(timeout)
+
+
+def stop_logging():
+    """남은 기록을 출력하고 출력 스레드 종료 (프로세스 종료 시)"""
+    global _listener_running
+    with _configure_lock:
+        if not _listener_running:
+            return
+        _listener_running = False
+    _listener.stop()
+
+
+def reset_sampling():
+    """샘플링 횟수 초기화 (워커가 크롤러 실행마다 호출, 실행마다 처음 N개는 다시 출력)"""
+    if _sampling_filter is not None:
+        _sampling_filter.reset()
+
+
+def get_logger(site, **context):
+    """사이트별 크롤러 로거 반환 (예: get_logger("instiz_issue", community="3"))"""
+    configure_logging()
+    return SiteLogger(logging.getLogger(f"{ROOT_LOGGER_NAME}.{site}"), {"site": site, **context})
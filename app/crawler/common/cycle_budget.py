@@ -0,0 +1,166 @@
+"""수집 주기 시간 예산과 부하 조절
+
+함께 큐에 들어간 크롤러 작업(같은 실행 ID)을 한 주기로 보고, 주기 마감(시작 + 예산)까지 끝나도록 시간을 나눈다.
+크롤러마다 자기 마감 시간(CRAWLER_INFO의 deadline)도 따로 적용한다 (짧은 마감의 크롤러가 주기 전체를 줄이지 않음).
+- 정치 크롤러는 예산을 먼저 차지하고 건너뛰거나 줄이지 않는다.
+- 나머지 크롤러는 남은 시간(동시 실행 수 x 남은 초)에서 정치 크롤러의 예상 시간을 뺀 만큼을 나눠 쓴다.
+- 주기가 밀려 다 실행할 수 없으면 가치(우선순위와 최근 수집량) 대비 예상 시간이 높은 크롤러부터 자리를 주고,
+  남은 시간이 예상보다 적은 크롤러는 줄인 제한 시간으로 실행(타임아웃 시 중단 전까지 기록된 게시글만 적재),
+  남은 시간이 MIN_ALLOWANCE_SECONDS보다 적은 크롤러는 건너뛴다.
+주기가 끝나면 크롤러별 배정/실행 결과를 로그와 JSON 보고서(TIMING_DIR/<실행 ID>/cycle_budget.json)로 남긴다.
+"""
+import json
+import logging
+import os
+import threading
+import time
+from datetime import datetime
+
+from common import metrics, timing
+
+# 주기 예산(분), 기본은 예전 실행 간격(6시간)에서 30분 여유를 뺀 값 (주기 전체의 상한, 작업별 마감 시간은 따로 적용)
+CYCLE_BUDGET_SECONDS = float(os.environ.get("CRAWLER_CYCLE_BUDGET_MINUTES", 330)) * 60
+# 실행 기록이 없는 크롤러의 예상 실행 시간(초)
+DEFAULT_EXPECTED_SECONDS = float(os.environ.get("CRAWLER_DEFAULT_EXPECTED_SECONDS", 300))
+# 이보다 적게 배정될 크롤러는 실행하지 않고 건너뜀
+MIN_ALLOWANCE_SECONDS = float(os.environ.get("CRAWLER_MIN_ALLOWANCE_SECONDS", 60))
+
+
+class CycleBudget:
+    """한 주기(같은 실행 ID로 큐에 들어간 작업들)의 시간 예산
+
+    stats: 크롤러 이름 -> {"avg_seconds", "avg_records"} (ScheduleState.stats(), 최근 실행 시간/수집 건수)
+    """
+
+    def __init__(self, jobs, start, workers, stats=None, budget_seconds=None):
+        self.jobs = list(jobs)
+        self.start = start
+        self.workers = max(1, workers)
+        self.stats = stats or {}
+        if budget_seconds is None:
+            budget_seconds = CYCLE_BUDGET_SECONDS
+        self.budget_seconds = budget_seconds
+        self.deadline = start + budget_seconds
+        self.run_id = self.jobs[0].run_id if self.jobs else None
+        self.entries = {}  # 크롤러 이름 -> 보고서 항목
+        self.finished = set()  # 끝난(또는 건너뛴) 크롤러 이름
+        self.lock = threading.Lock()
+        self.reported = False
+
+    def expected_seconds(self, job):
+        return (self.stats.get(job.info.name) or {}).get("avg_seconds") or DEFAULT_EXPECTED_SECONDS
+
+    def job_deadline(self, job):
+        """작업이 끝나야 하는 시각 (작업 자신의 마감 시각, 주기 마감을 넘지 않음)"""
+        return min(self.deadline, job.due + job.info.deadline)
+
+    def value(self, job):
+        """주기 안에서의 가치 (우선순위가 높고 최근 수집 건수가 많을수록 큼)"""
+        records = (self.stats.get(job.info.name) or {}).get("avg_records") or 0
+        return (records + 1) / max(job.info.priority, 1)
+
+    def density(self, job):
+        return self.value(job) / self.expected_seconds(job)
+
+    def _pending(self, job):
+        return [other for other in self.jobs if other is not job and other.info.name not in self.entries]
+
+    def admit(self, job, now=None):
+        """작업을 시작할 때 호출, 이 작업에 줄 시간(초) 반환 (건너뛸 작업이면 None)"""
+        now = now or time.time()
+        cycle_remaining = self.deadline - now
+        remaining = self.job_deadline(job) - now
+        expected = self.expected_seconds(job)
+        with self.lock:
+            entry = {"group": job.info.group, "priority": job.info.priority, "expected_seconds": round(expected, 1),
+                     "value": round(self.value(job), 2), "started_at": datetime.fromtimestamp(now).isoformat(timespec="seconds")}
+            self.entries[job.info.name] = entry
+            pending = self._pending(job)
+
+            if job.info.is_politics:
+                # 정치 크롤러는 줄이지 않음 (마감 시간과 크롤러 타임아웃만 적용)
+                entry.update(status="run", allowance_seconds=None)
+                return float("inf")
+
+            # 정치 크롤러 몫을 먼저 떼고 남은 처리량을 가치 밀도 순으로 배정
+            capacity = max(0.0, cycle_remaining) * self.workers - sum(
+                self.expected_seconds(other) for other in pending if other.info.is_politics)
+            others = [other for other in pending if not other.info.is_politics]
+            if capacity >= expected + sum(self.expected_seconds(other) for other in others):
+                entry.update(status="run", allowance_seconds=round(remaining, 1))
+                return remaining
+
+            ahead = sum(self.expected_seconds(other) for other in others if self.density(other) > self.density(job))
+            allowance = min(remaining, capacity - ahead)
+            if allowance < MIN_ALLOWANCE_SECONDS:
+                entry.update(status="shed", allowance_seconds=0,
+                             reason=f"주기 예산 부족 (남은 {max(0.0, remaining):.0f}초, 앞선 작업 예상 {ahead:.0f}초)")
+                metrics.inc("crawler_jobs_shed_total", crawler=job.info.name)
+                return None
+            if allowance < expected:
+                entry.update(status="shortened", allowance_seconds=round(allowance, 1),
+                             reason=f"예상 {expected:.0f}초 중 {allowance:.0f}초만 배정")
+                metrics.inc("crawler_jobs_shortened_total", crawler=job.info.name)
+            else:
+                entry.update(status="run", allowance_seconds=round(allowance, 1))
+            return allowance
+
+    def skip(self, job, reason, status="shed"):
+        """시작하지 않고 끝난 작업 기록 (마감 시간 경과: shed, 취소: cancelled)"""
+        with self.lock:
+            self.entries[job.info.name] = {"group": job.info.group, "priority": job.info.priority,
+                                           "status": status, "reason": reason}
+        self.finish(job, False)
+
+    def finish(self, job, success, elapsed=None, records=None):
+        """작업 종료 기록 (주기의 모든 작업이 끝나거나 건너뛰어지면 보고서 작성)"""
+        with self.lock:
+            entry = self.entries.setdefault(job.info.name, {"group": job.info.group, "status": "shed"})
+            if entry["status"] not in ("shed", "cancelled"):
+                entry.update(success=success, elapsed_seconds=None if elapsed is None else round(elapsed, 1), records=records)
+            self.finished.add(job.info.name)
+            done = len(self.finished) == len(self.jobs) and not self.reported
+            if done:
+                self.reported = True
+        if done:
+            self.report()
+
+    def build_report(self):
+        finished = time.time()
+        with self.lock:
+            entries = dict(self.entries)
+        return {
+            "run_id": self.run_id,
+            "budget_seconds": round(self.budget_seconds, 1),
+            "elapsed_seconds": round(finished - self.start, 1),
+            "overrun_seconds": round(max(0.0, finished - self.deadline), 1),
+            "workers": self.workers,
+            "shed": sorted(name for name, entry in entries.items() if entry.get("status") == "shed"),
+            "shortened": sorted(name for name, entry in entries.items() if entry.get("status") == "shortened"),
+            "crawlers": entries,
+        }
+
+    def report(self):
+        """주기 요약 로그와 JSON 보고서 (보고서 경로 반환)"""
+        report = self.build_report()
+        logging.info(f"주기 예산 ({self.run_id}): {report['elapsed_seconds']:.0f}초 / {report['budget_seconds']:.0f}초"
+                     + (f", 초과 {report['overrun_seconds']:.0f}초" if report["overrun_seconds"] else ""))
+        if report["shed"]:
+            logging.warning(f"부하 조절로 건너뛴 크롤러: {', '.join(report['shed'])}")
+        if report["shortened"]:
+            logging.warning(f"부하 조절로 제한 시간을 줄인 크롤러: {', '.join(report['shortened'])}")
+        if report["overrun_seconds"]:
+            metrics.inc("crawler_cycle_overruns_total")
+        # 주기 소요 시간 (run_all_crawlers와 SiteScheduler.run_forever 모두 주기가 끝나면 여기로 옴)
+        metrics.observe("crawler_cycle_seconds", report["elapsed_seconds"])
+        metrics.registry.set("crawler_last_cycle_seconds", report["elapsed_seconds"])
+
+        path = os.path.join(timing.TIMING_DIR, self.run_id or datetime.now().strftime("%Y%m%d_%H%M%S"), "cycle_budget.json")
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(report, f, ensure_ascii=False, indent=2)
+        except OSError as e:
+            logging.warning(f"주기 예산 보고서 저장 실패: {path}, 오류: {str(e)}")
+            return None
+        return path
@@ -0,0 +1,122 @@
+import os
+import sqlite3
+import threading
+import time
+
+# 조건부 요청(ETag / Last-Modified) 캐시 저장 위치 / 보관 기간(일)
+HTTP_CACHE_PATH = os.environ.get("CRAWLER_HTTP_CACHE_DB", "/code/data/http_cache.db")
+HTTP_CACHE_TTL_DAYS = int(os.environ.get("CRAWLER_HTTP_CACHE_TTL_DAYS", 3))
+# 0이면 캐시를 사용하지 않음
+HTTP_CACHE_ENABLED = os.environ.get("CRAWLER_HTTP_CACHE", "1") != "0"
+
+
+class HttpCache:
+    """URL별 검증자(ETag / Last-Modified)와 본문을 저장하는 디스크 캐시
+
+    모든 크롤러 프로세스가 같은 SQLite 파일을 공유하고, 304 응답이 오면 저장된 본문으로 응답을 채운다.
+    """
+
+    def __init__(self, path=None):
+        self.path = path or HTTP_CACHE_PATH
+        self.lock = threading.Lock()
+
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS http_cache (
+                url TEXT PRIMARY KEY,
+                etag TEXT,
+                last_modified TEXT,
+                content_type TEXT,
+                encoding TEXT,
+                body BLOB NOT NULL,
+                updated_at REAL NOT NULL
+            )
+            """
+        )
+        # 오래된 항목 정리
+        self.conn.execute("DELETE FROM http_cache WHERE updated_at < ?", (time.time() - HTTP_CACHE_TTL_DAYS * 86400,))
+        self.conn.commit()
+
+    def lookup(self, url):
+        """저장된 항목 반환 (없으면 None)"""
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT etag, last_modified, content_type, encoding, body FROM http_cache WHERE url = ?",
+                (url,),
+            ).fetchone()
+        if row is None:
+            return None
+        return {"etag": row[0], "last_modified": row[1], "content_type": row[2], "encoding": row[3], "body": row[4]}
+
+    @staticmethod
+    def conditional_headers(entry):
+        """저장된 검증자로 조건부 요청 헤더 생성"""
+        headers = {}
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def store(self, url, response):
+        """200 응답의 검증자와 본문 저장"""
+        with self.lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO http_cache (url, etag, last_modified, content_type, encoding, body, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    url,
+                    response.headers.get("ETag"),
+                    response.headers.get("Last-Modified"),
+                    response.headers.get("Content-Type"),
+                    response.encoding,
+                    sqlite3.Binary(response.content),
+                    time.time(),
+                ),
+            )
+            self.conn.commit()
+
+    def delete(self, url):
+        """캐시 항목 삭제"""
+        with self.lock:
+            self.conn.execute("DELETE FROM http_cache WHERE url = ?", (url,))
+            self.conn.commit()
+
+    def touch(self, url):
+        """304로 재검증된 항목의 보관 기간 연장"""
+        with self.lock:
+            self.conn.execute("UPDATE http_cache SET updated_at = ? WHERE url = ?", (time.time(), url))
+            self.conn.commit()
+
+    @staticmethod
+    def fill(response, entry):
+        """304 응답을 저장된 본문을 가진 200 응답으로 변환"""
+        response.status_code = 200
+        response.reason = "OK (cached)"
+        response._content = bytes(entry["body"])
+        if entry.get("content_type"):
+            response.headers["Content-Type"] = entry["content_type"]
+        response.encoding = entry.get("encoding")
+        response.from_cache = True
+        return response
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_http_cache():
+    """프로세스 공용 캐시 반환 (비활성화되어 있으면 None)"""
+    global _cache
+    if not HTTP_CACHE_ENABLED:
+        return None
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = HttpCache()
+    return _cache
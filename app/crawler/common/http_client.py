@@ -0,0 +1,173 @@
+import logging
+import os
+import threading
+import time
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from common import metrics, timing
+from common.backoff import MAX_RETRIES, RETRY_STATUSES, parse_retry_after, wait_before_retry
+from common.cassette import get_cassette
+from common.http_cache import get_http_cache
+from common.rate_limiter import get_limiter, get_site_key
+
+# brotli 모듈이 있을 때만 br 압축을 요청 (없으면 urllib3가 디코딩하지 못함)
+try:
+    import brotli  # noqa: F401
+    ACCEPT_ENCODING = "gzip, deflate, br"
+except ImportError:
+    ACCEPT_ENCODING = "gzip, deflate"
+
+# 연결/읽기 타임아웃 정책 (초)
+CONNECT_TIMEOUT = float(os.environ.get("CRAWLER_CONNECT_TIMEOUT", 5))
+READ_TIMEOUT = float(os.environ.get("CRAWLER_READ_TIMEOUT", 15))
+DEFAULT_TIMEOUT = (CONNECT_TIMEOUT, READ_TIMEOUT)
+
+# 호스트별 커넥션 풀 크기
+POOL_MAXSIZE = int(os.environ.get("CRAWLER_POOL_MAXSIZE", 8))
+
+# 지정하면 모든 요청을 모의 서버(common.mock_server)로 보냄 (예: http://127.0.0.1:8590)
+MOCK_SERVER = os.environ.get("CRAWLER_MOCK_SERVER", "")
+
+_sessions = {}
+_sessions_lock = threading.Lock()
+
+
+def _create_session():
+    """keep-alive 커넥션 풀을 가진 세션 생성"""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=POOL_MAXSIZE, max_retries=0)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers.update({
+        "Accept-Encoding": ACCEPT_ENCODING,
+        "Connection": "keep-alive",
+    })
+    return session
+
+
+def get_session(url):
+    """URL의 호스트에 해당하는 공유 세션 반환 (없으면 생성)"""
+    host = urlparse(url).netloc.lower()
+    session = _sessions.get(host)
+    if session is None:
+        with _sessions_lock:
+            session = _sessions.get(host)
+            if session is None:
+                session = _create_session()
+                _sessions[host] = session
+    return session
+
+
+def _mock_url(url):
+    """모의 서버로 보낼 URL (https://host/path -> <MOCK_SERVER>/host/path)"""
+    parts = urlparse(url)
+    return f"{MOCK_SERVER.rstrip('/')}/{parts.netloc}{parts.path or '/'}" + (f"?{parts.query}" if parts.query else "")
+
+
+def _unmock_url(url, original):
+    """모의 서버 응답 URL을 원래 사이트 URL로 되돌림"""
+    prefix = MOCK_SERVER.rstrip("/") + "/"
+    return f"{urlparse(original).scheme}://{url[len(prefix):]}" if url.startswith(prefix) else url
+
+
+def fetch(url, headers=None, timeout=None, encoding=None, max_retries=None, **kwargs):
+    """공유 세션으로 GET 요청 (크롤러의 requests.get 대체)
+
+    연결 오류와 429/5xx 응답은 지수 백오프(Retry-After 우선)로 max_retries번까지 재시도하고,
+    마지막 응답은 그대로 반환한다 (상태 코드 확인은 호출한 쪽에서).
+    이전에 ETag/Last-Modified를 받은 URL은 조건부로 요청하고, 304가 오면 캐시된 본문을 200 응답으로 돌려준다.
+    카세트 재생 모드에서는 네트워크 요청 없이 기록된 응답을 돌려준다 (common.cassette).
+    """
+    site = get_site_key(url)
+    cassette = get_cassette()
+    if cassette and cassette.replaying:
+        with timing.phase(f"{timing.current_stage()}_fetch"):
+            response = cassette.replay(url, kwargs.get("params"))
+        metrics.inc("crawler_http_requests_total", site=site, status=response.status_code)
+        metrics.inc("crawler_http_response_bytes_total", len(response.content), site=site)
+        if encoding:
+            response.encoding = encoding
+        return response
+
+    # 압축 방식은 세션이 실제 디코딩 가능한 값으로 협상
+    headers = {k: v for k, v in (headers or {}).items() if k.lower() != "accept-encoding"}
+
+    # 쿼리 파라미터를 따로 넘기거나 호출한 쪽이 직접 조건부 요청을 하는 경우는 캐시 사용 안 함
+    cache = None
+    cached = None
+    if "params" not in kwargs and not any(k.lower() in ("if-none-match", "if-modified-since") for k in headers):
+        cache = get_http_cache()
+        cached = cache.lookup(url) if cache else None
+        if cached:
+            headers.update(cache.conditional_headers(cached))
+    if max_retries is None:
+        max_retries = MAX_RETRIES
+    session = get_session(url)
+    limiter = get_limiter(url)
+
+    attempt = 0
+    while True:
+        # 사이트별 토큰 버킷으로 요청 간격 제어
+        with timing.phase("rate_limit_wait"):
+            limiter.acquire()
+        start_time = time.monotonic()
+        try:
+            with timing.phase(f"{timing.current_stage()}_fetch"):
+                response = session.get(_mock_url(url) if MOCK_SERVER else url, headers=headers,
+                                       timeout=timeout or DEFAULT_TIMEOUT, **kwargs)
+        except (requests.ConnectionError, requests.Timeout) as e:
+            limiter.record_response(None, time.monotonic() - start_time)
+            metrics.inc("crawler_http_requests_total", site=site, status="error")
+            if attempt >= max_retries:
+                raise
+            attempt += 1
+            with timing.phase("retry_wait"):
+                delay = wait_before_retry(attempt)
+            logging.warning(f"요청 실패, {delay:.1f}초 후 재시도 ({attempt}/{max_retries}): {url} - {e}")
+            continue
+
+        latency = time.monotonic() - start_time
+        if MOCK_SERVER:
+            response.url = _unmock_url(response.url, url)
+        limiter.record_response(response.status_code, latency)
+        metrics.inc("crawler_http_requests_total", site=site, status=response.status_code)
+        metrics.observe("crawler_http_request_seconds", latency, site=site)
+        if response.status_code in RETRY_STATUSES and attempt < max_retries:
+            retry_after = parse_retry_after(response.headers.get("Retry-After"))
+            if retry_after:
+                limiter.pause(retry_after)
+            attempt += 1
+            with timing.phase("retry_wait"):
+                delay = wait_before_retry(attempt, retry_after)
+            logging.warning(f"상태 코드 {response.status_code}, {delay:.1f}초 후 재시도 ({attempt}/{max_retries}): {url}")
+            continue
+        break
+
+    metrics.inc("crawler_http_response_bytes_total", len(response.content), site=site)
+    if cache:
+        if response.status_code == 304 and cached:
+            cache.touch(url)
+            cache.fill(response, cached)
+        elif response.status_code == 200:
+            if response.headers.get("ETag") or response.headers.get("Last-Modified"):
+                cache.store(url, response)
+            elif cached:
+                # 검증자를 더 이상 주지 않는 URL은 캐시에서 제거
+                cache.delete(url)
+    if cassette and cassette.recording:
+        cassette.record(url, response, headers, latency, kwargs.get("params"))
+
+    if encoding:
+        response.encoding = encoding
+    return response
+
+
+def close_sessions():
+    """모든 공유 세션 종료"""
+    with _sessions_lock:
+        for session in _sessions.values():
+            session.close()
+        _sessions.clear()
@@ -0,0 +1,15 @@
+"""오프라인 실행(파서 벤치마크, 카세트 기록/재생)용 크롤러 상태 격리
+
+운영 수집 상태(CRAWLER_STATE_DB)와 중간 기록 파일을 건드리지 않고, 이전 실행 상태에 따라 결과가 달라지지 않도록
+크롤러 모듈을 import하기 전에 호출한다 (seen_store / record_sink / http_cache는 import 시점에 환경 변수를 읽음).
+"""
+import os
+
+
+def isolate_crawler_state(work_dir):
+    """상태 DB / 기록 파일을 work_dir 아래로 돌리고 증분 수집 / 체크포인트 / HTTP 캐시를 끔"""
+    os.environ["CRAWLER_STATE_DB"] = os.path.join(work_dir, "crawler_state.db")
+    os.environ["CRAWLER_SINK_DIR"] = os.path.join(work_dir, "sink")
+    os.environ["CRAWLER_INCREMENTAL"] = "0"
+    os.environ["CRAWLER_CHECKPOINT"] = "0"
+    os.environ["CRAWLER_HTTP_CACHE"] = "0"
@@ -0,0 +1,204 @@
+import atexit
+import bisect
+import json
+import os
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# 메트릭 서버 포트 (docker-compose에서 노출하는 포트), 0이면 서버를 띄우지 않음
+METRICS_PORT = int(os.environ.get("CRAWLER_METRICS_PORT", 8581))
+# 서브프로세스로 실행된 크롤러가 종료 시 메트릭을 남길 파일 (스케줄러가 지정)
+METRICS_FILE_ENV = "CRAWLER_METRICS_FILE"
+
+# 히스토그램 구간 (초)
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+PARSE_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1)
+DURATION_BUCKETS = (10, 30, 60, 120, 300, 600, 900, 1800, 3600, 7200)
+
+# 메트릭 이름 -> (종류, 설명, 히스토그램 구간)
+METRICS = {
+    "crawler_http_requests_total": ("counter", "사이트별 HTTP 요청 수 (상태 코드별)", None),
+    "crawler_http_request_seconds": ("histogram", "사이트별 HTTP 요청 지연 시간", LATENCY_BUCKETS),
+    "crawler_http_response_bytes_total": ("counter", "사이트별 다운로드한 응답 본문 크기", None),
+    "crawler_parse_seconds": ("histogram", "사이트별 HTML 파싱 시간", PARSE_BUCKETS),
+    "crawler_posts_found_total": ("counter", "목록에서 수집 조건을 통과한 게시글 수", None),
+    "crawler_posts_unchanged_total": ("counter", "이전 실행과 같아 상세 수집을 건너뛴 게시글 수", None),
+    "crawler_posts_kept_total": ("counter", "상세 수집까지 끝나 결과에 포함된 게시글 수", None),
+    "crawler_detail_fetch_failures_total": ("counter", "상세 페이지 수집 실패 수", None),
+    "crawler_db_rows_total": ("counter", "DB 적재 결과별 행 수 (inserted/updated/skipped)", None),
+    "crawler_runs_total": ("counter", "크롤러 실행 결과별 횟수", None),
+    "crawler_run_seconds": ("histogram", "크롤러 1회 실행 시간", DURATION_BUCKETS),
+    "crawler_cycle_seconds": ("histogram", "전체 수집 주기 소요 시간", DURATION_BUCKETS),
+    "crawler_last_cycle_seconds": ("gauge", "마지막 수집 주기 소요 시간", None),
+    "crawler_queue_length": ("gauge", "실행을 기다리는 크롤러 작업 수", None),
+    "crawler_queue_wait_seconds": ("histogram", "크롤러 작업이 큐에서 기다린 시간", DURATION_BUCKETS),
+    "crawler_jobs_expired_total": ("counter", "마감 시간이 지나 실행하지 않은 크롤러 작업 수", None),
+    "crawler_jobs_shed_total": ("counter", "주기 예산이 부족해 건너뛴 크롤러 작업 수", None),
+    "crawler_jobs_shortened_total": ("counter", "주기 예산이 부족해 제한 시간을 줄여 실행한 크롤러 작업 수", None),
+    "crawler_cycle_overruns_total": ("counter", "예산 시간을 넘긴 수집 주기 수", None),
+}
+
+
+class MetricsRegistry:
+    """카운터/게이지/히스토그램 값 저장소 (레이블 조합별)
+
+    워커 프로세스에서 모은 값은 snapshot(reset=True)으로 꺼내 스케줄러 프로세스의 레지스트리에 merge한다.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.values = {}  # (name, labels) -> float 또는 [bucket counts..., count, sum]
+
+    @staticmethod
+    def _key(name, labels):
+        return name, tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+    def inc(self, name, value=1, **labels):
+        key = self._key(name, labels)
+        with self.lock:
+            self.values[key] = self.values.get(key, 0) + value
+
+    def set(self, name, value, **labels):
+        with self.lock:
+            self.values[self._key(name, labels)] = value
+
+    def observe(self, name, value, **labels):
+        buckets = METRICS[name][2]
+        key = self._key(name, labels)
+        with self.lock:
+            entry = self.values.get(key)
+            if entry is None:
+                entry = self.values[key] = [0] * (len(buckets) + 2)
+            index = bisect.bisect_left(buckets, value)
+            if index < len(buckets):
+                entry[index] += 1
+            entry[-2] += 1
+            entry[-1] += value
+
+    def snapshot(self, reset=False):
+        """[(name, labels, value)] 형태로 반환 (프로세스 간 전달용)"""
+        with self.lock:
+            items = [(name, list(labels), list(value) if isinstance(value, list) else value)
+                     for (name, labels), value in self.values.items()]
+            if reset:
+                self.values = {}
+        return items
+
+    def merge(self, items):
+        """다른 프로세스의 snapshot 값을 더함 (게이지는 덮어씀)"""
+        with self.lock:
+            for name, labels, value in items:
+                key = (name, tuple(tuple(label) for label in labels))
+                kind = METRICS.get(name, ("counter",))[0]
+                current = self.values.get(key)
+                if kind == "gauge" or current is None:
+                    self.values[key] = list(value) if isinstance(value, list) else value
+                elif isinstance(value, list):
+                    self.values[key] = [a + b for a, b in zip(current, value)]
+                else:
+                    self.values[key] = current + value
+
+    def render(self):
+        """Prometheus 텍스트 형식으로 출력"""
+        with self.lock:
+            values = sorted(self.values.items())
+        lines = []
+        described = set()
+        for (name, labels), value in values:
+            kind, help_text, buckets = METRICS.get(name, ("untyped", "", None))
+            if name not in described:
+                lines.append(f"# HELP {name} {help_text}")
+                lines.append(f"# TYPE {name} {kind}")
+                described.add(name)
+            if kind != "histogram":
+                lines.append(f"{name}{_format_labels(labels)} {value}")
+                continue
+            cumulative = 0
+            for bound, count in zip(buckets, value):
+                cumulative += count
+                lines.append(f"{name}_bucket{_format_labels(labels + (('le', str(bound)),))} {cumulative}")
+            lines.append(f"{name}_bucket{_format_labels(labels + (('le', '+Inf'),))} {value[-2]}")
+            lines.append(f"{name}_count{_format_labels(labels)} {value[-2]}")
+            lines.append(f"{name}_sum{_format_labels(labels)} {value[-1]}")
+        return "\n".join(lines) + "\n"
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(labels):
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in labels) + "}"
+
+
+registry = MetricsRegistry()
+inc = registry.inc
+observe = registry.observe
+
+_current_crawler = None
+
+
+def set_current_crawler(script_path):
+    """이 프로세스에서 실행 중인 크롤러 지정 (워커가 실행마다 호출)"""
+    global _current_crawler
+    _current_crawler = os.path.splitext(os.path.basename(script_path))[0] if script_path else None
+
+
+def current_crawler():
+    """크롤러 단위 메트릭의 crawler 레이블 (지정되지 않았으면 실행 중인 스크립트 이름)"""
+    if _current_crawler:
+        return _current_crawler
+    return os.path.splitext(os.path.basename(sys.argv[0] or "unknown"))[0]
+
+
+def write_metrics_file(path):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(registry.snapshot(), f)
+
+
+def read_metrics_file(path):
+    """서브프로세스 크롤러가 남긴 메트릭을 읽어 합치고 파일 삭제"""
+    if not os.path.exists(path):
+        return
+    try:
+        with open(path, encoding="utf-8") as f:
+            registry.merge(json.load(f))
+    except ValueError:
+        pass
+    finally:
+        os.remove(path)
+
+
+# 스케줄러가 서브프로세스로 실행한 크롤러는 종료할 때 메트릭을 파일로 넘김
+if os.environ.get(METRICS_FILE_ENV):
+    atexit.register(write_metrics_file, os.environ[METRICS_FILE_ENV])
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?")[0] not in ("/metrics", "/"):
+            self.send_error(404)
+            return
+        body = registry.render().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_metrics_server(port=None):
+    """/metrics를 제공하는 HTTP 서버를 백그라운드 스레드로 시작 (포트가 0이면 시작하지 않음)"""
+    port = METRICS_PORT if port is None else port
+    if not port:
+        return None
+    server = ThreadingHTTPServer(("0.0.0.0", port), _MetricsHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="metrics", daemon=True).start()
+    return server
@@ -0,0 +1,457 @@
+"""여러 커뮤니티 게시판을 흉내 내는 로컬 HTTP 서버 (부하 테스트용, 실제 사이트 요청 없음)
+
+benchmark/fixtures의 목록/상세 페이지를 틀로 사용한다.
+    목록: 픽스처의 게시글 행을 반복해 페이지당 --posts개 행을 만들고 게시글 번호를 페이지마다 다르게 바꿈
+    상세: 상세 픽스처 그대로 (ppomppu는 EUC-KR)
+    픽스처의 날짜(2025-03-18 / 03.17 등)는 서버 실행 날짜 기준 오늘/어제로 바꿔서 응답
+응답마다 지연 시간 분포(--latency), 호스트별 초당 요청 한도 초과 시 429(--host-rate), 무작위 429/5xx(--throttle-ratio / --error-ratio)를 적용한다.
+
+요청 경로는 /<원래 호스트><원래 경로>이다. 크롤러/스케줄러는 CRAWLER_MOCK_SERVER를 지정하면 fetch()가 이 서버로 요청을 보낸다.
+    python3 -m common.mock_server serve --port 8590 --latency lognormal:0.15:0.5 --host-rate 2 --error-ratio 0.01
+    CRAWLER_MOCK_SERVER=http://127.0.0.1:8590 python3 crawler_schedule.py
+
+사이트 수를 늘린 부하 테스트 (사이트마다 가상 호스트 --replicas개, 가상 호스트마다 별도 토큰 버킷):
+    python3 -m common.mock_server loadtest --replicas 10 --pages 2 --rate-scale 10
+    python3 -m common.mock_server loadtest --replicas 10 --server http://127.0.0.1:8590   # 따로 띄운 서버 사용 (서버 옵션은 serve 쪽에서)
+"""
+import argparse
+import html
+import json
+import logging
+import math
+import random
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urljoin, urlsplit
+
+from common import http_client, timing
+from common.async_fetch import fetch_post_contents
+from common.http_client import fetch
+from common.parser import parse_html
+from common.parser_benchmark import FIXTURE_NOW, FIXTURE_SITES, load_fixture
+from common.rate_limiter import SITE_RATE_LIMITS, get_site_key
+
+# 사이트 -> 상세 페이지 경로 패턴 ("경로?쿼리"에 적용, 나머지 요청은 목록 페이지로 응답)
+DETAIL_PATTERNS = {
+    "dcinside": re.compile(r"/board/view/"),
+    "theqoo": re.compile(r"^/hot/\d+"),
+    "instiz": re.compile(r"^/pt/\d+"),
+    "clien": re.compile(r"/service/board/\w+/\d+"),
+    "ppomppu": re.compile(r"view\.php"),
+    "ruliweb": re.compile(r"/read/\d+"),
+    "bobaedream": re.compile(r"^/view\b"),
+    "82cook": re.compile(r"read\.php"),
+    "mlbpark": re.compile(r"m=view"),
+    "inven": re.compile(r"/webzine/\d+/\d+"),
+    "fmkorea": re.compile(r"^/\d+(\?|$)"),
+}
+# 목록 페이지 번호로 해석하는 쿼리 파라미터 (clien의 po는 0부터 시작)
+PAGE_PARAMS = ("page", "p", "pg", "po")
+# 상세 링크의 게시글 번호 (경로 마지막 부분이나 쿼리 값)
+POST_ID = re.compile(r"[/=](\d{6,})(?=$|[&?#])")
+HREF = re.compile(r'href="([^"]+)"')
+ERROR_STATUSES = (500, 502, 503)
+
+
+def parse_distribution(spec):
+    """지연 시간 분포 설정을 (인자 없이 호출하면 초를 돌려주는) 함수로 변환
+
+    "0.1" 고정, "0.05-0.3" 균등 분포, "exp:0.1" 평균 0.1초 지수 분포, "lognormal:0.1:0.5" 중앙값 0.1초 / 시그마 0.5 로그정규 분포
+    """
+    spec = str(spec or "0").strip()
+    if spec.startswith("exp:"):
+        mean = float(spec.split(":", 1)[1])
+        return lambda: random.expovariate(1 / mean) if mean > 0 else 0.0
+    if spec.startswith("lognormal:"):
+        median, sigma = (float(value) for value in spec.split(":")[1:3])
+        return lambda: random.lognormvariate(math.log(median), sigma)
+    if "-" in spec:
+        low, high = (float(value) for value in spec.split("-", 1))
+        return lambda: random.uniform(low, high)
+    fixed = float(spec)
+    return lambda: fixed
+
+
+def site_for_host(host):
+    """호스트(가상 호스트 포함)에 해당하는 픽스처 사이트 (없으면 None)"""
+    host = host.lower()
+    for site in FIXTURE_SITES:
+        if site in host:
+            return site
+    return None
+
+
+def _path_query(url):
+    parts = urlsplit(url)
+    return parts.path + ("?" + parts.query if parts.query else "")
+
+
+def _date_replacements(today):
+    """픽스처 날짜 문자열 -> today 기준 날짜 문자열 (긴 형식부터)"""
+    replacements = []
+    for fixture_day, day in ((FIXTURE_NOW, today), (FIXTURE_NOW - timedelta(days=1), today - timedelta(days=1))):
+        for fmt in ("%Y-%m-%d", "%Y.%m.%d", "%y.%m.%d", "%m/%d", "%m.%d"):
+            replacements.append((fixture_day.strftime(fmt), day.strftime(fmt)))
+    return replacements
+
+
+class SiteTemplate:
+    """픽스처 한 사이트의 목록 페이지 틀 (게시글 행 템플릿 + 행 앞뒤 부분)과 상세 페이지"""
+
+    def __init__(self, site):
+        self.site = site
+        self.encoding = FIXTURE_SITES[site][0]
+        self.pattern = DETAIL_PATTERNS[site]
+        self.detail = load_fixture(site, "detail").decode(self.encoding, errors="replace")
+
+        lines = load_fixture(site, "list").decode(self.encoding, errors="replace").split("\n")
+        rows = [(index, self._post_id(line)) for index, line in enumerate(lines)]
+        rows = [(index, post_id) for index, post_id in rows if post_id]
+        last = rows[-1][0]
+        row_indexes = {index for index, _ in rows}
+        # 게시글 행은 마지막 행 자리에 모아서 생성 (instiz처럼 표가 둘이면 앞 표는 비워짐)
+        self.head = "\n".join(line for index, line in enumerate(lines[:last]) if index not in row_indexes)
+        self.tail = "\n".join(lines[last + 1:])
+        self.rows = [(lines[index], post_id) for index, post_id in rows]
+        self.top_id = max(int(post_id) for _, post_id in rows)
+
+    def _post_id(self, line):
+        """게시글 행이면 상세 링크의 게시글 번호, 아니면 None"""
+        for href in HREF.findall(line):
+            path = _path_query(html.unescape(href))
+            ids = POST_ID.findall(path)
+            if ids and self.pattern.search(path):
+                return ids[-1]
+        return None
+
+    def list_page(self, page, posts, newest_id):
+        """page번째 목록 페이지 (게시글 번호 newest_id부터 내림차순)"""
+        start = newest_id - (page - 1) * posts
+        rows = []
+        for offset in range(posts):
+            line, post_id = self.rows[offset % len(self.rows)]
+            rows.append(line.replace(post_id, str(start - offset)))
+        return "\n".join((self.head, *rows, self.tail))
+
+
+class _HostBudget:
+    """호스트별 초당 요청 한도 (토큰이 없으면 기다리지 않고 다시 시도할 때까지의 시간을 반환)"""
+
+    def __init__(self, rate, burst):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def take(self):
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return 0.0
+            return (1 - self.tokens) / self.rate
+
+
+class MockSiteServer:
+    """목록/상세 페이지를 흉내 내는 스레드 HTTP 서버"""
+
+    def __init__(self, host="127.0.0.1", port=8590, posts=30, pages=3, latency="0", host_rate=0.0, host_burst=3,
+                 throttle_ratio=0.0, error_ratio=0.0, new_posts_per_minute=0.0):
+        self.posts = posts
+        self.pages = pages
+        self.latency = parse_distribution(latency)
+        self.host_rate = host_rate
+        self.host_burst = host_burst
+        self.throttle_ratio = throttle_ratio
+        self.error_ratio = error_ratio
+        self.new_posts_per_minute = new_posts_per_minute
+        self.started = time.monotonic()
+        self.templates = {site: SiteTemplate(site) for site in FIXTURE_SITES}
+        self.replacements = _date_replacements(datetime.now())
+        self.budgets = {}
+        self.stats = {}
+        self.lock = threading.Lock()
+
+        handler = type("MockSiteHandler", (_MockSiteHandler,), {"mock": self})
+        self.httpd = ThreadingHTTPServer((host, port), handler)
+        self.httpd.daemon_threads = True
+        self.thread = None
+
+    @property
+    def url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        """백그라운드 스레드에서 서버 시작"""
+        self.thread = threading.Thread(target=self.httpd.serve_forever, name="mock-server", daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def _count(self, host, status, size, kind):
+        with self.lock:
+            entry = self.stats.setdefault(host, {"requests": 0, "list": 0, "detail": 0, "bytes": 0, "statuses": {}})
+            entry["requests"] += 1
+            entry[kind] = entry.get(kind, 0) + 1
+            entry["bytes"] += size
+            entry["statuses"][str(status)] = entry["statuses"].get(str(status), 0) + 1
+
+    def _throttle(self, host):
+        """429로 응답해야 하면 Retry-After 초, 아니면 None"""
+        if self.host_rate > 0:
+            budget = self.budgets.get(host)
+            if budget is None:
+                with self.lock:
+                    budget = self.budgets.setdefault(host, _HostBudget(self.host_rate, self.host_burst))
+            wait = budget.take()
+            if wait > 0:
+                return max(1, math.ceil(wait))
+        if self.throttle_ratio and random.random() < self.throttle_ratio:
+            return 1
+        return None
+
+    def _localize(self, text):
+        for old, new in self.replacements:
+            text = text.replace(old, new)
+        return text
+
+    def respond(self, target):
+        """요청 경로(/<호스트><경로>)에 대한 (상태 코드, 헤더, 본문, 종류)"""
+        host, _, rest = target.lstrip("/").partition("/")
+        rest = "/" + rest
+        site = site_for_host(host)
+        if site is None:
+            return 404, {}, b"unknown site", "other"
+
+        time.sleep(max(0.0, self.latency()))
+        retry_after = self._throttle(host)
+        if retry_after is not None:
+            return 429, {"Retry-After": str(retry_after)}, b"Too Many Requests", "throttled"
+        if self.error_ratio and random.random() < self.error_ratio:
+            return random.choice(ERROR_STATUSES), {}, b"Server Error", "error"
+
+        template = self.templates[site]
+        if template.pattern.search(rest):
+            text, kind = template.detail, "detail"
+        else:
+            page = self._page_number(rest)
+            posts = self.posts if page <= self.pages else 0
+            minutes = (time.monotonic() - self.started) / 60
+            newest_id = template.top_id + int(minutes * self.new_posts_per_minute)
+            text, kind = template.list_page(page, posts, newest_id), "list"
+        charset = "EUC-KR" if template.encoding == "euc-kr" else "UTF-8"
+        body = self._localize(text).encode(template.encoding, errors="replace")
+        return 200, {"Content-Type": f"text/html; charset={charset}"}, body, kind
+
+    @staticmethod
+    def _page_number(path):
+        query = parse_qs(urlsplit(path).query)
+        for name in PAGE_PARAMS:
+            if query.get(name, [""])[0].isdigit():
+                page = int(query[name][0])
+                return page + 1 if name == "po" else max(1, page)
+        return 1
+
+
+class _MockSiteHandler(BaseHTTPRequestHandler):
+    mock = None
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        if self.path.startswith("/__stats"):
+            with self.mock.lock:
+                body = json.dumps(self.mock.stats, ensure_ascii=False).encode("utf-8")
+            status, headers, kind = 200, {"Content-Type": "application/json"}, None
+        else:
+            status, headers, body, kind = self.mock.respond(self.path)
+            self.mock._count(self.path.lstrip("/").split("/", 1)[0], status, len(body), kind)
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        try:
+            self.wfile.write(body)
+        except (BrokenPipeError, ConnectionResetError):
+            # 클라이언트가 읽기 타임아웃으로 먼저 끊은 경우
+            pass
+
+    def log_message(self, format, *args):
+        pass
+
+
+def mock_host(url, replica):
+    """replica번째 가상 호스트로 바꾼 URL (0이면 원래 URL)"""
+    if not replica:
+        return url
+    parts = urlsplit(url)
+    return parts._replace(netloc=f"{parts.netloc}.r{replica}").geturl()
+
+
+def _page_url(url, page):
+    return f"{url}{'&' if '?' in url else '?'}page={page}"
+
+
+def _detail_links(template, soup, base_url):
+    links = []
+    for a in soup.find_all("a", href=True):
+        url = urljoin(base_url, a["href"])
+        path = _path_query(url)
+        if POST_ID.search(path) and template.pattern.search(path) and url not in links:
+            links.append(url)
+    return links
+
+
+def _fetch_detail(url):
+    response = fetch(url)
+    if response.status_code != 200:
+        return {"text": ""}
+    return {"text": parse_html(response.text, response.url).get_text(" ", strip=True)[:200]}
+
+
+def _crawl_site(template, list_url, pages):
+    """가상 사이트 하나를 크롤러처럼 수집 (목록 pages쪽 -> 상세 페이지 병렬 수집), (요청 수, 소요 시간) 반환"""
+    start_time = time.perf_counter()
+    requests_made = 0
+    for page in range(1, pages + 1):
+        response = fetch(_page_url(list_url, page))
+        requests_made += 1
+        if response.status_code != 200:
+            continue
+        links = _detail_links(template, parse_html(response.text, response.url), response.url)
+        fetch_post_contents(_fetch_detail, links)
+        requests_made += len(links)
+    return requests_made, time.perf_counter() - start_time
+
+
+def _server_stats(server_url):
+    response = fetch(f"{server_url}/__stats", max_retries=0)
+    return response.json()
+
+
+def _status_totals(stats):
+    totals = {}
+    for entry in stats.values():
+        for status, count in entry["statuses"].items():
+            totals[status] = totals.get(status, 0) + count
+    return totals
+
+
+def run_load_test(replicas=10, pages=2, rate_scale=1.0, server_url=None, **server_options):
+    """사이트별 가상 호스트 replicas개를 동시에 수집하고 결과 요약 반환
+
+    server_url이 없으면 같은 프로세스에 모의 서버를 띄운다 (서버와 크롤러가 GIL을 나눠 쓰므로 꼬리 지연 측정은 별도 서버 권장).
+    """
+    server = None
+    if not server_url:
+        server = MockSiteServer(port=0, pages=pages, **server_options).start()
+        server_url = server.url
+    templates = server.templates if server else {site: SiteTemplate(site) for site in FIXTURE_SITES}
+    statuses_before = _status_totals(server.stats if server else _server_stats(server_url))
+    http_client.MOCK_SERVER = server_url
+
+    # 가상 호스트마다 원래 사이트 설정으로 별도 토큰 버킷 (rate_scale배 빠르게)
+    targets = []
+    for site, (_, url) in FIXTURE_SITES.items():
+        config = SITE_RATE_LIMITS.get(get_site_key(url))
+        for replica in range(replicas):
+            virtual_url = mock_host(url, replica)
+            key = get_site_key(virtual_url)
+            base = config or SITE_RATE_LIMITS.get(key) or {"rate": 1.0, "burst": 3, "jitter": 0.3}
+            SITE_RATE_LIMITS[key] = {**base, "rate": base["rate"] * rate_scale, "jitter": base.get("jitter", 0.0) / rate_scale}
+            targets.append((site, virtual_url))
+
+    timing.reset()
+    start_time = time.perf_counter()
+    try:
+        with ThreadPoolExecutor(max_workers=len(targets), thread_name_prefix="site") as executor:
+            results = list(executor.map(lambda target: _crawl_site(templates[target[0]], target[1], pages), targets))
+    finally:
+        elapsed = time.perf_counter() - start_time
+        http_client.MOCK_SERVER = ""
+        if server:
+            server.stop()
+
+    # 별도 서버는 이전 요청까지 누적된 통계이므로 시작 전 값을 뺌
+    statuses = _status_totals(server.stats if server else _server_stats(server_url))
+    statuses = {status: count - statuses_before.get(status, 0) for status, count in statuses.items()
+                if count > statuses_before.get(status, 0)}
+    site_seconds = sorted(seconds for _, seconds in results)
+    requests_made = sum(count for count, _ in results)
+    return {
+        "sites": len(targets),
+        "requests": requests_made,
+        "seconds": round(elapsed, 3),
+        "requests_per_sec": round(requests_made / elapsed, 2) if elapsed else 0.0,
+        "server_statuses": statuses,
+        "site_seconds": {"p50": round(site_seconds[len(site_seconds) // 2], 3), "max": round(site_seconds[-1], 3)},
+        "phases": timing.build_report("mock_loadtest")["phases"],
+    }
+
+
+def print_load_test(result):
+    print(f"가상 사이트 {result['sites']}개, 요청 {result['requests']}건, {result['seconds']:.1f}초 ({result['requests_per_sec']:.1f} req/s)")
+    print(f"사이트별 소요 시간 p50 {result['site_seconds']['p50']:.1f}초 / 최대 {result['site_seconds']['max']:.1f}초")
+    print("서버 응답 상태: " + ", ".join(f"{status} {count}건" for status, count in sorted(result["server_statuses"].items())))
+    for name in ("list_fetch", "detail_fetch", "rate_limit_wait", "retry_wait", "list_parse", "detail_parse"):
+        entry = result["phases"].get(name)
+        if entry:
+            print(f"  {name:<16} {entry['count']:>6}회  합계 {entry['total']:>9.3f}초  "
+                  f"p50 {entry['p50']:.4f}  p90 {entry['p90']:.4f}  p99 {entry['p99']:.4f}  max {entry['max']:.4f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="커뮤니티 게시판 모의 서버 / 부하 테스트")
+    parser.add_argument("command", choices=("serve", "loadtest"))
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8590)
+    parser.add_argument("--posts", type=int, default=30, help="목록 페이지당 게시글 수")
+    parser.add_argument("--pages", type=int, default=3, help="게시글이 있는 목록 페이지 수 (이후 페이지는 빈 목록)")
+    parser.add_argument("--latency", default="0", help="응답 지연 분포 (0.1 / 0.05-0.3 / exp:0.1 / lognormal:0.1:0.5)")
+    parser.add_argument("--host-rate", type=float, default=0.0, help="호스트별 초당 허용 요청 수, 넘으면 429 (0이면 제한 없음)")
+    parser.add_argument("--host-burst", type=int, default=3)
+    parser.add_argument("--throttle-ratio", type=float, default=0.0, help="무작위 429 응답 비율")
+    parser.add_argument("--error-ratio", type=float, default=0.0, help="무작위 5xx 응답 비율")
+    parser.add_argument("--new-posts-per-minute", type=float, default=0.0, help="분당 새 게시글 수 (목록 첫 번호 증가)")
+    parser.add_argument("--replicas", type=int, default=10, help="loadtest: 사이트별 가상 호스트 수")
+    parser.add_argument("--rate-scale", type=float, default=1.0, help="loadtest: 크롤러 사이트별 요청 속도 배수")
+    parser.add_argument("--server", help="loadtest: 따로 실행 중인 모의 서버 주소 (없으면 같은 프로세스에 띄움)")
+    parser.add_argument("--json", help="loadtest 결과를 저장할 JSON 파일")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.ERROR)
+
+    options = {"posts": args.posts, "latency": args.latency, "host_rate": args.host_rate, "host_burst": args.host_burst,
+               "throttle_ratio": args.throttle_ratio, "error_ratio": args.error_ratio,
+               "new_posts_per_minute": args.new_posts_per_minute}
+    if args.command == "serve":
+        server = MockSiteServer(args.host, args.port, pages=args.pages, **options)
+        print(f"모의 서버 실행: {server.url} (CRAWLER_MOCK_SERVER={server.url})")
+        try:
+            server.httpd.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            print(json.dumps(server.stats, ensure_ascii=False, indent=2))
+            server.httpd.server_close()
+        return
+
+    result = run_load_test(args.replicas, args.pages, args.rate_scale, args.server, **options)
+    print_load_test(result)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(result, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+import collections
+import os
+import threading
+from datetime import datetime
+
+# 크롤러별 출력 로그 위치 (<CRAWLER_LOG_DIR>/<크롤러 이름>_YYYYMMDD.log)
+CRAWLER_LOG_DIR = os.environ.get("CRAWLER_LOG_DIR", "logs/crawlers")
+# 한 줄 최대 길이 (본문/HTML/헤더를 통째로 출력하는 줄 잘라냄)
+OUTPUT_MAX_LINE_CHARS = int(os.environ.get("CRAWLER_OUTPUT_MAX_LINE_CHARS", 2000))
+# 크롤러 1회 실행당 로그 파일에 쓰는 최대 크기 (넘으면 이후 줄은 개수만 셈)
+OUTPUT_MAX_BYTES = int(os.environ.get("CRAWLER_OUTPUT_MAX_BYTES", 5 * 1024 * 1024))
+# 실패 보고용으로 메모리에 남기는 마지막 줄 수
+OUTPUT_TAIL_LINES = int(os.environ.get("CRAWLER_OUTPUT_TAIL_LINES", 200))
+
+
+def crawler_log_path(script_path):
+    """크롤러 스크립트의 오늘 날짜 출력 로그 파일 경로"""
+    name = os.path.splitext(os.path.basename(script_path))[0]
+    return os.path.join(CRAWLER_LOG_DIR, f"{name}_{datetime.now().strftime('%Y%m%d')}.log")
+
+
+class OutputCapture:
+    """크롤러 출력을 한 줄씩 받아 크롤러별 로그 파일에 쓰고 마지막 N줄을 보관
+
+    출력 전체를 메모리에 모으지 않으며, 줄 길이와 실행당 기록 크기에 상한을 둔다.
+    """
+
+    def __init__(self, script_path, max_line_chars=None, max_bytes=None, tail_lines=None):
+        self.path = crawler_log_path(script_path)
+        self.max_line_chars = max_line_chars or OUTPUT_MAX_LINE_CHARS
+        self.max_bytes = max_bytes or OUTPUT_MAX_BYTES
+        self.tail = collections.deque(maxlen=tail_lines or OUTPUT_TAIL_LINES)
+        self.lock = threading.Lock()
+        self.written_bytes = 0
+        self.line_count = 0
+        self.dropped_lines = 0
+        self.truncated_lines = 0
+
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.file = open(self.path, "a", encoding="utf-8", errors="replace", buffering=1)  # 줄 단위로 바로 기록
+        self.file.write(f"===== {datetime.now().strftime('%Y-%m-%d %H:%M:%S')} 실행 시작 =====\n")
+
+    def write_line(self, line):
+        """출력 한 줄 기록"""
+        line = line.rstrip("\r\n")
+        if len(line) > self.max_line_chars:
+            line = f"{line[:self.max_line_chars]} ...(+{len(line) - self.max_line_chars}자 생략)"
+            self.truncated_lines += 1
+        with self.lock:
+            self.line_count += 1
+            self.tail.append(line)
+            size = len(line.encode("utf-8", errors="replace")) + 1
+            if self.written_bytes + size > self.max_bytes:
+                self.dropped_lines += 1
+                return
+            self.written_bytes += size
+            if not self.file.closed:
+                self.file.write(line + "\n")
+
+    def get_tail(self):
+        """보관 중인 마지막 줄들을 하나의 문자열로 반환"""
+        with self.lock:
+            return "\n".join(self.tail)
+
+    def summary(self):
+        return (f"출력 {self.line_count}줄, 로그 {self.written_bytes / 1024:.1f}KB"
+                f" (긴 줄 자름 {self.truncated_lines}, 용량 초과로 생략 {self.dropped_lines}줄)")
+
+    def close(self):
+        with self.lock:
+            if self.file.closed:
+                return
+            if self.dropped_lines:
+                self.file.write(f"... 로그 용량 상한({self.max_bytes}바이트) 초과로 {self.dropped_lines}줄 생략\n")
+            self.file.write(f"===== {datetime.now().strftime('%Y-%m-%d %H:%M:%S')} 실행 종료 =====\n")
+            self.file.close()
+
+
+def stream_lines(stream, capture):
+    """파이프에서 한 줄씩 읽어 capture에 기록 (EOF까지, 별도 스레드에서 실행)"""
+    for line in iter(stream.readline, ""):
+        capture.write_line(line)
+    stream.close()
+
+
+class CaptureWriter:
+    """sys.stdout / sys.stderr 대신 쓰는 파일 객체 (워커 프로세스 안에서 print 출력을 줄 단위로 capture에 전달)"""
+
+    def __init__(self, capture):
+        self.capture = capture
+        self.lock = threading.Lock()
+        self.pending = ""
+
+    def write(self, text):
+        with self.lock:
+            self.pending += text
+            lines = self.pending.split("\n")
+            self.pending = lines.pop()
+        for line in lines:
+            self.capture.write_line(line)
+        # 줄바꿈 없이 계속 쌓이는 출력도 상한을 넘지 않도록
+        if len(self.pending) > self.capture.max_line_chars * 4:
+            self.flush()
+        return len(text)
+
+    def flush(self):
+        with self.lock:
+            pending, self.pending = self.pending, ""
+        if pending:
+            self.capture.write_line(pending)
+
+    def isatty(self):
+        return False
+
+
+def read_log_tail(path, lines=None, block_size=65536):
+    """로그 파일의 마지막 N줄 반환 (파일 끝부분만 읽음)"""
+    lines = lines or OUTPUT_TAIL_LINES
+    if not os.path.exists(path):
+        return ""
+    with open(path, "rb") as f:
+        f.seek(0, os.SEEK_END)
+        position = f.tell()
+        data = b""
+        while position > 0 and data.count(b"\n") <= lines:
+            read_size = min(block_size, position)
+            position -= read_size
+            f.seek(position)
+            data = f.read(read_size) + data
+    return "\n".join(data.decode("utf-8", errors="replace").splitlines()[-lines:])
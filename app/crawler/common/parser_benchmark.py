@@ -0,0 +1,340 @@
+"""사이트별 HTML 파싱/추출 벤치마크 (저장된 픽스처 페이지 사용, 네트워크 요청 없음)
+
+사용법 (app/crawler 에서):
+    python3 -m common.parser_benchmark                 # 사이트별 목록 픽스처로 파서 백엔드 비교
+    python3 -m common.parser_benchmark --repeat 20 --file ruliweb.com=/tmp/ruliweb.html
+    python3 -m common.parser_benchmark --sites         # 크롤러별 목록/상세 추출 처리량과 메모리 할당
+    python3 -m common.parser_benchmark --sites --only ruliweb --json /tmp/bench.json
+
+픽스처: benchmark/fixtures/<사이트>/list.html, detail.html
+    각 크롤러의 선택자(테이블/행/셀 클래스, 날짜 형식)에 맞춘 목록/상세 페이지.
+    게시글 날짜는 FIXTURE_NOW(2025-03-18) 기준 '오늘'이므로 --sites 측정 중에는 크롤러 모듈의 datetime.now()를 고정한다.
+"""
+import argparse
+import gc
+import importlib.util
+import json
+import os
+import tempfile
+import threading
+import time
+import tracemalloc
+from datetime import datetime
+
+from common import timing
+from common.isolation import isolate_crawler_state
+from common.parser import AVAILABLE_BACKENDS, parse_html
+
+CRAWLER_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FIXTURE_DIR = os.path.join(CRAWLER_DIR, "benchmark", "fixtures")
+# 픽스처 페이지의 '오늘' (목록의 HH:MM 날짜와 상세 페이지 작성일 기준)
+FIXTURE_NOW = datetime(2025, 3, 18, 15, 0, 0)
+
+# 사이트 -> (목록 픽스처 인코딩, 백엔드 비교용 대표 URL)
+FIXTURE_SITES = {
+    "dcinside": ("utf-8", "https://gall.dcinside.com/board/lists/?id=dcbest"),
+    "theqoo": ("utf-8", "https://theqoo.net/hot"),
+    "instiz": ("utf-8", "https://www.instiz.net/pt"),
+    "clien": ("utf-8", "https://www.clien.net/service/board/park"),
+    "ppomppu": ("euc-kr", "https://www.ppomppu.co.kr/zboard/zboard.php?id=freeboard"),
+    "ruliweb": ("utf-8", "https://bbs.ruliweb.com/best/humor"),
+    "bobaedream": ("utf-8", "https://www.bobaedream.co.kr/list?code=best"),
+    "82cook": ("utf-8", "https://www.82cook.com/entiz/enti.php?bn=15"),
+    "mlbpark": ("utf-8", "https://mlbpark.donga.com/mp/b.php?p=1&m=list&b=bullpen"),
+    "inven": ("utf-8", "https://www.inven.co.kr/board/webzine/2097"),
+    "fmkorea": ("utf-8", "https://www.fmkorea.com/humor"),
+}
+
+# 크롤러 스크립트 -> (픽스처 사이트, 상세 페이지 측정에 쓰는 URL)
+CRAWLER_FIXTURES = {
+    "hotissue/dcinside_realtimebestboard.py": ("dcinside", "https://gall.dcinside.com/board/view/?id=dcbest&no=312000"),
+    "politics/dcinside_politics.py": ("dcinside", "https://gall.dcinside.com/board/view/?id=stock_new2&no=312000"),
+    "politics/dcinside_peoplepower.py": ("dcinside", "https://gall.dcinside.com/mgallery/board/view/?id=alliescon&no=312000"),
+    "hotissue/fmkorea_funnyboard.py": ("fmkorea", "https://www.fmkorea.com/8300000000"),
+    "politics/fmkorea_politics.py": ("fmkorea", "https://www.fmkorea.com/8300000000"),
+    "hotissue/ruliweb_funnyboard.py": ("ruliweb", "https://bbs.ruliweb.com/best/board/300143/read/71000000"),
+    "politics/ruliweb_politics.py": ("ruliweb", "https://bbs.ruliweb.com/community/board/300148/read/71000000"),
+    "politics/ruliweb_society_politics_economy.py": ("ruliweb", "https://bbs.ruliweb.com/community/board/300018/read/71000000"),
+    "hotissue/ppomppu_freeboard.py": ("ppomppu", "https://www.ppomppu.co.kr/zboard/view.php?id=freeboard&no=9600000"),
+    "politics/ppomppu_politics.py": ("ppomppu", "https://www.ppomppu.co.kr/zboard/view.php?id=issue&no=9600000"),
+    "hotissue/mlbpark_bullpen.py": ("mlbpark", "https://mlbpark.donga.com/mp/b.php?p=1&b=bullpen&id=202503180100000&m=view"),
+    "politics/mlbpark_politics.py": ("mlbpark", "https://mlbpark.donga.com/mp/b.php?p=1&b=bullpen&id=202503180100000&m=view"),
+    "hotissue/bobaedream_bestboard.py": ("bobaedream", "https://www.bobaedream.co.kr/view?code=best&No=871000"),
+    "politics/bobaedream_politics.py": ("bobaedream", "https://www.bobaedream.co.kr/view?code=politic&No=871000"),
+    "hotissue/instiz_issue.py": ("instiz", "https://www.instiz.net/pt/8120000"),
+    "hotissue/theqoo_hotboard.py": ("theqoo", "https://theqoo.net/hot/3650000000"),
+    "hotissue/clien_parkboard.py": ("clien", "https://www.clien.net/service/board/park/18990000"),
+    "hotissue/82cook_freeboard.py": ("82cook", "https://www.82cook.com/entiz/read.php?bn=15&num=3920000"),
+    "hotissue/inven_openissue.py": ("inven", "https://www.inven.co.kr/board/webzine/2097/1450000"),
+}
+
+# 목록 첫 페이지 이후 요청에 돌려주는 빈 페이지 (게시판 요소가 없어 크롤러가 탐색을 멈춤, 인스티즈의 비정상 응답 기준 1000자 이상)
+BLANK_PAGE = "<html><head><title>empty</title></head><body><div id=\"wrap\"><!-- " + "-" * 1024 + " --></div></body></html>"
+
+
+def load_fixture(site, kind):
+    """픽스처 페이지 원본 바이트 (kind: list / detail)"""
+    with open(os.path.join(FIXTURE_DIR, site, f"{kind}.html"), "rb") as f:
+        return f.read()
+
+
+def load_fixture_text(site, kind="list"):
+    encoding = FIXTURE_SITES[site][0]
+    return load_fixture(site, kind).decode(encoding, errors="replace")
+
+
+def _extract(soup):
+    """크롤러가 실제로 하는 추출 작업과 비슷한 부하"""
+    for row in soup.find_all("tr"):
+        row.get_text(strip=True)
+    return [img.get("src") for img in soup.find_all("img")]
+
+
+def benchmark(documents, repeat=10, backends=None):
+    """문서별/백엔드별 평균 파싱+추출 시간(ms) 측정
+
+    documents: {site: html}
+    """
+    backends = backends or AVAILABLE_BACKENDS
+    results = {}
+    for site, html in documents.items():
+        results[site] = {}
+        for backend in backends:
+            start_time = time.perf_counter()
+            for _ in range(repeat):
+                _extract(parse_html(html, backend=backend))
+            results[site][backend] = (time.perf_counter() - start_time) / repeat * 1000
+    return results
+
+
+def print_results(results, documents, backends=None):
+    backends = backends or AVAILABLE_BACKENDS
+    print(f"{'site':<20}{'size(KB)':>10}" + "".join(f"{backend + '(ms)':>18}" for backend in backends))
+    for site, timings in results.items():
+        size_kb = len(documents[site].encode("utf-8")) / 1024
+        print(f"{site:<20}{size_kb:>10.1f}" + "".join(f"{timings[backend]:>18.2f}" for backend in backends))
+
+
+class FixtureResponse:
+    """fetch()가 돌려주는 requests.Response 대신 쓰는 응답 (크롤러가 사용하는 속성만)"""
+
+    status_code = 200
+
+    def __init__(self, url, content, encoding):
+        self.url = url
+        self.content = content
+        self.encoding = encoding
+        self.headers = {"Content-Type": f"text/html; charset={encoding}"}
+
+    @property
+    def text(self):
+        return self.content.decode(self.encoding or "utf-8", errors="replace")
+
+    def raise_for_status(self):
+        pass
+
+
+class FixtureServer:
+    """크롤러 모듈의 fetch 대신 픽스처 페이지를 돌려줌
+
+    상세 수집 단계(fetch_post_contents 안)의 요청에는 상세 픽스처를, 목록 요청에는 첫 요청만 목록 픽스처를 주고
+    이후 페이지는 빈 페이지를 준다. 처리량은 픽스처 페이지(빈 페이지 제외)만 센다.
+    """
+
+    def __init__(self, site):
+        self.encoding = FIXTURE_SITES[site][0]
+        self.list_page = load_fixture(site, "list")
+        self.detail_page = load_fixture(site, "detail")
+        self.blank_page = BLANK_PAGE.encode(self.encoding)
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self.lock:
+            self.list_requests = 0
+            self.pages = 0
+            self.bytes = 0
+
+    def fetch(self, url, headers=None, **kwargs):
+        if timing.current_stage() == "detail":
+            content = self.detail_page
+        else:
+            with self.lock:
+                content = self.list_page if self.list_requests == 0 else self.blank_page
+                self.list_requests += 1
+        if content is not self.blank_page:
+            with self.lock:
+                self.pages += 1
+                self.bytes += len(content)
+        return FixtureResponse(url, content, self.encoding)
+
+
+class _FixtureDatetime(datetime):
+    """now()가 FIXTURE_NOW를 돌려주는 datetime (크롤러의 '오늘 날짜' 판정을 픽스처에 맞춤)"""
+
+    @classmethod
+    def now(cls, tz=None):
+        return cls(*FIXTURE_NOW.timetuple()[:6], tzinfo=tz)
+
+
+def _load_crawler_module(script_path):
+    module_name = "bench_" + os.path.splitext(os.path.basename(script_path))[0]
+    spec = importlib.util.spec_from_file_location(module_name, script_path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def _throughput(pages, size, seconds):
+    return {
+        "pages": pages,
+        "bytes": size,
+        "seconds": round(seconds, 6),
+        "pages_per_sec": round(pages / seconds, 2) if seconds else 0.0,
+        "mb_per_sec": round(size / seconds / 1024 / 1024, 3) if seconds else 0.0,
+    }
+
+
+def benchmark_crawler(script, repeat=5):
+    """크롤러 하나의 추출 처리량 측정
+
+    run: run() 전체 (목록 행 파싱 + 필터링 + 상세 페이지 본문 추출 + 기록)
+    detail: get_post_content() 단독 (상세 페이지 파싱 + 본문/이미지 추출)
+    rows: get_post_info() 단독 (목록 행 하나씩 파싱하는 함수가 있는 크롤러만)
+    alloc: run() 1회 동안 tracemalloc으로 잰 최대 / 잔여 메모리 할당량
+    """
+    site, detail_url = CRAWLER_FIXTURES[script]
+    module = _load_crawler_module(os.path.join(CRAWLER_DIR, script))
+    server = FixtureServer(site)
+    # 설정(SPEC)으로 정의된 크롤러는 공용 엔진이 요청/날짜 판정을 하므로 엔진 쪽을 바꿈
+    # (엔진이 import하는 seen_store/record_sink가 isolate_crawler_state의 환경 변수를 읽도록 여기서 import)
+    from common import crawl_engine
+    target = crawl_engine if hasattr(module, "SPEC") else module
+    original = target.fetch, target.datetime
+    target.fetch, target.datetime = server.fetch, _FixtureDatetime
+    result = {"crawler": os.path.splitext(os.path.basename(script))[0], "site": site}
+    try:
+        # run() 전체
+        server.reset()
+        kept = 0
+        start_time = time.perf_counter()
+        for _ in range(repeat):
+            timing.reset()
+            server.list_requests = 0
+            records = module.run()
+            kept = 0 if records is None else len(records)
+        result["run"] = _throughput(server.pages, server.bytes, time.perf_counter() - start_time)
+        result["records"] = kept
+
+        # 상세 페이지 추출 단독
+        server.reset()
+        start_time = time.perf_counter()
+        with timing.stage("detail"):
+            for _ in range(repeat * 10):
+                content = module.get_post_content(detail_url)
+        result["detail"] = _throughput(server.pages, server.bytes, time.perf_counter() - start_time)
+        result["detail_text_chars"] = len(content.get("text") or "")
+
+        # 목록 행 파싱 단독
+        if hasattr(module, "get_post_info"):
+            soup = parse_html(server.list_page.decode(server.encoding, errors="replace"))
+            rows = soup.find_all("tr", id="detour")
+            start_time = time.perf_counter()
+            for _ in range(repeat * 10):
+                parsed = [module.get_post_info(row) for row in rows]
+            elapsed = time.perf_counter() - start_time
+            result["rows"] = {"rows": len(rows), "parsed": sum(1 for info in parsed if info),
+                              "rows_per_sec": round(len(rows) * repeat * 10 / elapsed, 1) if elapsed else 0.0}
+
+        # 메모리 할당
+        server.list_requests = 0
+        timing.reset()
+        tracemalloc.start()
+        try:
+            module.run()
+            gc.collect()  # 순환 참조로 남은 파싱 트리는 잔여량에서 제외
+            current, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        result["alloc"] = {"peak_kb": round(peak / 1024, 1), "retained_kb": round(current / 1024, 1)}
+    except Exception as e:
+        result["error"] = f"{type(e).__name__}: {e}"
+    finally:
+        target.fetch, target.datetime = original
+    return result
+
+
+def benchmark_crawlers(repeat=5, only=None):
+    """모든 크롤러(또는 only에 사이트/크롤러 이름이 포함된 것만)의 추출 처리량 측정"""
+    results = []
+    with tempfile.TemporaryDirectory(prefix="crawler_bench_") as work_dir:
+        isolate_crawler_state(work_dir)
+        os.environ.setdefault("CRAWLER_LOG_LEVEL", "ERROR")
+        for script in CRAWLER_FIXTURES:
+            if only and not any(name in script for name in only):
+                continue
+            results.append(benchmark_crawler(script, repeat=repeat))
+    return results
+
+
+def print_crawler_results(results):
+    print(f"{'crawler':<34}{'records':>8}{'run p/s':>10}{'run MB/s':>10}{'detail p/s':>12}{'detail MB/s':>12}"
+          f"{'rows/s':>10}{'peak KB':>10}{'left KB':>10}")
+    for result in results:
+        if "error" in result:
+            print(f"{result['crawler']:<34} 실패: {result['error']}")
+            continue
+        rows = result.get("rows", {}).get("rows_per_sec", "-")
+        print(f"{result['crawler']:<34}{result['records']:>8}"
+              f"{result['run']['pages_per_sec']:>10.1f}{result['run']['mb_per_sec']:>10.2f}"
+              f"{result['detail']['pages_per_sec']:>12.1f}{result['detail']['mb_per_sec']:>12.2f}"
+              f"{rows:>10}{result['alloc']['peak_kb']:>10.1f}{result['alloc']['retained_kb']:>10.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="사이트별 HTML 파싱/추출 벤치마크 (저장된 픽스처 사용)")
+    parser.add_argument("--repeat", type=int, default=10, help="문서당 반복 횟수 (--sites는 run() 반복 횟수)")
+    parser.add_argument("--file", action="append", default=[], metavar="SITE=PATH",
+                        help="픽스처 대신 저장된 HTML 파일로 백엔드 비교")
+    parser.add_argument("--live", action="store_true", help="픽스처 대신 사이트 목록 페이지를 받아와서 백엔드 비교")
+    parser.add_argument("--sites", action="store_true", help="크롤러별 목록/상세 추출 처리량과 메모리 할당 측정")
+    parser.add_argument("--only", action="append", default=[], metavar="NAME",
+                        help="--sites에서 이름에 NAME이 들어간 크롤러만 측정 (여러 번 지정 가능)")
+    parser.add_argument("--json", metavar="PATH", help="--sites 결과를 JSON 파일로 저장 (변경 전후 비교용)")
+    args = parser.parse_args()
+
+    if args.sites:
+        print(f"파서: {os.environ.get('CRAWLER_PARSER', AVAILABLE_BACKENDS[0])}, run() 반복 {args.repeat}회")
+        results = benchmark_crawlers(repeat=args.repeat, only=args.only)
+        print_crawler_results(results)
+        if args.json:
+            with open(args.json, "w", encoding="utf-8") as f:
+                json.dump(results, f, ensure_ascii=False, indent=2)
+        return
+
+    documents = {}
+    if args.file:
+        for item in args.file:
+            site, path = item.split("=", 1)
+            with open(path, encoding="utf-8", errors="replace") as f:
+                documents[site] = f.read()
+    elif args.live:
+        from common.http_client import fetch
+
+        for site, (_, url) in FIXTURE_SITES.items():
+            try:
+                response = fetch(url, headers={"User-Agent": "Mozilla/5.0"})
+                response.raise_for_status()
+                documents[site] = response.text
+            except Exception as e:
+                print(f"{site} 페이지 로드 실패, 건너뜀: {e}")
+    else:
+        documents = {site: load_fixture_text(site) for site in FIXTURE_SITES}
+
+    print(f"사용 가능한 파서: {', '.join(AVAILABLE_BACKENDS)}, 반복 {args.repeat}회")
+    results = benchmark(documents, repeat=args.repeat)
+    print_results(results, documents)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+import json
+import os
+import random
+import threading
+import time
+from urllib.parse import urlparse
+
+# 사이트별 요청 속도 설정 (rate: 초당 최대 요청 수, burst: 연속 허용 요청 수, jitter: 추가 무작위 지연 최대값(초))
+# 실제 속도는 응답 상태/지연에 따라 rate * MIN_RATE_RATIO ~ rate 사이에서 자동 조절된다
+SITE_RATE_LIMITS = {
+    "dcinside.com": {"rate": 0.5, "burst": 2, "jitter": 0.5},
+    "fmkorea.com": {"rate": 0.5, "burst": 2, "jitter": 0.5},
+    "theqoo.net": {"rate": 0.5, "burst": 2, "jitter": 0.5},
+    "instiz.net": {"rate": 0.7, "burst": 2, "jitter": 0.5},
+    "ruliweb.com": {"rate": 1.0, "burst": 3, "jitter": 0.3},
+    "ppomppu.co.kr": {"rate": 1.0, "burst": 3, "jitter": 0.3},
+    "mlbpark.donga.com": {"rate": 1.0, "burst": 3, "jitter": 0.3},
+    "bobaedream.co.kr": {"rate": 1.0, "burst": 3, "jitter": 0.3},
+    "clien.net": {"rate": 1.0, "burst": 3, "jitter": 0.3},
+    "82cook.com": {"rate": 1.0, "burst": 3, "jitter": 0.3},
+    "inven.co.kr": {"rate": 1.0, "burst": 3, "jitter": 0.3},
+}
+DEFAULT_RATE_LIMIT = {"rate": 1.0, "burst": 3, "jitter": 0.3}
+
+# 속도 조절 기준 (느린 응답 기준 시간(초), 최저 속도 비율, 속도 회복에 필요한 연속 정상 응답 수)
+SLOW_LATENCY = float(os.environ.get("CRAWLER_SLOW_LATENCY", 3.0))
+MIN_RATE_RATIO = 0.125
+RECOVERY_STREAK = 5
+THROTTLE_STATUSES = {429, 503}
+
+# 환경 변수로 사이트별 설정 덮어쓰기 (예: CRAWLER_RATE_LIMITS='{"dcinside.com": {"rate": 0.3}}')
+for _site, _overrides in json.loads(os.environ.get("CRAWLER_RATE_LIMITS", "{}")).items():
+    SITE_RATE_LIMITS[_site] = {**SITE_RATE_LIMITS.get(_site, DEFAULT_RATE_LIMIT), **_overrides}
+
+
+class TokenBucket:
+    """스레드 안전 토큰 버킷 (토큰이 부족하면 예약 후 필요한 만큼만 대기)
+
+    응답 결과를 record_response()로 알려주면 429/503이나 느린 응답에는 속도를 절반으로 줄이고,
+    정상 응답이 이어지면 설정된 최대 속도까지 조금씩 회복한다.
+    """
+
+    def __init__(self, rate, burst, jitter=0.0):
+        self.max_rate = rate
+        self.min_rate = rate * MIN_RATE_RATIO
+        self.rate = rate
+        self.burst = burst
+        self.jitter = jitter
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+        self.last_slowdown = 0.0
+        self.healthy_streak = 0
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        """토큰 1개를 얻을 때까지 대기하고 실제 대기 시간(초)을 반환"""
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.tokens -= 1
+            wait = -self.tokens / self.rate if self.tokens < 0 else 0.0
+            wait = max(wait, self.paused_until - now)
+        if self.jitter:
+            wait += random.uniform(0, self.jitter)
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    def pause(self, seconds):
+        """Retry-After 등으로 지정된 시간 동안 이 사이트로의 모든 요청을 멈춤"""
+        with self.lock:
+            self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+
+    def record_response(self, status_code, latency):
+        """응답 상태 코드(연결 실패 시 None)와 지연 시간으로 요청 속도 조절"""
+        with self.lock:
+            now = time.monotonic()
+            if status_code is None or status_code in THROTTLE_STATUSES or latency > SLOW_LATENCY:
+                self.healthy_streak = 0
+                # 동시에 들어온 실패 응답으로 속도가 한꺼번에 떨어지지 않도록 한 간격에 한 번만 감속
+                if now - self.last_slowdown >= 1.0 / self.rate:
+                    self.rate = max(self.min_rate, self.rate / 2)
+                    self.last_slowdown = now
+            elif status_code < 400:
+                self.healthy_streak += 1
+                if self.healthy_streak >= RECOVERY_STREAK and self.rate < self.max_rate:
+                    self.rate = min(self.max_rate, self.rate + self.max_rate * 0.1)
+                    self.healthy_streak = 0
+
+
+_limiters = {}
+_limiters_lock = threading.Lock()
+
+
+def get_site_key(url):
+    """URL의 호스트를 설정된 사이트 키로 변환 (gall.dcinside.com -> dcinside.com)"""
+    host = urlparse(url).netloc.lower().split(":")[0]
+    for site in SITE_RATE_LIMITS:
+        if host == site or host.endswith("." + site):
+            return site
+    return host
+
+
+def get_limiter(url):
+    """URL이 속한 사이트의 공유 토큰 버킷 반환 (없으면 생성)"""
+    site = get_site_key(url)
+    limiter = _limiters.get(site)
+    if limiter is None:
+        with _limiters_lock:
+            limiter = _limiters.get(site)
+            if limiter is None:
+                config = SITE_RATE_LIMITS.get(site, DEFAULT_RATE_LIMIT)
+                limiter = TokenBucket(config["rate"], config["burst"], config.get("jitter", 0.0))
+                _limiters[site] = limiter
+    return limiter
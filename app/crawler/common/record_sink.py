@@ -0,0 +1,134 @@
+import json
+import os
+import threading
+import time
+from datetime import datetime
+
+from common import metrics, timing
+
+# 실행 중 수집한 게시글을 바로 기록해 두는 위치 (<SINK_DIR>/<실행 ID>/<크롤러 이름>.jsonl)
+SINK_DIR = os.environ.get("CRAWLER_SINK_DIR", "/code/data/sink")
+# 버퍼에 이만큼 쌓이거나 마지막 기록 후 이 시간이 지나면 파일에 씀
+SINK_FLUSH_EVERY = int(os.environ.get("CRAWLER_SINK_FLUSH_EVERY", 20))
+SINK_FLUSH_SECONDS = float(os.environ.get("CRAWLER_SINK_FLUSH_SECONDS", 10))
+# 스케줄러가 수집 주기마다 정해서 크롤러에 넘겨주는 실행 ID
+RUN_ID_ENV = "CRAWLER_RUN_ID"
+
+
+def new_run_id():
+    """수집 주기 실행 ID 생성"""
+    return datetime.now().strftime("%Y%m%d_%H%M%S")
+
+
+def current_run_id():
+    """스케줄러가 지정한 실행 ID (단독 실행이면 새로 생성)"""
+    run_id = os.environ.get(RUN_ID_ENV)
+    if not run_id:
+        run_id = new_run_id()
+        os.environ[RUN_ID_ENV] = run_id
+    return run_id
+
+
+def sink_path(script_path, run_id):
+    """크롤러 스크립트(예: dcinside_politics.py)의 실행별 기록 파일 경로"""
+    name = os.path.splitext(os.path.basename(script_path))[0]
+    return os.path.join(SINK_DIR, run_id, f"{name}.jsonl")
+
+
+def _json_default(value):
+    if isinstance(value, datetime):
+        return value.strftime("%Y-%m-%d %H:%M:%S")
+    return str(value)
+
+
+class RecordSink:
+    """수집이 끝난 게시글 행을 한 줄씩 덧붙여 쓰는 JSONL 기록기
+
+    크롤러가 제한 시간 초과로 중단되어도 이미 기록된 행은 파일에 남아 스케줄러가 DB에 넣을 수 있다.
+    매 행마다 쓰지 않고 SINK_FLUSH_EVERY개 또는 SINK_FLUSH_SECONDS초 단위로 모아서 쓴다.
+    """
+
+    def __init__(self, path, flush_every=None, flush_seconds=None):
+        self.path = path
+        self.flush_every = flush_every or SINK_FLUSH_EVERY
+        self.flush_seconds = SINK_FLUSH_SECONDS if flush_seconds is None else flush_seconds
+        self.lock = threading.Lock()
+        self.buffer = []
+        self.count = 0
+        self.last_flush = time.monotonic()
+        self.crawler = os.path.splitext(os.path.basename(self.path))[0]  # 메트릭 레이블 (크롤러 이름)
+
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.file = open(self.path, "a", encoding="utf-8")
+
+    @classmethod
+    def for_script(cls, script_path, **kwargs):
+        """크롤러 스크립트 경로(__file__)와 현재 실행 ID로 기록기 생성"""
+        return cls(sink_path(script_path, current_run_id()), **kwargs)
+
+    @timing.timed("sink_write")
+    def write(self, record):
+        """게시글 행 하나 기록 (버퍼가 차면 파일에 씀)"""
+        line = json.dumps(record, ensure_ascii=False, default=_json_default)
+        with self.lock:
+            self.buffer.append(line)
+            self.count += 1
+            metrics.inc("crawler_posts_kept_total", crawler=self.crawler)
+            if len(self.buffer) >= self.flush_every or time.monotonic() - self.last_flush >= self.flush_seconds:
+                self._flush_locked()
+
+    def _flush_locked(self):
+        if self.buffer and not self.file.closed:
+            self.file.write("\n".join(self.buffer) + "\n")
+            self.file.flush()
+            self.buffer = []
+        self.last_flush = time.monotonic()
+
+    def flush(self):
+        with self.lock:
+            self._flush_locked()
+
+    def close(self):
+        with self.lock:
+            self._flush_locked()
+            self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __del__(self):
+        try:
+            self.close()
+        except Exception:
+            pass
+
+
+def read_records(path):
+    """기록 파일의 게시글 행 목록 반환 (중단되며 잘린 마지막 줄은 건너뜀)"""
+    records = []
+    if not os.path.exists(path):
+        return records
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                records.append(json.loads(line))
+            except ValueError:
+                continue
+    return records
+
+
+def remove_sink(path):
+    """DB 적재가 끝난 기록 파일 삭제 (실행 디렉터리가 비면 함께 삭제)"""
+    try:
+        os.remove(path)
+        os.rmdir(os.path.dirname(path))
+    except OSError:
+        pass
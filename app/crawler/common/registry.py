@@ -0,0 +1,145 @@
+"""크롤러 레지스트리 (hotissue/politics 아래 크롤러 스크립트 자동 등록)
+
+각 크롤러 스크립트는 모듈 최상단에 CRAWLER_INFO 딕셔너리를 둔다.
+    CRAWLER_INFO = {"community": "1p", "host": "gall.dcinside.com", "priority": 1}
+    (선택) "interval": 실행 간격(분), "deadline": 실행 시각부터 끝나야 하는 시간(분, 기본은 간격과 같음)
+    (선택) "enabled": False 이면 등록만 하고 실행하지 않음
+
+레지스트리는 스크립트를 import하지 않고 소스에서 CRAWLER_INFO 값만 읽는다 (ast).
+그래서 스케줄러 시작 시 크롤러 의존성(pandas 등)을 불러오지 않고, 크롤러 모듈은 실제로 실행될 때 워커 안에서 처음 import된다.
+게시판을 추가할 때는 hotissue/ 또는 politics/ 에 스크립트를 두면 다음 주기부터 실행된다 (목록 수정 불필요).
+
+    python3 -m common.registry    # 등록된 크롤러 목록 출력 (app/crawler 에서)
+"""
+import ast
+import logging
+import os
+
+from common.rate_limiter import get_site_key
+
+CRAWLER_DIR = os.environ.get("CRAWLER_DIR", os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# 크롤러 그룹 (디렉터리 이름, 앞에 있는 그룹이 먼저 실행)
+CRAWLER_GROUPS = ("politics", "hotissue")
+# CRAWLER_INFO에 priority가 없을 때 그룹별 기본 우선순위 (작을수록 먼저)
+GROUP_PRIORITY = {"politics": 1, "hotissue": 2}
+# 쉼표로 구분한 크롤러 이름, 스크립트의 enabled 값보다 우선 (예: CRAWLER_DISABLED=inven_openissue)
+DISABLED = {name.strip() for name in os.environ.get("CRAWLER_DISABLED", "").split(",") if name.strip()}
+ENABLED = {name.strip() for name in os.environ.get("CRAWLER_ENABLED", "").split(",") if name.strip()}
+# CRAWLER_INFO에 interval이 없을 때 실행 간격(분), 기본 6시간 (하루 4회)
+DEFAULT_INTERVAL_MINUTES = float(os.environ.get("CRAWLER_INTERVAL_MINUTES", 360))
+
+
+def _parse_minutes(value):
+    """"dcinside_realtimebestboard=30,theqoo_hotboard=30" -> {이름: 분}"""
+    minutes = {}
+    for item in value.split(","):
+        name, _, number = item.partition("=")
+        if name.strip() and number.strip():
+            minutes[name.strip()] = float(number)
+    return minutes
+
+
+# 사이트별 실행 간격 / 마감 시간(분) 덮어쓰기, 스크립트의 값보다 우선
+INTERVAL_OVERRIDES = _parse_minutes(os.environ.get("CRAWLER_SITE_INTERVALS", ""))
+DEADLINE_OVERRIDES = _parse_minutes(os.environ.get("CRAWLER_SITE_DEADLINES", ""))
+
+INFO_NAME = "CRAWLER_INFO"
+
+
+class CrawlerInfo:
+    """등록된 크롤러 하나 (스크립트 경로와 CRAWLER_INFO 메타데이터)"""
+
+    def __init__(self, path, group, community=None, host=None, priority=None, interval=None, deadline=None,
+                 enabled=True, **extra):
+        self.path = path
+        self.name = os.path.splitext(os.path.basename(path))[0]
+        self.group = group
+        self.community = community
+        self.host = host
+        self.priority = GROUP_PRIORITY.get(group, len(GROUP_PRIORITY) + 1) if priority is None else priority
+        self.enabled = (enabled or self.name in ENABLED) and self.name not in DISABLED
+        # 실행 간격과 마감 시간 (초)
+        self.interval = INTERVAL_OVERRIDES.get(self.name, interval or DEFAULT_INTERVAL_MINUTES) * 60
+        self.deadline = DEADLINE_OVERRIDES.get(self.name, deadline or self.interval / 60) * 60
+        # 같은 도메인의 크롤러는 순서대로 실행 (호스트가 없으면 파일명 앞부분으로 묶음)
+        self.domain = get_site_key(f"https://{host}/") if host else self.name.split("_")[0]
+        self.extra = extra
+
+    @property
+    def is_politics(self):
+        return self.group == "politics"
+
+    def sort_key(self):
+        group_order = CRAWLER_GROUPS.index(self.group) if self.group in CRAWLER_GROUPS else len(CRAWLER_GROUPS)
+        return (self.priority, group_order, self.name)
+
+    def __repr__(self):
+        return f"CrawlerInfo({self.name}, group={self.group}, community={self.community}, priority={self.priority})"
+
+
+def read_crawler_info(path):
+    """스크립트 소스에서 CRAWLER_INFO 딕셔너리 리터럴을 읽음 (import하지 않음, 없으면 None)"""
+    with open(path, encoding="utf-8") as f:
+        tree = ast.parse(f.read(), filename=path)
+    for node in tree.body:
+        if isinstance(node, ast.Assign) and any(isinstance(target, ast.Name) and target.id == INFO_NAME
+                                                for target in node.targets):
+            return ast.literal_eval(node.value)
+    return None
+
+
+# 경로 -> (수정 시각, CrawlerInfo), 파일이 바뀌지 않았으면 다시 파싱하지 않음
+_cache = {}
+
+
+def _load_info(path, group):
+    mtime = os.path.getmtime(path)
+    cached = _cache.get(path)
+    if cached and cached[0] == mtime:
+        return cached[1]
+    try:
+        meta = read_crawler_info(path)
+    except (SyntaxError, ValueError) as e:
+        logging.error(f"크롤러 메타데이터를 읽을 수 없습니다: {path}, 오류: {str(e)}")
+        meta = None
+    info = CrawlerInfo(path, group, **meta) if meta is not None else None
+    _cache[path] = (mtime, info)
+    return info
+
+
+def discover(crawler_dir=None):
+    """그룹 디렉터리의 크롤러 스크립트 목록 (CRAWLER_INFO가 없는 파일은 크롤러가 아님, 우선순위 순)"""
+    crawler_dir = crawler_dir or CRAWLER_DIR
+    crawlers = []
+    for group in CRAWLER_GROUPS:
+        group_dir = os.path.join(crawler_dir, group)
+        if not os.path.isdir(group_dir):
+            logging.warning(f"크롤러 디렉터리가 없습니다: {group_dir}")
+            continue
+        for file_name in sorted(os.listdir(group_dir)):
+            if not file_name.endswith(".py") or file_name.startswith("_"):
+                continue
+            info = _load_info(os.path.join(group_dir, file_name), group)
+            if info is not None:
+                crawlers.append(info)
+    return sorted(crawlers, key=CrawlerInfo.sort_key)
+
+
+def enabled_crawlers(crawler_dir=None):
+    """실행할 크롤러 목록 (우선순위 순)"""
+    return [info for info in discover(crawler_dir) if info.enabled]
+
+
+def find_crawler(name_or_path, crawler_dir=None):
+    """크롤러 이름 또는 스크립트 경로로 찾기 (없으면 None)"""
+    for info in discover(crawler_dir):
+        if name_or_path in (info.name, info.path) or os.path.abspath(name_or_path) == info.path:
+            return info
+    return None
+
+
+if __name__ == "__main__":
+    for info in discover():
+        state = "" if info.enabled else "  (비활성)"
+        print(f"{info.priority:>3}  {info.group:<9} {info.name:<36} {info.community or '-':<4} "
+              f"{info.interval / 60:>5.0f}분  {info.host or '-'}{state}")
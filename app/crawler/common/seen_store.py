@@ -0,0 +1,162 @@
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+
+from common import metrics
+from common.crawl_log import get_logger
+
+# 수집 상태 저장 위치 / 보관 기간(일) / 이미 본 게시글만 있는 페이지가 몇 번 연속되면 페이지 탐색을 멈출지
+STATE_DB_PATH = os.environ.get("CRAWLER_STATE_DB", "/code/data/crawler_state.db")
+SEEN_TTL_DAYS = int(os.environ.get("CRAWLER_SEEN_TTL_DAYS", 7))
+SEEN_STOP_PAGES = int(os.environ.get("CRAWLER_SEEN_STOP_PAGES", 2))
+# 0이면 상태 기록만 하고 건너뛰기/조기 종료는 하지 않음 (전체 재수집용)
+INCREMENTAL = os.environ.get("CRAWLER_INCREMENTAL", "1") != "0"
+
+INVALID_POST_IDS = ("", "N/A", "None", "nan")
+# 상세 수집 실패로 남은 본문 (기록하지 않고 다음 실행에서 다시 수집)
+FAILED_CONTENT_PREFIXES = ("로드 오류", "로드 실패", "요청 타임아웃", "내용을 찾을 수 없", "유효하지 않은 URL")
+
+
+def is_failed_content(text):
+    """상세 수집에 실패한 본문인지 (빈 본문 또는 오류 메시지 본문)"""
+    return not text or str(text).startswith(FAILED_CONTENT_PREFIXES)
+
+
+def content_hash(text):
+    """본문 비교용 해시"""
+    return hashlib.sha1((text or "").encode("utf-8")).hexdigest()
+
+
+class SeenStore:
+    """이전 실행에서 수집한 게시글 상태 ((community, post_id) -> 조회수/추천수/본문 해시) 저장소
+
+    크롤러 프로세스가 끝나도 남도록 SQLite 파일에 기록하고, 여러 크롤러가 동시에 써도 되도록 WAL 모드를 사용한다.
+    """
+
+    def __init__(self, community, path=None):
+        self.community = str(community)
+        self.path = path or STATE_DB_PATH
+        self.lock = threading.Lock()
+        self.seen_pages = 0
+        self.log = get_logger("seen_store", community=self.community)
+
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS seen_posts (
+                community TEXT NOT NULL,
+                post_id TEXT NOT NULL,
+                views TEXT,
+                recommend TEXT,
+                content_hash TEXT,
+                updated_at REAL NOT NULL,
+                PRIMARY KEY (community, post_id)
+            )
+            """
+        )
+        # 오래된 기록 정리
+        self.conn.execute("DELETE FROM seen_posts WHERE updated_at < ?", (time.time() - SEEN_TTL_DAYS * 86400,))
+        self.conn.commit()
+
+    @staticmethod
+    def post_key(post):
+        """게시글 행의 저장 키 (Post ID가 없으면 링크 사용)"""
+        post_id = str(post.get("Post ID", "")).strip()
+        return post_id if post_id not in INVALID_POST_IDS else str(post.get("Link", ""))
+
+    def get(self, post_id):
+        """저장된 상태 반환 (없으면 None)"""
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT views, recommend, content_hash FROM seen_posts WHERE community = ? AND post_id = ?",
+                (self.community, str(post_id)),
+            ).fetchone()
+        if row is None:
+            return None
+        return {"views": row[0], "recommend": row[1], "content_hash": row[2]}
+
+    def is_unchanged(self, post_id, views, recommend=None):
+        """이전 실행과 조회수(및 추천수)가 같은 게시글인지 확인 (recommend가 None이면 조회수만 비교)"""
+        if not INCREMENTAL:
+            return False
+        state = self.get(post_id)
+        if state is None or state["views"] != str(views):
+            return False
+        if recommend is not None and state["recommend"] != str(recommend):
+            return False
+        return True
+
+    def mark_seen(self, post_id, views, recommend=None, content=None):
+        """수집 완료한 게시글 상태 기록"""
+        with self.lock:
+            self.conn.execute(
+                """
+                INSERT INTO seen_posts (community, post_id, views, recommend, content_hash, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?)
+                ON CONFLICT (community, post_id) DO UPDATE SET
+                    views = excluded.views,
+                    recommend = excluded.recommend,
+                    content_hash = COALESCE(excluded.content_hash, seen_posts.content_hash),
+                    updated_at = excluded.updated_at
+                """,
+                (
+                    self.community,
+                    str(post_id),
+                    str(views),
+                    None if recommend is None else str(recommend),
+                    None if content is None else content_hash(content),
+                    time.time(),
+                ),
+            )
+            self.conn.commit()
+
+    def filter_changed(self, posts, compare_recommend=True):
+        """목록에서 수집한 게시글 행 중 새 글이거나 조회수/추천수가 바뀐 행만 반환 (상세 페이지 요청 대상)"""
+        changed = []
+        for post in posts:
+            recommend = post.get("Recommend") if compare_recommend else None
+            if self.is_unchanged(self.post_key(post), post.get("Views"), recommend):
+                continue
+            changed.append(post)
+        crawler = metrics.current_crawler()
+        metrics.inc("crawler_posts_found_total", len(posts), crawler=crawler)
+        metrics.inc("crawler_posts_unchanged_total", len(posts) - len(changed), crawler=crawler)
+        if len(changed) < len(posts):
+            self.log.info(f"[증분 수집] 변화 없는 게시글 {len(posts) - len(changed)}개 상세 수집 건너뜀")
+        return changed
+
+    def mark_posts_seen(self, posts):
+        """수집 완료한 게시글 행들의 상태 기록 (본문 수집에 실패한 행 제외)"""
+        for post in posts:
+            if is_failed_content(post.get("Content")):
+                continue
+            self.mark_seen(self.post_key(post), post.get("Views"), post.get("Recommend"), post.get("Content"))
+
+    def reached_seen_territory(self, post_ids):
+        """이미 본 게시글만 있는 페이지가 SEEN_STOP_PAGES번 연속되면 True (더 이전 페이지는 수집 완료로 판단)"""
+        post_ids = list({str(post_id) for post_id in post_ids if str(post_id) not in INVALID_POST_IDS})
+        if not INCREMENTAL or not post_ids:
+            self.seen_pages = 0
+            return False
+        with self.lock:
+            placeholders = ",".join("?" * len(post_ids))
+            seen_count = self.conn.execute(
+                f"SELECT COUNT(*) FROM seen_posts WHERE community = ? AND post_id IN ({placeholders})",
+                (self.community, *post_ids),
+            ).fetchone()[0]
+        if seen_count < len(post_ids):
+            self.seen_pages = 0
+            return False
+        self.seen_pages += 1
+        self.log.info(f"[증분 수집] 이미 수집한 게시글만 있는 페이지 {self.seen_pages}/{SEEN_STOP_PAGES}")
+        return self.seen_pages >= SEEN_STOP_PAGES
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
@@ -0,0 +1,420 @@
+"""사이트별 실행 스케줄과 우선순위 큐
+
+레지스트리의 크롤러마다 실행 간격(interval), 우선순위(priority), 마감 시간(deadline)을 두고 따로 실행한다.
+실행할 때가 된 크롤러는 우선순위 큐에 들어가고, 디스패처 스레드(동시 실행 수만큼)가 우선순위 -> 마감 시각 순으로 꺼내 실행한다.
+같은 도메인의 크롤러는 동시에 실행하지 않으며, 앞 작업이 끝나고 도메인 간격(domain_gap_seconds)이 지난 뒤 실행한다.
+다음 실행 시각은 타이머 힙으로 관리하므로 스케줄러는 가장 빠른 실행 시각까지 잔다
+(다만 레지스트리 변경을 반영하도록 REGISTRY_POLL_SECONDS보다 오래 자지는 않음).
+"""
+import heapq
+import itertools
+import logging
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime
+
+from common import checkpoint, metrics, registry
+from common.cycle_budget import CycleBudget
+from common.record_sink import new_run_id
+from common.seen_store import STATE_DB_PATH
+
+# 마지막 실행 시각 기록 위치 (기본은 수집 상태 DB와 같은 파일)
+SCHEDULE_STATE_PATH = os.environ.get("CRAWLER_SCHEDULE_STATE_DB", STATE_DB_PATH)
+# 스케줄러 루프에서 예외가 나면 이 시간(초) 후 다시 시도
+ERROR_RETRY_SECONDS = float(os.environ.get("CRAWLER_SCHEDULER_RETRY_SECONDS", 5))
+# 다음 실행 시각이 멀거나 없어도 이 시간(초)마다 깨어나 레지스트리를 다시 읽음 (새로 추가/활성화된 크롤러 등록)
+REGISTRY_POLL_SECONDS = float(os.environ.get("CRAWLER_REGISTRY_POLL_SECONDS", 300))
+# 최근 실행 시간/수집 건수 평균에서 마지막 실행의 비중 (지수 이동 평균)
+STATS_ALPHA = 0.3
+
+
+class SiteJob:
+    """큐에 들어간 크롤러 실행 한 번 (due: 실행 예정 시각, deadline: 끝나야 하는 시각)"""
+
+    def __init__(self, info, due, run_id):
+        self.info = info
+        self.due = due
+        self.deadline = due + info.deadline
+        self.run_id = run_id
+        self.queued_at = time.time()
+        self.budget = None  # 같은 주기 작업들의 CycleBudget
+        self.result = None  # success / failed / shed / expired
+        self.elapsed = None
+        self.records = None
+
+    def remaining(self, now=None):
+        """마감까지 남은 시간(초)"""
+        return self.deadline - (now or time.time())
+
+    def __repr__(self):
+        return f"SiteJob({self.info.name}, priority={self.info.priority}, due={time.strftime('%H:%M:%S', time.localtime(self.due))})"
+
+
+class SiteQueue:
+    """우선순위 큐 (우선순위 -> 마감 시각 순), 같은 도메인 작업은 한 번에 하나씩 도메인 간격을 두고 꺼냄"""
+
+    def __init__(self, domain_gap_seconds=0):
+        self.domain_gap_seconds = domain_gap_seconds
+        self._heap = []
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+        self._busy = set()  # 실행 중인 도메인
+        self._last_finished = {}  # 도메인 -> 마지막 작업 종료 시각
+        self._closed = False
+
+    def put(self, job):
+        with self._cond:
+            heapq.heappush(self._heap, (job.info.priority, job.deadline, next(self._seq), job))
+            metrics.registry.set("crawler_queue_length", len(self._heap))
+            self._cond.notify_all()
+
+    def _pop_ready(self, now):
+        """지금 실행할 수 있는 가장 높은 우선순위 작업과 (없으면) 다음으로 가능해지는 시각까지의 대기 시간"""
+        held = []
+        job = None
+        wait = None
+        while self._heap:
+            entry = heapq.heappop(self._heap)
+            domain = entry[3].info.domain
+            if domain in self._busy:
+                held.append(entry)
+                continue
+            gap_left = self._last_finished.get(domain, 0) + self.domain_gap_seconds - now
+            if gap_left > 0:
+                wait = gap_left if wait is None else min(wait, gap_left)
+                held.append(entry)
+                continue
+            job = entry[3]
+            break
+        for entry in held:
+            heapq.heappush(self._heap, entry)
+        return job, wait
+
+    def take(self):
+        """실행할 작업 하나를 꺼냄 (준비된 작업이 없으면 대기, 큐를 닫으면 None)"""
+        with self._cond:
+            while not self._closed:
+                job, wait = self._pop_ready(time.time())
+                if job is not None:
+                    self._busy.add(job.info.domain)
+                    metrics.registry.set("crawler_queue_length", len(self._heap))
+                    return job
+                self._cond.wait(wait)
+            return None
+
+    def done(self, job):
+        """작업 종료 (도메인을 다시 사용할 수 있게 함)"""
+        with self._cond:
+            self._busy.discard(job.info.domain)
+            self._last_finished[job.info.domain] = time.time()
+            self._cond.notify_all()
+
+    def join(self):
+        """큐가 비고 실행 중인 작업이 없을 때까지 대기"""
+        with self._cond:
+            while (self._heap or self._busy) and not self._closed:
+                self._cond.wait()
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+    def discard(self, path):
+        """아직 꺼내지 않은 크롤러 작업 제거 후 제거한 작업 목록 반환"""
+        with self._cond:
+            kept = [entry for entry in self._heap if entry[3].info.path != path]
+            removed = [entry[3] for entry in self._heap if entry[3].info.path == path]
+            if removed:
+                self._heap = kept
+                heapq.heapify(self._heap)
+                metrics.registry.set("crawler_queue_length", len(self._heap))
+                self._cond.notify_all()
+            return removed
+
+    def pending(self):
+        with self._cond:
+            return [entry[3] for entry in sorted(self._heap)]
+
+
+class ScheduleState:
+    """크롤러별 마지막 실행 시각 (재시작 후 다음 실행 시각을 이어서 계산하는 데 사용)
+
+    스케줄러 프로세스가 다시 시작되어도 남도록 수집 상태와 같은 SQLite 파일에 기록한다.
+    """
+
+    def __init__(self, path=None):
+        self.path = path or SCHEDULE_STATE_PATH
+        self.lock = threading.Lock()
+
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS schedule_runs (
+                crawler TEXT PRIMARY KEY,
+                last_started REAL,
+                last_finished REAL,
+                last_result TEXT,
+                avg_seconds REAL,
+                avg_records REAL
+            )
+            """
+        )
+        # 평균 컬럼이 없던 기존 파일에 추가
+        columns = {row[1] for row in self.conn.execute("PRAGMA table_info(schedule_runs)")}
+        for column in ("avg_seconds", "avg_records"):
+            if column not in columns:
+                self.conn.execute(f"ALTER TABLE schedule_runs ADD COLUMN {column} REAL")
+        self.conn.commit()
+
+    def last_runs(self):
+        """크롤러 이름 -> (마지막 실행 시작 시각, 마지막 실행 종료 시각)"""
+        with self.lock:
+            rows = self.conn.execute("SELECT crawler, last_started, last_finished FROM schedule_runs").fetchall()
+        return {crawler: (started, finished) for crawler, started, finished in rows if started}
+
+    def started(self, crawler, when):
+        with self.lock:
+            self.conn.execute(
+                "INSERT INTO schedule_runs (crawler, last_started) VALUES (?, ?) "
+                "ON CONFLICT(crawler) DO UPDATE SET last_started = excluded.last_started",
+                (crawler, when),
+            )
+            self.conn.commit()
+
+    def stats(self):
+        """크롤러 이름 -> {"avg_seconds", "avg_records"} (최근 실행의 지수 이동 평균, 주기 예산 배분에 사용)"""
+        with self.lock:
+            rows = self.conn.execute("SELECT crawler, avg_seconds, avg_records FROM schedule_runs").fetchall()
+        return {crawler: {"avg_seconds": seconds, "avg_records": records} for crawler, seconds, records in rows}
+
+    def finished(self, crawler, when, result, seconds=None, records=None):
+        """실행 종료 기록 (seconds / records가 있으면 평균에 반영)"""
+        with self.lock:
+            self.conn.execute(
+                "UPDATE schedule_runs SET last_finished = ?, last_result = ?, "
+                "avg_seconds = CASE WHEN ? IS NULL THEN avg_seconds WHEN avg_seconds IS NULL THEN ? "
+                "ELSE avg_seconds * (1 - ?) + ? * ? END, "
+                "avg_records = CASE WHEN ? IS NULL THEN avg_records WHEN avg_records IS NULL THEN ? "
+                "ELSE avg_records * (1 - ?) + ? * ? END "
+                "WHERE crawler = ?",
+                (when, result,
+                 seconds, seconds, STATS_ALPHA, seconds, STATS_ALPHA,
+                 records, records, STATS_ALPHA, records, STATS_ALPHA,
+                 crawler),
+            )
+            self.conn.commit()
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
+
+
+class SiteScheduler:
+    """사이트별 다음 실행 시각 관리 (타이머 힙) + 디스패처 스레드
+
+    run_job(job)은 크롤러 실행과 DB 적재를 맡는다 (crawler_schedule.run_site_job).
+    run_forever()는 가장 빠른 다음 실행 시각까지 정확히 잠들었다가 실행할 때가 된 크롤러를 큐에 넣는다.
+    - 같은 사이트는 동시에 두 번 실행하지 않음 (실행 중에 다음 차례가 오면 그 차례는 건너뜀)
+    - 밀린 실행(스케줄러 중단, 긴 실행)은 한 번으로 합침
+    - state(ScheduleState)가 있으면 실행 기록을 남기고, resume이면 재시작 후 마지막 실행 시각부터 간격을 이어서 계산
+      (중단된 실행이나 남은 체크포인트가 있는 크롤러는 체크포인트가 만료되기 전에 바로 실행)
+    - cancel(name) / reschedule(name, when)으로 실행 취소 / 실행 시각 변경
+    - 함께 큐에 넣은 작업들은 하나의 주기 예산(CycleBudget)을 나눠 씀
+    """
+
+    def __init__(self, run_job, max_workers=4, domain_gap_seconds=0, state=None, resume=True,
+                 registry_poll_seconds=None):
+        self.run_job = run_job
+        self.max_workers = max_workers
+        self.state = state
+        self.resume = resume
+        self.registry_poll_seconds = REGISTRY_POLL_SECONDS if registry_poll_seconds is None else registry_poll_seconds
+        self.queue = SiteQueue(domain_gap_seconds)
+        self.sites = {}  # 크롤러 경로 -> CrawlerInfo
+        self.next_due = {}  # 크롤러 경로 -> 다음 실행 시각
+        self.cancelled = set()  # cancel()로 실행을 멈춘 크롤러 경로
+        self.active = set()  # 큐에 있거나 실행 중인 크롤러 경로
+        self._timers = []  # (실행 시각, 순번, 경로) 힙, next_due와 다른 항목은 취소/변경된 것
+        self._seq = itertools.count()
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stopping = threading.Event()
+        self._threads = []
+
+    def _set_due(self, path, due):
+        self.next_due[path] = due
+        heapq.heappush(self._timers, (due, next(self._seq), path))
+
+    def _sync_registry(self, now):
+        """레지스트리를 다시 읽어 새 크롤러는 등록하고 사라진/비활성 크롤러는 제거"""
+        crawlers = {info.path: info for info in registry.enabled_crawlers()}
+        for path in list(self.next_due):
+            if path not in crawlers:
+                del self.next_due[path]
+        last_runs = None
+        resumable = None
+        for path, info in crawlers.items():
+            self.sites[path] = info
+            if path in self.next_due or path in self.cancelled or path in self.active:
+                continue
+            if last_runs is None:
+                last_runs = self.state.last_runs() if self.state and self.resume else {}
+                resumable = checkpoint.resumable_crawlers() if self.resume else set()
+            # 처음 보는 크롤러는 지금, 이전 실행 기록이 있으면 마지막 실행 + 간격에
+            # 이전 실행이 끝나지 않았거나(스케줄러 중단) 체크포인트가 남아 있으면 만료되기 전에 이어서 수집하도록 지금
+            started, finished = last_runs.get(info.name, (None, None))
+            interrupted = started and (finished is None or finished < started)
+            if interrupted or info.name in resumable:
+                logging.info(f"{info.name}: 중단된 이전 실행이 있어 바로 실행합니다.")
+                self._set_due(path, now)
+            else:
+                self._set_due(path, started + info.interval if started else now)
+
+    def _pop_due(self, now):
+        """실행 시각이 지난 타이머 (경로, 예정 시각) 목록"""
+        due = []
+        while self._timers and self._timers[0][0] <= now:
+            when, _, path = heapq.heappop(self._timers)
+            if self.next_due.get(path) == when:
+                due.append((path, when))
+        return due
+
+    def enqueue_due(self, now=None):
+        """실행할 때가 된 크롤러를 큐에 넣고 넣은 작업 목록 반환"""
+        now = now or time.time()
+        run_id = new_run_id()
+        jobs = []
+        with self._lock:
+            self._sync_registry(now)
+            for path, due in self._pop_due(now):
+                info = self.sites[path]
+                missed = int((now - due) // info.interval)
+                self._set_due(path, due + (missed + 1) * info.interval)
+                if path in self.active:
+                    logging.info(f"{info.name}: 이전 실행이 아직 끝나지 않아 이번 차례는 건너뜁니다.")
+                    continue
+                if missed:
+                    logging.info(f"{info.name}: 밀린 실행 {missed}회를 한 번으로 합칩니다.")
+                self.active.add(path)
+                jobs.append(SiteJob(info, now if missed else due, run_id))
+        if jobs:
+            budget = CycleBudget(jobs, now, self.max_workers, stats=self.state.stats() if self.state else None)
+            for job in jobs:
+                job.budget = budget
+        for job in jobs:
+            self.queue.put(job)
+        if jobs:
+            logging.info(f"실행 대기열 추가 ({run_id}): {', '.join(job.info.name for job in jobs)}")
+        return jobs
+
+    def next_due_time(self):
+        """가장 빠른 다음 실행 시각 (없으면 None)"""
+        with self._lock:
+            while self._timers and self.next_due.get(self._timers[0][2]) != self._timers[0][0]:
+                heapq.heappop(self._timers)
+            return self._timers[0][0] if self._timers else None
+
+    def _find_path(self, name_or_path):
+        with self._lock:
+            for path, info in self.sites.items():
+                if name_or_path in (info.name, path):
+                    return path
+        info = registry.find_crawler(name_or_path)
+        return info.path if info else None
+
+    def cancel(self, name_or_path):
+        """크롤러의 예정된 실행을 취소 (reschedule 전까지 실행하지 않음, 이미 실행 중인 작업은 끝까지 실행)"""
+        path = self._find_path(name_or_path)
+        if path is None:
+            return False
+        with self._lock:
+            self.cancelled.add(path)
+            self.next_due.pop(path, None)
+            removed = self.queue.discard(path)
+            if removed:
+                self.active.discard(path)
+        for job in removed:
+            if job.budget:
+                job.budget.skip(job, "실행 취소", status="cancelled")
+        logging.info(f"실행 취소: {os.path.basename(path)}")
+        self._wake.set()
+        return True
+
+    def reschedule(self, name_or_path, when=None):
+        """크롤러의 다음 실행 시각 변경 (when이 없으면 지금, 취소한 크롤러도 다시 실행)"""
+        path = self._find_path(name_or_path)
+        if path is None:
+            return False
+        when = when or time.time()
+        with self._lock:
+            self.cancelled.discard(path)
+            self._set_due(path, when)
+        logging.info(f"실행 시각 변경: {os.path.basename(path)} -> {datetime.fromtimestamp(when).strftime('%Y-%m-%d %H:%M:%S')}")
+        self._wake.set()
+        return True
+
+    def _dispatch(self):
+        while True:
+            job = self.queue.take()
+            if job is None:
+                return
+            if self.state:
+                self.state.started(job.info.name, time.time())
+            try:
+                success = self.run_job(job)
+                job.result = job.result or ("success" if success else "failed")
+            except Exception as e:
+                job.result = "failed"
+                logging.error(f"크롤러 작업 중 예외 발생: {job.info.name}, 오류: {str(e)}", exc_info=True)
+            finally:
+                with self._lock:
+                    self.active.discard(job.info.path)
+                self.queue.done(job)
+                if self.state:
+                    self.state.finished(job.info.name, time.time(), job.result, seconds=job.elapsed, records=job.records)
+                if job.budget:
+                    job.budget.finish(job, job.result == "success", job.elapsed, job.records)
+
+    def start(self):
+        for index in range(self.max_workers):
+            thread = threading.Thread(target=self._dispatch, name=f"crawler-{index}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def run_forever(self):
+        """다음 실행 시각까지 잠들었다가 실행할 때가 된 크롤러를 큐에 넣음 (stop() 호출 전까지)
+
+        잠드는 시간은 registry_poll_seconds를 넘지 않으므로 그 사이 추가/활성화된 크롤러도 등록된다.
+        """
+        if not self._threads:
+            self.start()
+        logged_due = None
+        while not self._stopping.is_set():
+            self._wake.clear()
+            try:
+                self.enqueue_due()
+            except Exception as e:
+                logging.error(f"스케줄러 실행 중 오류 발생: {str(e)}", exc_info=True)
+                self._wake.wait(ERROR_RETRY_SECONDS)
+                continue
+            next_due = self.next_due_time()
+            if next_due is not None and next_due != logged_due:
+                logged_due = next_due
+                logging.info(f"다음 실행: {datetime.fromtimestamp(next_due).strftime('%Y-%m-%d %H:%M:%S')}")
+            wait = self.registry_poll_seconds if next_due is None else min(max(0.0, next_due - time.time()), self.registry_poll_seconds)
+            self._wake.wait(wait)
+
+    def stop(self):
+        self._stopping.set()
+        self._wake.set()
+        self.queue.close()
+        for thread in self._threads:
+            thread.join()
+        self._threads = []
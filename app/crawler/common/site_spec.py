@@ -0,0 +1,173 @@
+"""게시판 수집 설정 (SiteSpec)
+
+게시판 하나를 목록 URL, 행/필드 선택자, 날짜 형식, 인코딩, 본문 선택자, 커뮤니티 코드, 수집 조건으로 기술한다.
+실행은 common.crawl_engine.crawl(spec)이 맡으므로 같은 구조의 게시판을 추가할 때는 설정만 작성하면 된다.
+
+    SPEC = SiteSpec(
+        __file__, community="1p",
+        list_url="https://gall.dcinside.com/board/lists/?id=stock_new2",
+        row_selector="tbody.listwrap2 tr.ub-content",
+        fields={"Post ID": Field("td.gall_num"), "Title": Field("td.gall_tit a"), "Link": Field("td.gall_tit a", attr="href"),
+                "Date": Field("td.gall_date", attr="title"), "Views": Field("td.gall_count", convert="int")},
+        date_formats=("%Y-%m-%d %H:%M:%S", "%H:%M"),
+        content_selectors=("div.write_div",),
+        min_views=150,
+    )
+
+선택자는 CSS 선택자이며 생성할 때 한 번 컴파일해 둔다 (soupsieve).
+"""
+import copy
+import os
+import re
+from urllib.parse import urljoin
+
+import soupsieve
+
+from common.crawl_log import get_logger
+
+# 수집 결과 행의 필드 (설정에 없는 필드는 "N/A")
+OUTPUT_FIELDS = ("Post ID", "Community", "Category", "Title", "Link", "Writer", "Date", "Views", "Recommend")
+NUMBER = re.compile(r"-?\d+")
+
+
+def to_int(text):
+    """'1,234' -> 1234 (숫자가 아니면 0)"""
+    text = (text or "").replace(",", "").strip()
+    return int(text) if text.isdigit() else 0
+
+
+def first_int(text):
+    """'3 - 0' 같은 값에서 첫 번째 숫자 (없으면 0)"""
+    match = NUMBER.search(text or "")
+    return int(match.group()) if match else 0
+
+
+CONVERTERS = {
+    "text": lambda text: text,
+    "int": to_int,
+    "first_int": first_int,
+}
+
+
+class Field:
+    """목록 행에서 값 하나를 뽑는 규칙
+
+    selector: 행 안의 CSS 선택자 (None이면 행 자체), attr: 읽을 속성 (없으면 텍스트로 대체),
+    convert: CONVERTERS 이름 또는 함수, default: 요소가 없을 때 값 (None이면 행을 건너뜀)
+    strip_text: 텍스트 조각마다 앞뒤 공백/줄바꿈을 지우고 이어 붙임 (get_text(strip=True), 기본은 전체 텍스트의 앞뒤만 제거)
+    """
+
+    def __init__(self, selector=None, attr=None, convert="text", default="N/A", strip_text=False):
+        self.selector = selector
+        self.compiled = soupsieve.compile(selector) if selector else None
+        self.attr = attr
+        self.convert = CONVERTERS[convert] if isinstance(convert, str) else convert
+        self.default = default
+        self.strip_text = strip_text
+
+    def extract(self, row):
+        element = self.compiled.select_one(row) if self.compiled else row
+        if element is None:
+            return self.default
+        value = element.get(self.attr) if self.attr else None
+        if value is None:
+            value = element.get_text(strip=True) if self.strip_text else element.get_text().strip()
+        return self.convert(value.strip() if isinstance(value, str) else value)
+
+
+class SiteSpec:
+    """게시판 하나의 수집 설정
+
+    script: 크롤러 스크립트 경로 (__file__, 기록 파일/로거 이름에 사용)
+    list_url / page_url: 첫 페이지 URL / 다음 페이지 URL 형식 ({url}, {page}) 또는 (url, page) -> 페이지 URL 함수 (첫 페이지 포함)
+    max_pages: 최대 페이지 수 (None이면 다른 종료 조건에 걸릴 때까지), time_limit: 이 시간(초)이 지나면 다음 페이지로 넘어가지 않음
+    headers: 기본 요청 헤더에 더할 헤더
+    row_selector: 게시글 행, fields: 출력 필드 -> Field, skip: 필드 -> 건너뛸 값, exclude: 이 선택자에 맞는 요소가 있는 행은 제외
+    constants: 목록에 없는 필드 -> 고정 값 (예: 게시판 카테고리)
+    date_formats: Date 필드 strptime 형식 (날짜가 없는 형식은 오늘, 연도가 없는 형식은 올해로 간주)
+    today_only / stop_after_empty_pages: 오늘 글만 수집, 오늘 글 없는 페이지가 이만큼 이어지면 탐색 종료
+    empty_without_posts: 오늘 글이 있어도 조건(조회수)을 통과한 새 글이 없는 페이지를 빈 페이지로 셈
+    detail_fields: 상세 페이지에서 읽을 필드 -> Field (읽으면 목록 값을 대체, 예: 목록에 없는 추천수/작성 시각)
+    stop_after_old_posts: Date를 상세 페이지에서 읽는 게시판에서 오늘 글이 아닌 게시글이 이만큼 이어지면 탐색 종료
+    content_selectors: 상세 본문 영역 (앞에서부터 처음 찾은 선택자 사용), content_all: 맞는 요소 전부 사용
+    text_selector: 본문 영역 안에서 텍스트를 모을 요소 (없으면 영역 전체 텍스트), text_separator: 그 요소 안 텍스트 조각 사이 구분자
+    text_filter: 본문 텍스트에 적용할 함수, image_exclude: 이 선택자에 맞는 이미지는 제외
+    drop_failed: 본문 수집에 실패한 게시글은 결과에서 제외
+    strip_category: 제목에 붙은 "[카테고리]" 말머리 제거 (Category 필드 값 기준)
+    """
+
+    def __init__(self, script, community, list_url, row_selector, fields, content_selectors,
+                 page_url="{url}&page={page}", max_pages=1, base_url=None, encoding=None, referer=None,
+                 skip=None, exclude=(), date_formats=("%Y-%m-%d %H:%M:%S",), today_only=False, stop_after_empty_pages=1,
+                 min_views=0, content_all=False, text_selector=None, empty_text="", invalid_url_markers=("javascript:",),
+                 drop_failed=False, strip_category=False, constants=None, detail_fields=None, stop_after_old_posts=None,
+                 text_separator="", text_filter=None, image_exclude=None, time_limit=None, headers=None,
+                 empty_without_posts=False):
+        self.script = script
+        self.name = os.path.splitext(os.path.basename(script))[0]
+        self.community = community
+        self.list_url = list_url
+        self.page_url_format = page_url
+        self.max_pages = max_pages
+        self.time_limit = time_limit
+        self.headers = headers or {}
+        self.base_url = base_url or list_url
+        self.encoding = encoding
+        self.referer = referer
+        self.row_selector = row_selector
+        self.fields = fields
+        self.constants = constants or {}
+        self.skip = {name: set(values) for name, values in (skip or {}).items()}
+        self.exclude = exclude
+        self.date_formats = date_formats
+        self.today_only = today_only
+        self.stop_after_empty_pages = stop_after_empty_pages
+        self.empty_without_posts = empty_without_posts
+        self.detail_fields = detail_fields or {}
+        self.stop_after_old_posts = stop_after_old_posts
+        self.min_views = min_views
+        self.content_selectors = content_selectors
+        self.content_all = content_all
+        self.text_selector = text_selector
+        self.text_separator = text_separator
+        self.text_filter = text_filter
+        self.image_exclude = image_exclude
+        self.empty_text = empty_text
+        self.invalid_url_markers = invalid_url_markers
+        self.drop_failed = drop_failed
+        self.strip_category = strip_category
+        self.log = get_logger(self.name, community=community)
+        self._compile()
+
+    def _compile(self):
+        self.rows = soupsieve.compile(self.row_selector)
+        self.excluded = soupsieve.compile(", ".join(self.exclude)) if self.exclude else None
+        self.contents = [soupsieve.compile(selector) for selector in self.content_selectors]
+        self.texts = soupsieve.compile(self.text_selector) if self.text_selector else None
+        self.excluded_images = soupsieve.compile(self.image_exclude) if self.image_exclude else None
+
+    def replace(self, **changes):
+        """일부 설정만 바꾼 사본 (예: spec.replace(min_views=7000, max_pages=3))"""
+        spec = copy.copy(self)
+        for name, value in changes.items():
+            if not hasattr(spec, name):
+                raise AttributeError(f"알 수 없는 설정: {name}")
+            setattr(spec, name, value)
+        spec._compile()
+        return spec
+
+    def page_url(self, page):
+        """page번째 목록 페이지 URL (형식 문자열이면 첫 페이지는 list_url 그대로)"""
+        if callable(self.page_url_format):
+            return self.page_url_format(self.list_url, page)
+        if page <= 1:
+            return self.list_url
+        return self.page_url_format.format(url=self.list_url, page=page)
+
+    def absolute_url(self, url):
+        return urljoin(self.base_url, url)
+
+    def is_valid_post_url(self, url):
+        if not url or any(marker in url for marker in self.invalid_url_markers):
+            return False
+        return url.startswith("http")
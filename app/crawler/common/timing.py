@@ -0,0 +1,151 @@
+import atexit
+import contextlib
+import functools
+import json
+import math
+import os
+import sys
+import threading
+import time
+from datetime import datetime
+
+# 실행별 단계 시간 보고서 위치 (<TIMING_DIR>/<실행 ID>/<크롤러 이름>.json)
+TIMING_DIR = os.environ.get("CRAWLER_TIMING_DIR", "/code/data/timing")
+# 서브프로세스로 실행된 크롤러가 종료 시 보고서를 남길 파일 (스케줄러가 지정)
+TIMING_REPORT_ENV = "CRAWLER_TIMING_REPORT_FILE"
+PERCENTILES = (50, 90, 99)
+
+# 단계 이름
+#   list_fetch / detail_fetch: 목록 / 상세 페이지 네트워크 요청 (fetch 내부 session.get)
+#   list_parse / detail_parse: BeautifulSoup 파싱 (parse_html)
+#   rate_limit_wait / retry_wait: 토큰 버킷 대기 / 재시도 백오프 대기
+#   detail_total: 상세 페이지 하나를 가져와 본문/이미지를 뽑기까지 (get_post_content 전체)
+#   text_filter: 본문 정리 (clean_text 등), sink_write: RecordSink 기록, db_load: 스케줄러의 DB 적재
+_samples = {}
+_samples_lock = threading.Lock()
+_local = threading.local()
+_run_start = time.perf_counter()
+
+
+def record(name, seconds):
+    """단계 소요 시간 한 건 기록"""
+    with _samples_lock:
+        _samples.setdefault(name, []).append(seconds)
+
+
+@contextlib.contextmanager
+def phase(name):
+    """with 블록 실행 시간을 name 단계로 기록"""
+    start_time = time.perf_counter()
+    try:
+        yield
+    finally:
+        record(name, time.perf_counter() - start_time)
+
+
+def timed(name):
+    """함수 실행 시간을 name 단계로 기록하는 데코레이터"""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with phase(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+@contextlib.contextmanager
+def stage(name):
+    """현재 스레드의 수집 단계 지정 (fetch/parse_html이 list_*와 detail_*를 구분하는 데 사용)"""
+    previous = getattr(_local, "stage", None)
+    _local.stage = name
+    try:
+        yield
+    finally:
+        _local.stage = previous
+
+
+def current_stage():
+    """현재 스레드의 수집 단계 (지정하지 않았으면 목록 수집)"""
+    return getattr(_local, "stage", None) or "list"
+
+
+def _percentile(sorted_values, percent):
+    if not sorted_values:
+        return 0.0
+    # nearest-rank 방식
+    index = max(0, math.ceil(percent / 100 * len(sorted_values)) - 1)
+    return sorted_values[index]
+
+
+def summarize(samples):
+    """단계별 횟수 / 합계 / 평균 / 백분위 / 최대 (초)"""
+    summary = {}
+    for name, values in sorted(samples.items()):
+        values = sorted(values)
+        total = sum(values)
+        entry = {"count": len(values), "total": round(total, 6), "mean": round(total / len(values), 6)}
+        for percent in PERCENTILES:
+            entry[f"p{percent}"] = round(_percentile(values, percent), 6)
+        entry["max"] = round(values[-1], 6)
+        summary[name] = entry
+    return summary
+
+
+def reset():
+    """기록 초기화 (워커가 실행마다 호출)"""
+    global _run_start
+    with _samples_lock:
+        _samples.clear()
+    _run_start = time.perf_counter()
+
+
+def build_report(crawler, run_id=None):
+    with _samples_lock:
+        samples = {name: list(values) for name, values in _samples.items()}
+    return {
+        "crawler": crawler,
+        "run_id": run_id,
+        "finished_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        "wall_seconds": round(time.perf_counter() - _run_start, 4),
+        "phases": summarize(samples),
+    }
+
+
+def report_path(script_path, run_id):
+    """크롤러 스크립트의 실행별 보고서 경로"""
+    name = os.path.splitext(os.path.basename(script_path))[0]
+    return os.path.join(TIMING_DIR, run_id, f"{name}.json")
+
+
+def write_report(script_path, run_id=None, path=None):
+    """이번 실행의 단계별 시간 보고서를 JSON 파일로 저장하고 경로 반환"""
+    crawler = os.path.splitext(os.path.basename(script_path))[0]
+    path = path or report_path(script_path, run_id or datetime.now().strftime("%Y%m%d_%H%M%S"))
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(build_report(crawler, run_id), f, ensure_ascii=False, indent=2)
+    return path
+
+
+def add_phase_to_report(path, name, seconds):
+    """저장된 보고서에 단계 기록 추가 (스케줄러가 DB 적재 시간을 붙일 때 사용)"""
+    if not os.path.exists(path):
+        return
+    with open(path, encoding="utf-8") as f:
+        report = json.load(f)
+    report["phases"][name] = summarize({name: [seconds]})[name]
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+
+
+def _write_report_at_exit():
+    from common.record_sink import RUN_ID_ENV
+    write_report(sys.argv[0] or "crawler", os.environ.get(RUN_ID_ENV), os.environ[TIMING_REPORT_ENV])
+
+
+# 스케줄러가 서브프로세스로 실행한 크롤러는 종료할 때 보고서를 남김
+if os.environ.get(TIMING_REPORT_ENV):
+    atexit.register(_write_report_at_exit)
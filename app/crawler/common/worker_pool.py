@@ -0,0 +1,194 @@
+import contextlib
+import importlib.util
+import logging
+import multiprocessing
+import os
+import queue
+import threading
+import traceback
+
+from common import metrics, timing
+from common.crawl_log import configure_worker_logging, flush_logging, reset_sampling
+from common.output_capture import CaptureWriter, OutputCapture
+from common.record_sink import RUN_ID_ENV
+
+# 워커 하나가 이 횟수만큼 크롤러를 실행하면 새 프로세스로 교체 (메모리 누수 누적 방지)
+MAX_TASKS_PER_WORKER = int(os.environ.get("CRAWLER_MAX_TASKS_PER_WORKER", 50))
+
+# 워커는 spawn으로 시작 (스케줄러 스레드/락 상태를 물려받지 않도록)
+_mp_context = multiprocessing.get_context("spawn")
+
+
+class CrawlerTimeout(Exception):
+    """크롤러가 제한 시간을 넘겨 워커를 종료함"""
+
+
+class CrawlerCrashed(Exception):
+    """크롤러 실행 중 워커 프로세스가 비정상 종료됨"""
+
+
+class CrawlerFailed(Exception):
+    """크롤러 함수가 예외를 던짐 (워커는 계속 사용)"""
+
+
+def _load_crawler_module(script_path, modules):
+    """크롤러 스크립트를 모듈로 로드 (파일명이 숫자로 시작할 수 있어 경로로 직접 로드, 워커 안에서 캐시)"""
+    module = modules.get(script_path)
+    if module is None:
+        module_name = "crawler_" + os.path.splitext(os.path.basename(script_path))[0]
+        spec = importlib.util.spec_from_file_location(module_name, script_path)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        modules[script_path] = module
+    return module
+
+
+def _records_from_result(result):
+    """크롤러 run() 반환값(DataFrame 또는 None)을 레코드 리스트로 변환"""
+    if result is None:
+        return []
+    if hasattr(result, "to_dict"):
+        return result.to_dict("records")
+    return list(result)
+
+
+def _worker_main(conn):
+    """워커 프로세스 본체: (크롤러 경로, 실행 ID)를 받아 run()을 실행하고 레코드를 돌려줌"""
+    configure_worker_logging()
+    modules = {}
+    while True:
+        try:
+            task = conn.recv()
+        except EOFError:
+            break
+        if task is None:
+            break
+        script_path, run_id = task
+        # 크롤러의 RecordSink가 스케줄러와 같은 기록 파일을 쓰도록 실행 ID 전달
+        if run_id:
+            os.environ[RUN_ID_ENV] = run_id
+        else:
+            os.environ.pop(RUN_ID_ENV, None)
+        metrics.set_current_crawler(script_path)
+        timing.reset()
+        reset_sampling()
+        # 크롤러 print 출력은 크롤러별 로그 파일로 (스케줄러 표준 출력에 섞이지 않도록)
+        capture = OutputCapture(script_path)
+        writer = CaptureWriter(capture)
+        try:
+            with contextlib.redirect_stdout(writer), contextlib.redirect_stderr(writer):
+                module = _load_crawler_module(script_path, modules)
+                try:
+                    records = _records_from_result(module.run())
+                finally:
+                    flush_logging()  # 큐에 남은 크롤러 로그를 이번 실행의 로그 파일로 내보냄
+                    timing.write_report(script_path, run_id)
+            # 이번 실행에서 모은 메트릭은 스케줄러 프로세스로 넘기고 비움
+            conn.send(("ok", records, metrics.registry.snapshot(reset=True)))
+        except BaseException:
+            writer.flush()
+            conn.send(("error", f"{traceback.format_exc()}\n마지막 출력 ({capture.path}):\n{capture.get_tail()}",
+                       metrics.registry.snapshot(reset=True)))
+        finally:
+            writer.flush()
+            capture.close()
+
+
+class _Worker:
+    def __init__(self):
+        self.conn, child_conn = _mp_context.Pipe()
+        self.process = _mp_context.Process(target=_worker_main, args=(child_conn,), daemon=True)
+        self.process.start()
+        child_conn.close()
+        self.tasks_done = 0
+
+    def stop(self, timeout=5):
+        try:
+            self.conn.send(None)
+        except (BrokenPipeError, OSError):
+            pass
+        self.process.join(timeout)
+        self.kill()
+
+    def kill(self):
+        if self.process.is_alive():
+            self.process.terminate()
+            self.process.join(5)
+            if self.process.is_alive():
+                self.process.kill()
+                self.process.join()
+        self.conn.close()
+
+
+class CrawlerWorkerPool:
+    """크롤러 함수를 실행하는 장수(long-lived) 워커 프로세스 풀
+
+    워커는 pandas/bs4/requests를 한 번만 import하고 여러 실행에 재사용된다.
+    크롤러마다 별도 프로세스에서 실행되므로 한 크롤러가 죽거나 제한 시간을 넘겨도 스케줄러와 다른 크롤러에는 영향이 없고,
+    해당 워커만 종료 후 새로 만든다.
+    """
+
+    def __init__(self, size):
+        self.size = size
+        self.slots = threading.Semaphore(size)
+        self.idle = queue.Queue()
+        self.closed = False
+
+    def _acquire_worker(self):
+        self.slots.acquire()
+        try:
+            return self.idle.get_nowait()
+        except queue.Empty:
+            pass
+        try:
+            return _Worker()
+        except Exception:
+            self.slots.release()
+            raise
+
+    def _release_worker(self, worker):
+        if self.closed or worker.tasks_done >= MAX_TASKS_PER_WORKER:
+            worker.stop()
+        else:
+            self.idle.put(worker)
+        self.slots.release()
+
+    def _discard_worker(self, worker):
+        worker.kill()
+        self.slots.release()
+
+    def run(self, script_path, timeout_seconds, run_id=None):
+        """크롤러 스크립트의 run()을 워커에서 실행하고 레코드 리스트 반환
+
+        제한 시간 초과 시 CrawlerTimeout, 워커 비정상 종료 시 CrawlerCrashed, 크롤러 예외 시 CrawlerFailed.
+        """
+        worker = self._acquire_worker()
+        try:
+            worker.conn.send((script_path, run_id))
+            if not worker.conn.poll(timeout_seconds):
+                self._discard_worker(worker)
+                raise CrawlerTimeout(f"{timeout_seconds}초 이상 실행되어 중단")
+            status, payload, worker_metrics = worker.conn.recv()
+        except (EOFError, OSError):
+            worker.process.join(1)
+            exitcode = worker.process.exitcode
+            self._discard_worker(worker)
+            raise CrawlerCrashed(f"워커 프로세스 비정상 종료 (종료 코드: {exitcode})")
+
+        worker.tasks_done += 1
+        self._release_worker(worker)
+        metrics.registry.merge(worker_metrics)
+        if status != "ok":
+            raise CrawlerFailed(payload)
+        return payload
+
+    def close(self):
+        """모든 워커 종료"""
+        self.closed = True
+        while True:
+            try:
+                worker = self.idle.get_nowait()
+            except queue.Empty:
+                break
+            worker.stop()
+        logging.info("크롤러 워커 풀 종료")
@@ -1,357 +1,590 @@
 import subprocess
+import contextlib
 import logging
 import os
 import time
-from datetime import datetime, timedelta
-import schedule
+from datetime import datetime
 import sys
+import tempfile
+import threading
+
+from common.worker_pool import CrawlerWorkerPool, CrawlerTimeout, CrawlerCrashed, CrawlerFailed
+from common.record_sink import RUN_ID_ENV, new_run_id, sink_path, read_records, remove_sink
+from common import metrics, registry, timing
+from common.site_scheduler import ScheduleState, SiteScheduler
+from common.output_capture import OutputCapture, stream_lines, crawler_log_path, read_log_tail
 
 # 로깅 설정
-log_dir = "logs"
-os.makedirs(log_dir, exist_ok=True)
-
-logging.basicConfig(
-    level=logging.DEBUG,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler(f"{log_dir}/crawler_{datetime.now().strftime('%Y%m%d')}.log"),
-        logging.StreamHandler()
-    ]
-)
-
-# 크롤러 목록 정의
-hotissue_crawlers = [
-    "/code/app/crawler/hotissue/dcinside_realtimebestboard.py",
-    "/code/app/crawler/hotissue/theqoo_hotboard.py",
-    "/code/app/crawler/hotissue/instiz_issue.py",
-    "/code/app/crawler/hotissue/clien_parkboard.py",
-    "/code/app/crawler/hotissue/ppomppu_freeboard.py",
-    "/code/app/crawler/hotissue/bobaedream_bestboard.py",
-    "/code/app/crawler/hotissue/82cook_freeboard.py",
-    "/code/app/crawler/hotissue/mlbpark_bullpen.py",
-    "/code/app/crawler/hotissue/inven_openissue.py",
-    "/code/app/crawler/hotissue/fmkorea_funnyboard.py"
-]
-    # "/code/app/crawler/hotissue/ruliweb_funnyboard.py",
-
-politics_crawlers = [
-    "/code/app/crawler/politics/dcinside_peoplepower.py",
-    "/code/app/crawler/politics/dcinside_politics.py",
-    "/code/app/crawler/politics/ppomppu_politics.py",
-    "/code/app/crawler/politics/ruliweb_politics.py",
-    "/code/app/crawler/politics/ruliweb_society_politics_economy.py",
-    "/code/app/crawler/politics/bobaedream_politics.py",
-    "/code/app/crawler/politics/mlbpark_politics.py",
-    "/code/app/crawler/politics/fmkorea_politics.py",
-]
-
-def run_crawler(script_path, timeout_seconds=1800):  # 기본 5분(300초) 타임아웃
-    """단일 크롤러 실행 및 결과 반환 (타임아웃 적용)"""
+def setup_logging(log_dir="logs"):
+    """스케줄러 로깅 설정 (스케줄러 프로세스에서 한 번만 호출, import만 할 때는 로그 파일을 만들지 않음)"""
+    os.makedirs(log_dir, exist_ok=True)
+
+    logging.basicConfig(
+        level=logging.DEBUG,
+        format='%(asctime)s - %(levelname)s - %(message)s',
+        handlers=[
+            logging.FileHandler(f"{log_dir}/crawler_{datetime.now().strftime('%Y%m%d')}.log"),
+            logging.StreamHandler()
+        ]
+    )
+
+# 크롤러 목록은 hotissue/, politics/ 스크립트의 CRAWLER_INFO로 자동 등록 (common.registry)
+# 스크립트는 등록할 때 import하지 않고 실행할 때 워커에서 처음 import됨
+
+def run_crawler(script_path, timeout_seconds=1800, run_id=None):  # 직접 호출 시 기본 30분(1800초) 타임아웃
+    """단일 크롤러 실행 및 결과 반환 (타임아웃 적용)
+
+    출력은 메모리에 모으지 않고 한 줄씩 크롤러별 로그 파일에 기록하며, 실패 시 마지막 줄들만 로그에 남긴다.
+    """
+    capture = None
+    start_time = time.time()
+    # 크롤러 프로세스가 종료하면서 남기는 메트릭 파일
+    metrics_file = os.path.join(tempfile.gettempdir(), f"crawler_metrics_{get_crawler_name(script_path)}_{threading.get_ident()}.json")
     try:
         logging.info(f"크롤러 실행 중: {script_path}")
-        # 크롤러 실행 및 출력 캡처 (타임아웃 설정)
-        result = subprocess.run(
-            ["python3", script_path], 
-            capture_output=True, 
-            text=True, 
-            check=False,
-            timeout=timeout_seconds  # 타임아웃 설정
+        env = dict(os.environ)
+        env['PYTHONUNBUFFERED'] = '1'  # 출력이 실시간으로 로그 파일에 남도록
+        env[metrics.METRICS_FILE_ENV] = metrics_file
+        if run_id:
+            env[RUN_ID_ENV] = run_id
+            env[timing.TIMING_REPORT_ENV] = timing.report_path(script_path, run_id)
+        capture = OutputCapture(script_path)
+        # 크롤러 실행 (표준 출력/오류를 한 파이프로 받아 줄 단위로 기록)
+        process = subprocess.Popen(
+            ["python3", script_path],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            text=True,
+            encoding='utf-8',
+            errors='replace',
+            env=env
         )
-        
+        reader = threading.Thread(target=stream_lines, args=(process.stdout, capture), daemon=True)
+        reader.start()
+        try:
+            returncode = process.wait(timeout=timeout_seconds)  # 타임아웃 설정
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.wait()
+            reader.join(5)
+            logging.error(f"크롤러 타임아웃: {script_path}, {timeout_seconds}초 이상 실행되어 중단")
+            logging.error(f"마지막 출력:\n{capture.get_tail()}")
+            record_crawler_run(script_path, "timeout", time.time() - start_time)
+            return False
+        reader.join(5)
+        metrics.read_metrics_file(metrics_file)
+        record_crawler_run(script_path, "success" if returncode == 0 else "failed", time.time() - start_time)
+
         # 종료 코드 확인
-        if result.returncode == 0:
-            logging.info(f"크롤러 성공: {script_path}")
+        if returncode == 0:
+            logging.info(f"크롤러 성공: {script_path} ({capture.summary()}, 로그: {capture.path})")
         else:
-            logging.error(f"크롤러 실패: {script_path}, 종료 코드: {result.returncode}")
-            logging.error(f"오류 메시지: {result.stderr}")
-        
-        # 표준 출력 로깅
-        if result.stdout:
-            logging.info(f"{script_path} 출력:\n{result.stdout}")
-            
-        return result.returncode == 0
-        
-    except subprocess.TimeoutExpired:
-        logging.error(f"크롤러 타임아웃: {script_path}, {timeout_seconds}초 이상 실행되어 중단")
+            logging.error(f"크롤러 실패: {script_path}, 종료 코드: {returncode}")
+            logging.error(f"마지막 출력 ({capture.path}):\n{capture.get_tail()}")
+
+        return returncode == 0
+
+    except Exception as e:
+        logging.error(f"크롤러 실행 중 예외 발생: {script_path}, 오류: {str(e)}")
         return False
+    finally:
+        if capture is not None:
+            capture.close()
+        if os.path.exists(metrics_file):
+            os.remove(metrics_file)
+
+def get_crawler_name(script_path):
+    """크롤러 스크립트 이름 (메트릭 레이블용, 예: dcinside_politics)"""
+    return os.path.splitext(os.path.basename(script_path))[0]
+
+def record_crawler_run(script_path, result, elapsed):
+    """크롤러 실행 결과/소요 시간 메트릭 기록"""
+    crawler = get_crawler_name(script_path)
+    metrics.inc("crawler_runs_total", crawler=crawler, result=result)
+    metrics.observe("crawler_run_seconds", elapsed, crawler=crawler)
+
+# 크롤러 실행 방식 (inprocess: 장수 워커 프로세스 풀에서 run() 호출, subprocess: 스크립트를 매번 새 프로세스로 실행)
+CRAWLER_RUN_MODE = os.environ.get('CRAWLER_RUN_MODE', 'inprocess')
+CRAWLER_TIMEOUT_SECONDS = int(os.environ.get('CRAWLER_TIMEOUT_SECONDS', 1800))
+
+_worker_pool = None
+_worker_pool_lock = threading.Lock()
+
+def get_worker_pool():
+    """스케줄러 수명 동안 유지되는 크롤러 워커 풀 반환"""
+    global _worker_pool
+    if _worker_pool is None:
+        with _worker_pool_lock:
+            if _worker_pool is None:
+                size = int(os.environ.get('CRAWLER_MAX_WORKERS', 4))
+                _worker_pool = CrawlerWorkerPool(size)
+                logging.info(f"크롤러 워커 풀 생성 (워커 수: {size})")
+    return _worker_pool
+
+def run_crawler_inprocess(script_path, timeout_seconds=None, run_id=None):
+    """워커 풀에서 크롤러 실행 후 (성공 여부, 레코드 리스트) 반환 (CSV를 거치지 않음)"""
+    timeout_seconds = timeout_seconds or CRAWLER_TIMEOUT_SECONDS
+    start_time = time.time()
+    result = "failed"
+    try:
+        logging.info(f"크롤러 실행 중: {script_path}")
+        records = get_worker_pool().run(script_path, timeout_seconds, run_id=run_id)
+        logging.info(f"크롤러 성공: {script_path} ({len(records)}건)")
+        result = "success"
+        return True, records
+    except CrawlerTimeout:
+        result = "timeout"
+        logging.error(f"크롤러 타임아웃: {script_path}, {timeout_seconds}초 이상 실행되어 중단")
+        logging.error(f"마지막 출력:\n{read_log_tail(crawler_log_path(script_path))}")
+    except CrawlerCrashed as e:
+        logging.error(f"크롤러 실패: {script_path}, {str(e)}")
+        logging.error(f"마지막 출력:\n{read_log_tail(crawler_log_path(script_path))}")
+    except CrawlerFailed as e:
+        logging.error(f"크롤러 실패: {script_path}")
+        logging.error(f"오류 메시지: {str(e)}")
     except Exception as e:
         logging.error(f"크롤러 실행 중 예외 발생: {script_path}, 오류: {str(e)}")
+    finally:
+        record_crawler_run(script_path, result, time.time() - start_time)
+    return False, None
+
+def execute_crawler(script_path, run_id=None, timeout_seconds=None):
+    """실행 방식에 따라 크롤러 실행 후 (성공 여부, 레코드 리스트 또는 None(CSV에서 읽어야 함)) 반환"""
+    timeout_seconds = timeout_seconds or CRAWLER_TIMEOUT_SECONDS
+    if CRAWLER_RUN_MODE == 'subprocess':
+        return run_crawler(script_path, timeout_seconds=timeout_seconds, run_id=run_id), None
+    return run_crawler_inprocess(script_path, timeout_seconds=timeout_seconds, run_id=run_id)
+
+def load_crawler_records(crawler, records, is_politics):
+    """크롤러 결과를 DB에 삽입 (메모리 레코드가 없으면 크롤러가 저장한 CSV 사용)"""
+    if records is None:
+        return load_crawler_csv(crawler, is_politics)
+    if not records:
+        return None
+    insert_to_db(records, is_politics=is_politics, crawler=get_crawler_name(crawler))
+    return f"(메모리 레코드 {len(records)}건)"
+
+def load_partial_records(crawler, run_id, is_politics):
+    """실패/타임아웃한 크롤러가 중단 전까지 기록한 게시글을 DB에 삽입"""
+    path = sink_path(crawler, run_id)
+    records = read_records(path)
+    if not records:
+        remove_sink(path)
+        return None
+    insert_to_db(records, is_politics=is_politics, crawler=get_crawler_name(crawler))
+    remove_sink(path)
+    return f"(중단 전 기록 {len(records)}건: {path})"
+
+@contextlib.contextmanager
+def timed_db_load(crawler, run_id):
+    """DB 적재 시간을 크롤러의 실행별 단계 시간 보고서에 db_load로 추가"""
+    start_time = time.perf_counter()
+    try:
+        yield
+    finally:
+        try:
+            timing.add_phase_to_report(timing.report_path(crawler, run_id), "db_load", time.perf_counter() - start_time)
+        except (OSError, ValueError) as e:
+            logging.warning(f"단계 시간 보고서 갱신 실패: {crawler}, 오류: {str(e)}")
+
+def load_crawler_csv(crawler, is_politics):
+    """크롤러가 저장한 오늘 날짜 CSV를 읽어 DB에 삽입"""
+    import pandas as pd
+    base_name = os.path.basename(crawler)
+    csv_name = base_name.replace('.py', f'_{datetime.now().strftime("%Y%m%d")}.csv')
+    base_data_folder = '/code/data'
+    today_folder = os.path.join(base_data_folder, datetime.now().strftime('%Y%m%d'))
+    csv_path = os.path.join(today_folder, csv_name)
+
+    if os.path.exists(csv_path):
+        df = pd.read_csv(csv_path, encoding='utf-8-sig')
+        data = df.to_dict('records')
+        insert_to_db(data, is_politics=is_politics, crawler=get_crawler_name(crawler))
+        return csv_path
+    return None
+
+def load_crawler_result(info, success, records, run_id):
+    """크롤러 하나의 결과를 바로 DB에 삽입 (실패한 크롤러는 중단 전까지 기록된 게시글만)"""
+    label = "정치" if info.is_politics else "핫이슈"
+    try:
+        with timed_db_load(info.path, run_id):
+            if success:
+                source = load_crawler_records(info.path, records, is_politics=info.is_politics)
+            else:
+                source = load_partial_records(info.path, run_id, is_politics=info.is_politics)
+        if source:
+            logging.info(f"{label} {'데이터' if success else '부분 데이터'} 삽입 완료: {info.path} {source}")
+    except Exception as e:
+        logging.error(f"{label} 데이터 삽입 중 오류 발생: {info.path}, 오류: {str(e)}")
+
+    # 성공한 크롤러의 중간 기록 파일은 더 이상 필요 없음
+    if success:
+        remove_sink(sink_path(info.path, run_id))
+
+def run_site_job(job):
+    """사이트 작업 하나 실행 후 다른 사이트를 기다리지 않고 바로 DB 적재
+
+    마감 시간이 지난 작업과 주기 예산(CycleBudget)이 부족해 밀려난 작업은 건너뛰고,
+    예산이 줄어든 작업은 배정된 시간을 타임아웃으로 실행 (중단 전까지 기록된 게시글은 적재됨)
+    """
+    info = job.info
+    now = time.time()
+    metrics.observe("crawler_queue_wait_seconds", now - job.queued_at, crawler=info.name)
+    remaining = job.remaining(now)
+    if remaining <= 0:
+        logging.warning(f"마감 시간이 지나 실행하지 않음: {info.name} (예정 시각 {datetime.fromtimestamp(job.due).strftime('%H:%M:%S')})")
+        metrics.inc("crawler_jobs_expired_total", crawler=info.name)
+        job.result = "expired"
+        if job.budget:
+            job.budget.skip(job, "작업 마감 시간 경과")
         return False
 
-def run_all_crawlers():
-    """모든 크롤러 순차적으로 실행"""
-    logging.info("=== 크롤링 작업 시작 ===")
-    
+    allowance = job.budget.admit(job, now) if job.budget else remaining
+    if allowance is None:
+        logging.warning(f"주기 예산이 부족해 이번 주기에서 건너뜀: {info.name}")
+        job.result = "shed"
+        return False
+
+    # 타임아웃 = min(CRAWLER_TIMEOUT_SECONDS, 마감 시각까지 남은 시간, 주기 예산에서 배정된 시간)
+    timeout_seconds = max(1, int(min(CRAWLER_TIMEOUT_SECONDS, remaining, allowance)))
+    start_time = time.time()
+    success, records = execute_crawler(info.path, run_id=job.run_id, timeout_seconds=timeout_seconds)
+    job.elapsed = time.time() - start_time
+    job.records = len(records) if records is not None else None
+    load_crawler_result(info, success, records, job.run_id)
+    return success
+
+def get_max_workers():
+    return int(os.environ.get('CRAWLER_MAX_WORKERS', 4))
+
+def get_domain_gap_seconds():
+    return float(os.environ.get('CRAWLER_DOMAIN_GAP_SECONDS', 30))
+
+def run_all_crawlers(max_workers=None, domain_gap_seconds=None):
+    """모든 크롤러를 한 번씩 실행 (우선순위 큐: 정치 크롤러 먼저, 같은 도메인은 순차 실행, 끝난 크롤러부터 DB 적재)"""
+    if max_workers is None:
+        max_workers = get_max_workers()
+    if domain_gap_seconds is None:
+        domain_gap_seconds = get_domain_gap_seconds()
+
+    cycle_start_time = time.time()
     results = {
-        "hotissue": {"success": 0, "failed": 0, "failed_list": [], "success_list": []},
-        "politics": {"success": 0, "failed": 0, "failed_list": [], "success_list": []}
+        group: {"success": 0, "failed": 0, "skipped": 0, "failed_list": [], "success_list": [], "skipped_list": []}
+        for group in registry.CRAWLER_GROUPS
     }
-    
-    # 핫이슈 크롤러 실행
-    logging.info("핫이슈 크롤러 실행 시작")
-    for crawler in hotissue_crawlers:
-        success = run_crawler(crawler)
-        if success:
-            results["hotissue"]["success"] += 1
-            results["hotissue"]["success_list"].append(crawler)
-        else:
-            results["hotissue"]["failed"] += 1
-            results["hotissue"]["failed_list"].append(crawler)
-        time.sleep(30)
-    
-    # 정치 크롤러 실행
-    logging.info("정치 크롤러 실행 시작")
-    for crawler in politics_crawlers:
-        success = run_crawler(crawler)
-        if success:
-            results["politics"]["success"] += 1
-            results["politics"]["success_list"].append(crawler)
-        else:
-            results["politics"]["failed"] += 1
-            results["politics"]["failed_list"].append(crawler)
-        time.sleep(30)
-    
+    results_lock = threading.Lock()
+
+    def run_and_count(job):
+        success = run_site_job(job)
+        outcome = "success" if success else "skipped" if job.result in ("shed", "expired") else "failed"
+        with results_lock:
+            group = results[job.info.group]
+            group[outcome] += 1
+            group[f"{outcome}_list"].append(job.info.path)
+        return success
+
+    # 새 스케줄러에서는 모든 크롤러가 지금 실행할 대상 (같은 실행 ID, 하나의 주기 예산)
+    # 실행 기록은 남기되 (주기 예산 배분용 평균) 마지막 실행 시각으로 건너뛰지는 않음
+    scheduler = SiteScheduler(run_and_count, max_workers=max_workers, domain_gap_seconds=domain_gap_seconds,
+                              state=ScheduleState(), resume=False)
+    jobs = scheduler.enqueue_due(cycle_start_time)
+    run_id = jobs[0].run_id if jobs else new_run_id()
+    logging.info(f"=== 크롤링 작업 시작 === (동시 실행 수: {max_workers}, 실행 ID: {run_id})")
+    scheduler.start()
+    scheduler.queue.join()
+    scheduler.stop()
+    scheduler.state.close()
+
     # 결과 요약
-    logging.info("=== 크롤링 작업 완료 ===")
+    logging.info(f"=== 크롤링 작업 완료 === (소요 시간: {time.time() - cycle_start_time:.1f}초)")
     logging.info(f"핫이슈: 성공 {results['hotissue']['success']}, 실패 {results['hotissue']['failed']}")
     logging.info(f"정치: 성공 {results['politics']['success']}, 실패 {results['politics']['failed']}")
-    
+
     if results["hotissue"]["failed"] > 0:
         logging.info(f"실패한 핫이슈 크롤러: {', '.join(results['hotissue']['failed_list'])}")
     if results["politics"]["failed"] > 0:
         logging.info(f"실패한 정치 크롤러: {', '.join(results['politics']['failed_list'])}")
-    
-    # 성공한 크롤러에 대해서만 데이터 삽입
-    for crawler in results["hotissue"]["success_list"]:
-        try:
-            import pandas as pd
-            base_name = os.path.basename(crawler)
-            csv_name = base_name.replace('.py', f'_{datetime.now().strftime("%Y%m%d")}.csv')
-            base_data_folder = '/code/data'
-            today_folder = os.path.join(base_data_folder, datetime.now().strftime('%Y%m%d'))
-            csv_path = os.path.join(today_folder, csv_name)
-            
-            if os.path.exists(csv_path):
-                df = pd.read_csv(csv_path, encoding='utf-8-sig')
-                data = df.to_dict('records')
-                insert_to_db(data, is_politics=False)
-                logging.info(f"핫이슈 데이터 삽입 완료: {crawler}{csv_path}")
-        except Exception as e:
-            logging.error(f"핫이슈 데이터 삽입 중 오류 발생: {str(e)}")
-
-    for crawler in results["politics"]["success_list"]:
-        try:
-            import pandas as pd
-            base_name = os.path.basename(crawler)
-            csv_name = base_name.replace('.py', f'_{datetime.now().strftime("%Y%m%d")}.csv')
-            base_data_folder = '/code/data'
-            today_folder = os.path.join(base_data_folder, datetime.now().strftime('%Y%m%d'))
-            csv_path = os.path.join(today_folder, csv_name)
-            
-            if os.path.exists(csv_path):
-                df = pd.read_csv(csv_path, encoding='utf-8-sig')
-                data = df.to_dict('records')
-                insert_to_db(data, is_politics=True)
-                logging.info(f"정치 데이터 삽입 완료: {crawler} {csv_path}")
-        except Exception as e:
-            logging.error(f"정치 데이터 삽입 중 오류 발생: {str(e)}")
+    for group, label in (("hotissue", "핫이슈"), ("politics", "정치")):
+        if results[group]["skipped"] > 0:
+            logging.info(f"건너뛴 {label} 크롤러: {', '.join(results[group]['skipped_list'])}")
+
+    # 주기 소요 시간 메트릭은 주기 예산 보고서(CycleBudget.report)에서 기록
+    logging.info(f"크롤러별 단계 시간 보고서: {os.path.join(timing.TIMING_DIR, run_id)}")
+    return results
 
 
 def check_crawler_files():
-    """크롤러 파일이 존재하는지 확인"""
-    missing_files = []
-    
-    for crawler in hotissue_crawlers + politics_crawlers:
-        if not os.path.exists(crawler):
-            missing_files.append(crawler)
-    
-    if missing_files:
-        logging.error(f"다음 크롤러 파일을 찾을 수 없습니다: {', '.join(missing_files)}")
+    """등록된 크롤러 확인 (실행할 크롤러가 하나도 없으면 False)"""
+    crawlers = registry.discover()
+    enabled = [info for info in crawlers if info.enabled]
+    disabled = [info.name for info in crawlers if not info.enabled]
+
+    for group in registry.CRAWLER_GROUPS:
+        names = [info.name for info in enabled if info.group == group]
+        logging.info(f"등록된 {group} 크롤러 {len(names)}개: {', '.join(names)}")
+    if disabled:
+        logging.info(f"비활성 크롤러: {', '.join(disabled)}")
+
+    if not enabled:
+        logging.error(f"실행할 크롤러를 찾을 수 없습니다: {registry.CRAWLER_DIR}")
         return False
-    
+
     return True
 
-import mysql.connector
-from mysql.connector import Error
-# import logging
+# mysql.connector는 DB에 처음 접근할 때 import (워커 프로세스는 spawn으로 이 모듈을 다시 import하므로 시작 비용을 줄임)
 
-# 로깅 설정 (기본 설정, 필요 시 파일로 출력하도록 조정 가능)
-# logging.basicConfig(level=logging.DEBUG, format='%(asctime)s - %(levelname)s - %(message)s')
+# DB 커넥션 풀 설정 (스케줄러가 살아있는 동안 재사용)
+DB_POOL_SIZE = int(os.environ.get('DB_POOL_SIZE', 4))
+DB_POOL_WAIT_SECONDS = float(os.environ.get('DB_POOL_WAIT_SECONDS', 30))
+# 1이면 순수 Python 구현, 기본은 C 확장(설치되어 있지 않으면 mysql.connector가 순수 Python으로 대체)
+DB_USE_PURE = os.environ.get('DB_USE_PURE', '0') == '1'
 
-def select_site_info(cursor, table_name, key_values, use_title_writer=False):
-    """게시글 중복 체크 (post_id와 community 기준, 또는 title과 writer 기준)"""
-    if use_title_writer:
-        query = f"SELECT seq, reg_date, views, recommend, content, images FROM {table_name} WHERE title = %s AND writer = %s"
-        # logging.debug(f"Executing query (title, writer): {query} with values {key_values}")
-        cursor.execute(query, key_values)
+_db_pool = None
+_db_pool_lock = threading.Lock()
+
+def get_db_pool():
+    """모듈 공용 커넥션 풀 반환 (처음 호출 시 생성)"""
+    global _db_pool
+    if _db_pool is None:
+        with _db_pool_lock:
+            if _db_pool is None:
+                from mysql.connector import pooling
+                _db_pool = pooling.MySQLConnectionPool(
+                    pool_name="crawler",
+                    pool_size=DB_POOL_SIZE,
+                    pool_reset_session=True,
+                    host=os.environ.get('DB_HOST'),
+                    port=int(os.environ.get('DB_PORT')),
+                    user=os.environ.get('DB_USER'),
+                    password=os.environ.get('DB_PASSWORD'),
+                    database=os.environ.get('DB_NAME'),
+                    connection_timeout=10,
+                    use_pure=DB_USE_PURE
+                )
+                logging.info(f"DB 커넥션 풀 생성 (크기: {DB_POOL_SIZE}, use_pure: {DB_USE_PURE})")
+    return _db_pool
+
+def get_db_connection():
+    """풀에서 커넥션을 꺼내 상태 확인 후 반환 (끊어진 커넥션은 재연결, 풀이 비어 있으면 잠시 대기)"""
+    from mysql.connector import Error
+    from mysql.connector.errors import PoolError
+
+    pool = get_db_pool()
+    deadline = time.time() + DB_POOL_WAIT_SECONDS
+    while True:
+        try:
+            conn = pool.get_connection()
+            break
+        except PoolError:
+            if time.time() >= deadline:
+                raise
+            time.sleep(0.5)
+
+    try:
+        # 오래 쉬어서 서버가 끊은 커넥션이면 다시 연결
+        conn.ping(reconnect=True, attempts=3, delay=1)
+    except Error:
+        conn.close()
+        raise
+    return conn
+
+# 한 번에 조회/삽입/업데이트할 행 수
+DB_BATCH_SIZE = int(os.environ.get('DB_BATCH_SIZE', 500))
+
+SITE_INFO_COLUMNS = "post_id, community, category, title, link, writer, reg_date, views, recommend, content, images"
+
+def select_site_info_batch(cursor, table_name, keys, use_title_writer=False):
+    """게시글 중복 체크를 여러 건 한 번에 조회 (post_id와 community 기준, 또는 title과 writer 기준)
+
+    조회할 키들을 (번호, 키) 파생 테이블로 보내 조인하므로 키 비교는 예전 건별 SELECT ... WHERE title=%s AND writer=%s처럼
+    MySQL이 컬럼 콜레이션으로 하고, 결과는 돌려받은 번호로 keys에 다시 대응시킨다.
+
+    반환: {key: (seq, reg_date, views, recommend, content, images)} (key는 keys에 넘긴 값 그대로)
+    """
+    if not keys:
+        return {}
+    first_column, second_column = ("title", "writer") if use_title_writer else ("post_id", "community")
+    key_rows = " UNION ALL ".join(["SELECT %s AS idx, %s AS k1, %s AS k2"] * len(keys))
+    query = (
+        f"SELECT k.idx, t.seq, t.reg_date, t.views, t.recommend, t.content, t.images "
+        f"FROM ({key_rows}) AS k JOIN {table_name} AS t ON t.{first_column} = k.k1 AND t.{second_column} = k.k2"
+    )
+    cursor.execute(query, [value for index, key in enumerate(keys) for value in (index, *key)])
+
+    existing = {}
+    for row in cursor.fetchall():
+        # 같은 키에 행이 여러 개면 처음 행만 (예전 fetchone과 같음)
+        existing.setdefault(keys[int(row[0])], tuple(row[1:]))
+    return existing
+
+def insert_site_info_batch(cursor, table_name, values_list):
+    """새 게시글 여러 건 삽입 (executemany가 다중 VALUES 한 문장으로 묶어서 전송)
+
+    테이블에 (post_id, community) 등의 유니크 키가 있으면, 같은 배치에서 콜레이션상 같은 키로 두 번 나온 게시글은
+    DB가 중복으로 판정해 뒤의 값으로 업데이트한다 (예전 건별 처리에서 두 번째 행이 UPDATE 되던 것과 같음).
+    """
+    if not values_list:
+        return
+    query = (
+        f"INSERT INTO {table_name} ({SITE_INFO_COLUMNS}) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s) "
+        "ON DUPLICATE KEY UPDATE reg_date = VALUES(reg_date), views = VALUES(views), recommend = VALUES(recommend), "
+        "content = VALUES(content), images = VALUES(images)"
+    )
+    cursor.executemany(query, values_list)
+
+def update_site_info_batch(cursor, table_name, values_list):
+    """기존 게시글 여러 건 업데이트
+
+    기본 키(seq)로 INSERT ... ON DUPLICATE KEY UPDATE 하면 항상 중복이 되어 업데이트만 일어나므로,
+    건별 UPDATE 대신 한 문장으로 보낼 수 있다. 갱신하는 컬럼은 기존과 같다 (reg_date, views, recommend, content, images).
+    """
+    if not values_list:
+        return
+    query = (
+        f"INSERT INTO {table_name} (seq, {SITE_INFO_COLUMNS}) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s) "
+        "ON DUPLICATE KEY UPDATE reg_date = VALUES(reg_date), views = VALUES(views), recommend = VALUES(recommend), "
+        "content = VALUES(content), images = VALUES(images)"
+    )
+    cursor.executemany(query, values_list)
+
+def prepare_site_info(item, is_politics):
+    """CSV 한 행을 DB 컬럼 값으로 변환 (삽입 대상이 아니면 None)"""
+    import pandas as pd
+    import json
+    import re
+
+    processed_item = {}
+    for key, value in item.items():
+        if not isinstance(value, (list, tuple, dict)) and (pd.isna(value) or value in ('nan', 'NaN', 'None')):
+            processed_item[key] = None
+        else:
+            processed_item[key] = value
+
+    reg_date_value = processed_item.get('Date', datetime.now())
+    if isinstance(reg_date_value, datetime):
+        reg_date_value = reg_date_value.strftime('%Y-%m-%d %H:%M:%S')
+    elif isinstance(reg_date_value, str):
+        try:
+            reg_date_value = datetime.strptime(reg_date_value, '%Y-%m-%d %H:%M:%S').strftime('%Y-%m-%d %H:%M:%S')
+        except ValueError:
+            try:
+                reg_date_value = datetime.strptime(reg_date_value, '%Y-%m-%d %H:%M').strftime('%Y-%m-%d %H:%M:%S')
+            except ValueError:
+                reg_date_value = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+
+    post_id = str(processed_item.get('Post ID', '')) if processed_item.get('Post ID') is not None else ''
+    community = str(processed_item.get('Community', '')) if processed_item.get('Community') is not None else ''
+    if is_politics:  # 정치 관련 데이터일 경우
+        match = re.match(r'^(\d+)(p)?$', community)  # 숫자로 시작하고 p가 붙었는지 확인
+        if match:
+            if not match.group(2):  # 숫자만 있고 p가 없는 경우
+                community += 'p'
+        else:  # 숫자로 시작하지 않거나 올바르지 않은 형식인 경우
+            return None
+    category = str(processed_item.get('Category', '')) if processed_item.get('Category') is not None else ''
+    title = str(processed_item.get('Title', '')) if processed_item.get('Title') is not None else ''
+    link = str(processed_item.get('Link', '')) if processed_item.get('Link') is not None else ''
+    writer = str(processed_item.get('Writer', '')) if processed_item.get('Writer') is not None else ''
+    views = str(processed_item.get('Views', 0)) if processed_item.get('Views') is not None else '0'  # 문자열로 처리
+    recommend = str(processed_item.get('Recommend', 0)) if processed_item.get('Recommend') is not None else '0'  # 문자열로 처리
+    content = str(processed_item.get('Content', '')) if processed_item.get('Content') is not None else ''
+
+    images = processed_item.get('Images', [])
+    if images is None:
+        images_str = '[]'
+    elif isinstance(images, str):
+        images_str = images
     else:
-        query = f"SELECT seq, reg_date, views, recommend, content, images FROM {table_name} WHERE post_id = %s AND community = %s"
-        # logging.debug(f"Executing query (post_id, community): {query} with values {key_values}")
-        cursor.execute(query, key_values)
-    
-    result = cursor.fetchone()
-    if cursor.description:
-        cursor.fetchall()  # 남은 결과 소비
-    # logging.debug(f"Query result: {result}")
-    return result  # (seq, reg_date, views, recommend, content, images) or None
-
-def insert_site_info(cursor, table_name, values):
-    """새 게시글 삽입"""
-    query = f"INSERT INTO {table_name} (post_id, community, category, title, link, writer, reg_date, views, recommend, content, images) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)"
-    # logging.debug(f"Inserting new record with values: {values}")
-    cursor.execute(query, values)
-
-def update_site_info(cursor, table_name, values):
-    """기존 게시글 업데이트"""
-    query = f"UPDATE {table_name} SET reg_date = %s, views = %s, recommend = %s, content = %s, images = %s WHERE seq = %s"
-    # logging.debug(f"Updating record with values: {values}")
-    cursor.execute(query, values)
-
-def insert_to_db(data, is_politics=True):
+        images_str = json.dumps(images, ensure_ascii=False)
+
+    # 중복 체크 기준 결정
+    use_title_writer = not post_id or post_id.strip() == ''
+    if use_title_writer and (not title or not writer):
+        return None
+
+    return {
+        "key": (title, writer) if use_title_writer else (post_id, community),
+        "use_title_writer": use_title_writer,
+        "values": (post_id, community, category, title, link, writer, reg_date_value, views, recommend, content, images_str),
+    }
+
+def is_identical_site_info(values, existing):
+    """기존 레코드와 새 값이 같은지 확인 (reg_date, views, recommend, content, images 비교)"""
+    _, existing_reg_date, existing_views, existing_recommend, existing_content, existing_images = existing
+    # existing_views와 existing_recommend를 문자열로 처리
+    existing_views = str(existing_views) if existing_views is not None else '0'
+    existing_recommend = str(existing_recommend) if existing_recommend is not None else '0'
+    reg_date_value, views, recommend, content, images_str = values[6:]
+    return (
+        reg_date_value == existing_reg_date and
+        views == existing_views and
+        recommend == existing_recommend and
+        content == existing_content and
+        images_str == existing_images
+    )
+
+def upsert_site_info_batch(cursor, table_name, rows):
+    """변환된 행들을 기존 레코드와 비교해 삽입/업데이트/건너뜀으로 나눠 일괄 처리
+
+    반환: (삽입 수, 업데이트 수, 건너뜀 수)
+    """
+    inserts = {}
+    updates = {}
+    skipped = 0
+    for use_title_writer in (False, True):
+        group = [row for row in rows if row["use_title_writer"] == use_title_writer]
+        keys = list(dict.fromkeys(row["key"] for row in group))
+        existing = select_site_info_batch(cursor, table_name, keys, use_title_writer=use_title_writer)
+
+        for row in group:
+            key = (use_title_writer, row["key"])
+            values = row["values"]
+            if key in inserts:
+                # 같은 배치에 같은 게시글이 다시 나오면 먼저 삽입한 행을 업데이트한 것과 같게 맞춤
+                inserts[key] = inserts[key][:6] + values[6:]
+            elif row["key"] in existing:
+                record = existing[row["key"]]
+                # 업데이트는 기존 레코드(seq) 기준 (콜레이션상 같은 키가 여러 번 나오면 마지막 값으로)
+                if is_identical_site_info(values, record):
+                    # 같은 배치의 앞선 업데이트도 결국 원래 값으로 되돌아가므로 취소
+                    updates.pop(record[0], None)
+                    skipped += 1
+                    continue
+                updates[record[0]] = (record[0],) + values
+            else:
+                inserts[key] = values
+
+    insert_site_info_batch(cursor, table_name, list(inserts.values()))
+    update_site_info_batch(cursor, table_name, list(updates.values()))
+    return len(inserts), len(updates), skipped
+
+def insert_to_db(data, is_politics=True, batch_size=None, crawler=None):
+    import mysql.connector
+
     conn = None
     cursor = None
-    
+    batch_size = batch_size or DB_BATCH_SIZE
+
     try:
-        import pandas as pd
-        import json
-        
-        conn = mysql.connector.connect(
-            host=os.environ.get('DB_HOST'),
-            port=int(os.environ.get('DB_PORT')),
-            user=os.environ.get('DB_USER'),
-            password=os.environ.get('DB_PASSWORD'),
-            database=os.environ.get('DB_NAME'),
-            connection_timeout=10,
-            use_pure=True  # 순수 Python 구현 사용
-        )
+        conn = get_db_connection()
         cursor = conn.cursor()
-        
+
         table_name = "pgm_current_site" if is_politics else "pgm_hot_site"
 
-        for item in data:
-            processed_item = {}
-            for key, value in item.items():
-                if pd.isna(value) or value in ('nan', 'NaN', 'None'):
-                    processed_item[key] = None
-                else:
-                    processed_item[key] = value
-            
-            reg_date_value = processed_item.get('Date', datetime.now())
-            if isinstance(reg_date_value, datetime):
-                reg_date_value = reg_date_value.strftime('%Y-%m-%d %H:%M:%S')
-            elif isinstance(reg_date_value, str):
-                try:
-                    reg_date_value = datetime.strptime(reg_date_value, '%Y-%m-%d %H:%M:%S').strftime('%Y-%m-%d %H:%M:%S')
-                except ValueError:
-                    try:
-                        reg_date_value = datetime.strptime(reg_date_value, '%Y-%m-%d %H:%M').strftime('%Y-%m-%d %H:%M:%S')
-                    except ValueError:
-                        reg_date_value = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-            
-            post_id = str(processed_item.get('Post ID', '')) if processed_item.get('Post ID') is not None else ''
-            community = processed_item.get('Community', '') if processed_item.get('Community') is not None else ''
-            if is_politics:  # 정치 관련 데이터일 경우
-                import re
-                match = re.match(r'^(\d+)(p)?$', community)  # 숫자로 시작하고 p가 붙었는지 확인
-                if match:
-                    if not match.group(2):  # 숫자만 있고 p가 없는 경우
-                        community += 'p'
-                        # logging.debug(f"Community 값에 'p' 추가됨: {community}")
-                else:  # 숫자로 시작하지 않거나 올바르지 않은 형식인 경우
-                    # logging.warning(f"Community 값이 올바르지 않음. 건너뜀: {community}")
-                    continue
-            category = str(processed_item.get('Category', '')) if processed_item.get('Category') is not None else ''
-            title = str(processed_item.get('Title', '')) if processed_item.get('Title') is not None else ''
-            link = str(processed_item.get('Link', '')) if processed_item.get('Link') is not None else ''
-            writer = str(processed_item.get('Writer', '')) if processed_item.get('Writer') is not None else ''
-            views = str(processed_item.get('Views', 0)) if processed_item.get('Views') is not None else '0'  # 문자열로 처리
-            recommend = str(processed_item.get('Recommend', 0)) if processed_item.get('Recommend') is not None else '0'  # 문자열로 처리
-            content = str(processed_item.get('Content', '')) if processed_item.get('Content') is not None else ''
-            
-            images = processed_item.get('Images', [])
-            if images is None:
-                images_str = '[]'
-            elif isinstance(images, str):
-                images_str = images
-            else:
-                images_str = json.dumps(images, ensure_ascii=False)
-            
-            # logging.debug(f"DB 삽입/업데이트 데이터 준비:")
-            # logging.debug(f"post_id: {post_id}, 타입: {type(post_id)}")
-            # logging.debug(f"community: {community}, 타입: {type(community)}")
-            # logging.debug(f"category: {category}, 타입: {type(category)}")
-            # logging.debug(f"title: {title}, 타입: {type(title)}")
-            # logging.debug(f"link: {link}, 타입: {type(link)}")
-            # logging.debug(f"writer: {writer}, 타입: {type(writer)}")
-            # logging.debug(f"reg_date_value: {reg_date_value}, 타입: {type(reg_date_value)}")
-            # logging.debug(f"views: {views}, 타입: {type(views)}")
-            # logging.debug(f"recommend: {recommend}, 타입: {type(recommend)}")
-            # logging.debug(f"content: {content}, 타입: {type(content)}")
-            # logging.debug(f"images_str: {images_str}, 타입: {type(images_str)}")
-            
-            # print(f"DB에 넣을 데이터: {post_id}, {community}, {category}, {title}, {link}, {writer}, {views}, {recommend}")
-            # 중복 체크 기준 결정
-            # 중복 체크 기준 결정
-            use_title_writer = not post_id or post_id.strip() == ''
-            if use_title_writer:
-                if not title or not writer:
-                    # logging.warning(f"Title 또는 Writer가 비어 있음 - 삽입 건너뜀: {processed_item}")
-                    continue
-                key_values = (title, writer)
-                # logging.debug(f"Checking for existing record with Title: {title}, Writer: {writer}")
-            else:
-                key_values = (post_id, community)
-                # logging.debug(f"Checking for existing record with Post ID: {post_id}, Community: {community}")
-            
-            existing = select_site_info(cursor, table_name, key_values, use_title_writer=use_title_writer)
-            
-            if existing is None:
-                # logging.debug(f"No existing record found. Inserting new record: {processed_item}")
-                insert_values = (post_id, community, category, title, link, writer, reg_date_value, views, recommend, content, images_str)
-                # logging.debug(f"삽입 직전 insert_values: {insert_values}")
-                # logging.debug(f"insert_values 타입: {[type(val) for val in insert_values]}")
-                insert_site_info(cursor, table_name, insert_values)
-                # logging.debug(f"Successfully inserted new record - Title: {title}, Writer: {writer}")
-            
-            elif isinstance(existing, tuple) and len(existing) >= 6:
-                seq, existing_reg_date, existing_views, existing_recommend, existing_content, existing_images = existing
-                # logging.debug(f"Existing record found: (seq: {seq}, reg_date: {existing_reg_date}, views: {existing_views}, recommend: {existing_recommend}, content: {existing_content}, images: {existing_images})")
-                # logging.debug(f"New record data: (reg_date: {reg_date_value}, views: {views}, recommend: {recommend}, content: {content}, images: {images_str})")
-                
-                # existing_views와 existing_recommend를 문자열로 처리
-                existing_views = str(existing_views) if existing_views is not None else '0'
-                existing_recommend = str(existing_recommend) if existing_recommend is not None else '0'
-                
-                is_identical = (
-                    reg_date_value == existing_reg_date and
-                    views == existing_views and
-                    recommend == existing_recommend and
-                    content == existing_content and
-                    images_str == existing_images and
-                    category == str(processed_item.get('Category', '')) and
-                    title == str(processed_item.get('Title', '')) and
-                    link == str(processed_item.get('Link', '')) and
-                    writer == str(processed_item.get('Writer', ''))
-                )
-                
-                if is_identical:
-                    # logging.debug(f"Records are identical. Skipping - Title: {title}, Writer: {writer}")
-                    continue
-                else:
-                    # logging.debug(f"Records differ. Updating record with seq: {seq}")
-                    update_values = (reg_date_value, views, recommend, content, images_str, seq)
-                    # logging.debug(f"업데이트 직전 update_values: {update_values}")
-                    # logging.debug(f"update_values 타입: {[type(val) for val in update_values]}")
-                    update_site_info(cursor, table_name, update_values)
-                    # logging.debug(f"Successfully updated record - Title: {title}, Writer: {writer}")
-            else:
-                logging.error(f"Invalid existing data format: {existing}")
-                continue
-        
+        rows = [row for row in (prepare_site_info(item, is_politics) for item in data) if row is not None]
+        inserted = updated = skipped = 0
+        for start in range(0, len(rows), batch_size):
+            batch_inserted, batch_updated, batch_skipped = upsert_site_info_batch(cursor, table_name, rows[start:start + batch_size])
+            inserted += batch_inserted
+            updated += batch_updated
+            skipped += batch_skipped
+
         conn.commit()
-        # logging.info(f"Transaction committed for table: {table_name}")
+        for result, count in (("inserted", inserted), ("updated", updated), ("skipped", skipped)):
+            metrics.inc("crawler_db_rows_total", count, crawler=crawler or "unknown", table=table_name, result=result)
+        logging.debug(f"{table_name}: 삽입 {inserted}건, 업데이트 {updated}건, 동일 데이터 건너뜀 {skipped}건")
         return True
-        
+
     except mysql.connector.Error as e:
         logging.error(f"DB 삽입 오류: {e}")
         if conn:
@@ -366,40 +599,39 @@ def insert_to_db(data, is_politics=True):
         if cursor:
             cursor.close()
         if conn:
-            conn.close()
-        logging.debug("Connection and cursor closed")
-
-# 매일 지정된 시간에 실행
-schedule.every().day.at("05:00").do(run_all_crawlers)
-schedule.every().day.at("11:00").do(run_all_crawlers)
-schedule.every().day.at("17:00").do(run_all_crawlers)
-schedule.every().day.at("23:00").do(run_all_crawlers)
-
-# 시작 시 즉시 실행 (테스트용)
-logging.info("스케줄러 시작됨 - 5시, 11시, 17시, 23시에 크롤러가 실행됩니다.")
-logging.info("시작 시 즉시 크롤러를 실행합니다.")
-
-# 파일 존재 여부 확인
-if check_crawler_files():
-    # 메인 루프
+            conn.close()  # 풀 커넥션은 close() 시 풀로 반환됨
+        logging.debug("Cursor closed, connection returned to pool")
+
+# 워커 풀은 spawn으로 이 모듈을 다시 import하므로 스케줄 등록과 스케줄러 루프는 직접 실행할 때만
+if __name__ == "__main__":
+    setup_logging()
+
+    # 사이트별 실행 간격(CRAWLER_INFO의 interval)마다 우선순위 큐에 넣고 디스패처가 실행
+    site_scheduler = SiteScheduler(run_site_job, max_workers=get_max_workers(),
+                                   domain_gap_seconds=get_domain_gap_seconds(), state=ScheduleState())
+
+    logging.info("스케줄러 시작됨 - 크롤러마다 설정된 간격으로 실행됩니다.")
+    logging.info("처음 실행하는 크롤러와 실행 시각이 지난 크롤러는 바로 실행합니다.")
+
+    # 메트릭 서버 시작 (/metrics, 기본 포트 8581)
     try:
-        # 시작 시 즉시 실행
-        scheduler_start_time = datetime.now()
-        logging.info(f"스케줄러 시작 시간: {scheduler_start_time.strftime('%Y-%m-%d %H:%M:%S')}")
-        run_all_crawlers()
-        
-        while True:
-            try:
-                current_time = datetime.now()
-                logging.info(f"스케줄 확인 중... (시작 시간: {scheduler_start_time.strftime('%H:%M:%S')}, 현재 시간: {current_time.strftime('%H:%M:%S')})")
-                schedule.run_pending()
-                time.sleep(60)  # 1분마다 스케줄 확인
-            except Exception as e:
-                logging.error(f"스케줄러 실행 중 오류 발생: {str(e)}")
-                time.sleep(300)  # 오류 발생 시 5분 대기 후 재시도
-    except KeyboardInterrupt:
-        logging.info("사용자에 의해 스케줄러가 중단되었습니다.")
-        sys.exit(0)
-else:
-    logging.error("크롤러 파일이 존재하지 않아 종료합니다.")
-    sys.exit(1)
+        if metrics.start_metrics_server():
+            logging.info(f"메트릭 서버 시작: 포트 {metrics.METRICS_PORT}")
+    except OSError as e:
+        logging.error(f"메트릭 서버 시작 실패: {str(e)}")
+
+    # 등록된 크롤러 확인
+    if check_crawler_files():
+        # 메인 루프 (다음 실행 시각까지 대기, 중단 전까지 반환하지 않음)
+        try:
+            scheduler_start_time = datetime.now()
+            logging.info(f"스케줄러 시작 시간: {scheduler_start_time.strftime('%Y-%m-%d %H:%M:%S')}")
+            site_scheduler.run_forever()
+        except KeyboardInterrupt:
+            logging.info("사용자에 의해 스케줄러가 중단되었습니다.")
+            if _worker_pool is not None:
+                _worker_pool.close()
+            sys.exit(0)
+    else:
+        logging.error("실행할 크롤러가 없어 종료합니다.")
+        sys.exit(1)
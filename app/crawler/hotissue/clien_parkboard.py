@@ -1,11 +1,23 @@
-import requests
-from bs4 import BeautifulSoup as Soup
 import pandas as pd
 from datetime import datetime
-import time
 import random
 import os
 import re
+import sys
+
+# 공용 모듈 경로 추가 (app/crawler)
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common.http_client import fetch
+from common.parser import parse_html
+from common.seen_store import SeenStore
+from common.record_sink import RecordSink
+from common.checkpoint import Checkpoint
+from common.crawl_log import get_logger
+
+log = get_logger("clien_parkboard", community="4")
+
+# 스케줄러 등록 정보 (common.registry가 import 없이 읽음)
+CRAWLER_INFO = {"community": "4", "host": "www.clien.net", "priority": 2, "interval": 720}
 
 # 헤더 설정 함수
 def get_headers():
@@ -49,15 +61,15 @@ def parse_views(views_text):
 def get_post_content(post_url):
     try:
         headers = get_headers()
-        response = requests.get(post_url, headers=headers, timeout=10)
+        response = fetch(post_url, headers=headers)
         response.raise_for_status()
         response.encoding = 'utf-8'
-        soup = Soup(response.text, "html.parser")
+        soup = parse_html(response.text, response.url)
 
         content_div = soup.find("div", class_="post_article")
         if not content_div:
-            print(f"내용 영역을 찾을 수 없습니다: {post_url}")
-            return {"text": "", "images": []}
+            log.warning(f"내용 영역을 찾을 수 없습니다: {post_url}")
+            return {"text": "", "images": [], "failed": True}
 
         text_content = content_div.get_text(separator="\n", strip=True)
 
@@ -73,43 +85,51 @@ def get_post_content(post_url):
 
         return {"text": text_content, "images": image_urls}
     except Exception as e:
-        print(f"게시글 크롤링 실패: {post_url} - {e}")
-        return {"text": "", "images": []}
+        log.warning(f"게시글 크롤링 실패: {post_url} - {e}")
+        return {"text": "", "images": [], "failed": True}
 
 # 클리앙 게시판 크롤링 메인 함수
 def clien_park_crawl(min_views=2000):
     base_url = 'https://www.clien.net/service/board/park'
     today = datetime.now().date()
     data = []
-    page = 0  # 클리앙은 페이지 0부터 시작
     no_today_count = 0  # 오늘 날짜가 없는 페이지 연속 카운트
     max_no_today = 3    # 오늘 날짜 없는 페이지가 3번 연속이면 종료
+    seen_store = SeenStore("4")  # 이전 실행에서 수집한 게시글 상태
+    sink = RecordSink.for_script(__file__)  # 수집 완료한 게시글을 바로 기록 (중단되어도 남음)
+    checkpoint = Checkpoint.for_script(__file__)  # 중단되면 다음 실행에서 끝낸 게시글은 건너뛰고 이어서 수집
+    page = 0  # 클리앙은 페이지 0부터 시작
+    # 중단된 이전 실행이 기록해 두고 DB에 넣지 못한 게시글
+    for post in checkpoint.previous_records():
+        data.append(post)
+        sink.write(post)
 
     while no_today_count < max_no_today:
         page_url = base_url if page == 0 else f"{base_url}?&od=T31&category=0&po={page}"
-        print(f"페이지 {page + 1} 크롤링 중: {page_url}")
+        log.debug(f"페이지 {page + 1} 크롤링 중: {page_url}")
 
         try:
             headers = get_headers()
-            response = requests.get(page_url, headers=headers, timeout=10)
+            response = fetch(page_url, headers=headers)
             response.raise_for_status()
             response.encoding = 'utf-8'
-            soup = Soup(response.text, "html.parser")
+            soup = parse_html(response.text, response.url)
             list_content = soup.find("div", class_="list_content")
             if not list_content:
-                print("list_content를 찾을 수 없습니다.")
+                log.warning("list_content를 찾을 수 없습니다.")
                 no_today_count += 1
                 page += 1
                 continue
 
             posts = list_content.find_all("div", class_="list_item")
             if not posts:
-                print("게시물이 없습니다.")
+                log.info("게시물이 없습니다.")
                 no_today_count += 1
                 page += 1
                 continue
 
             has_today_post = False  # 페이지에 오늘 날짜 게시글 존재 여부
+            page_posts = []
             for post in posts:
                 post_id = post.get("data-board-sn")
                 if not post_id:
@@ -146,9 +166,7 @@ def clien_park_crawl(min_views=2000):
                 comment_elem = post.find("span", class_="rSymph05")
                 comment_count = int(comment_elem.text.strip()) if comment_elem else 0
 
-                content_data = get_post_content(link)
-
-                data.append({
+                page_posts.append({
                     "Post ID": post_id,
                     "Community": "4",
                     "Category": "park",
@@ -158,33 +176,58 @@ def clien_park_crawl(min_views=2000):
                     "Date": date_str,
                     "Recommend": recommend,
                     "Views": views,
-                    "Comments": comment_count,
-                    "Content": content_data["text"],
-                    "Images": content_data["images"]
+                    "Comments": comment_count
                 })
 
-                print(f"게시물 수집 완료: {title} (ID: {post_id}, Views: {views})")
+            page_posts = checkpoint.remaining(page_posts)
+            # 이전 실행 이후 조회수/추천수가 바뀌지 않은 게시글은 상세 수집 생략
+            reached_seen = seen_store.reached_seen_territory([seen_store.post_key(post) for post in page_posts])
+            page_posts = seen_store.filter_changed(page_posts)
+            checkpoint.save(page, [post["Link"] for post in page_posts])
+
+            # 게시글 내용 병렬 수집 (목록 순서 유지)
+            kept_posts = []
+            contents = checkpoint.fetch_contents(get_post_content, [post["Link"] for post in page_posts])
+            for post, content_data in zip(page_posts, contents):
+                post["Content"] = content_data["text"]
+                post["Images"] = content_data["images"]
+                data.append(post)
+                sink.write(post)
+                checkpoint.done(post["Link"], content_data)
+                kept_posts.append(post)
+                log.debug(f"게시물 수집 완료: {post['Title']} (ID: {post['Post ID']}, Views: {post['Views']})")
+            seen_store.mark_posts_seen(kept_posts)
+
+            if reached_seen:
+                log.info("이전 실행에서 수집한 구간에 도달하여 크롤링을 종료합니다.")
+                break
 
             # 오늘 날짜 게시글이 없으면 카운트 증가
             if not has_today_post:
                 no_today_count += 1
-                print(f"오늘 날짜 게시글 없음. 연속 카운트: {no_today_count}/{max_no_today}")
+                log.debug(f"오늘 날짜 게시글 없음. 연속 카운트: {no_today_count}/{max_no_today}")
             else:
                 no_today_count = 0  # 오늘 날짜 게시글이 있으면 카운트 리셋
 
             page += 1
-            time.sleep(random.uniform(2, 5))
 
         except Exception as e:
-            print(f"페이지 로드 오류: {e}")
+            log.warning(f"페이지 로드 오류: {e}")
             no_today_count += 1
             page += 1
             continue
 
-    print(f"오늘 날짜 게시글이 없는 페이지가 {max_no_today}번 연속으로 나와 크롤링을 종료합니다.")
+    log.info(f"오늘 날짜 게시글이 없는 페이지가 {max_no_today}번 연속으로 나와 크롤링을 종료합니다.")
+    sink.close()
+    checkpoint.clear()
+    checkpoint.close()
     df = pd.DataFrame(data)
     return df if not df.empty else None
 
+def run():
+    """스케줄러 수집 설정으로 크롤링 실행 (DataFrame 또는 None 반환)"""
+    return clien_park_crawl(min_views=2500)
+
 # 메인 실행부
 if __name__ == "__main__":
     base_data_folder = os.path.join('/code/data')
@@ -194,16 +237,16 @@ if __name__ == "__main__":
     if not os.path.exists(today_folder):
         try:
             os.makedirs(today_folder, exist_ok=True)
-            print(f"'{today_folder}' 폴더를 생성했습니다.")
+            log.info(f"'{today_folder}' 폴더를 생성했습니다.")
         except Exception as e:
-            print(f"폴더 생성 중 오류 발생: {e}")
+            log.warning(f"폴더 생성 중 오류 발생: {e}")
     
-    df = clien_park_crawl(min_views=2500)
+    df = run()
     if df is not None:
         available_cols = [col for col in ["Post_ID", "Category", "Title", "Writer", "Date", "Views", "Recommend", "Comments", "Content", "Images"] if col in df.columns]
-        print(df[available_cols])
+        log.info("수집 데이터 미리보기:\n%s", df[available_cols])
         
         file_name = f"clien_parkboard_{today}.csv"
         file_path = os.path.join(today_folder, file_name)
         df.to_csv(file_path, index=False, encoding="utf-8-sig")
-        print(f"데이터가 '{file_path}' 파일로 저장되었습니다.")
\ No newline at end of file
+        log.info(f"데이터가 '{file_path}' 파일로 저장되었습니다.")
\ No newline at end of file
@@ -1,12 +1,25 @@
-import requests
-from bs4 import BeautifulSoup as Soup
 import pandas as pd
 from datetime import datetime
-import time
 import random
 import os
 import re
 from urllib.parse import urljoin
+import sys
+
+# 공용 모듈 경로 추가 (app/crawler)
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common.http_client import fetch
+from common.parser import parse_html
+from common.seen_store import SeenStore
+from common.record_sink import RecordSink
+from common.checkpoint import Checkpoint
+from common.crawl_log import get_logger
+from common.backoff import wait_before_retry
+
+log = get_logger("instiz_issue", community="3")
+
+# 스케줄러 등록 정보 (common.registry가 import 없이 읽음)
+CRAWLER_INFO = {"community": "3", "host": "www.instiz.net", "priority": 2}
 
 # 헤더 설정 함수
 def get_headers():
@@ -35,9 +48,9 @@ def extract_post_id(url):
 
 # 날짜 문자열 파싱 함수
 def parse_date_str(date_str, today):
-    print(f"날짜 파싱 시도: '{date_str}'", flush=True)
+    log.debug(f"날짜 파싱 시도: '{date_str}'")
     if not date_str:
-        print("날짜 문자열이 비어있음")
+        log.debug("날짜 문자열이 비어있음")
         return None
         
     if len(date_str.split()) == 1:  # 시간만 있는 경우 (예: "8:10")
@@ -59,36 +72,36 @@ def parse_date_str(date_str, today):
                 elif month == 1 and today.month == 12:
                     parsed_date = datetime(year + 1, month, day).date()
                 
-                print(f"날짜 파싱 결과: '{date_str}' -> {parsed_date}")
+                log.debug(f"날짜 파싱 결과: '{date_str}' -> {parsed_date}")
                 return parsed_date
             elif '-' in date_part:
                 # "2023-03-18 21:58" 형식 처리
                 parsed_date = datetime.strptime(date_part, '%Y-%m-%d').date()
-                print(f"날짜 파싱 결과: '{date_str}' -> {parsed_date}", flush=True)
+                log.debug(f"날짜 파싱 결과: '{date_str}' -> {parsed_date}")
                 return parsed_date
             else:
-                print(f"알 수 없는 날짜 형식: '{date_str}'")
+                log.warning(f"알 수 없는 날짜 형식: '{date_str}'")
                 return None
         except (ValueError, IndexError) as e:
-            print(f"날짜 파싱 오류: '{date_str}' - {e}")
+            log.warning(f"날짜 파싱 오류: '{date_str}' - {e}")
             return None  # 파싱 실패 시 None 반환
 
 # 게시글 내용 크롤링
 def get_post_content(post_url):
     try:
         headers = get_headers()
-        response = requests.get(post_url, headers=headers, timeout=10)
-        print(f"[DEBUG] 응답 헤더: {response.headers}")
+        response = fetch(post_url, headers=headers)
+        log.debug(f"응답 헤더: {response.headers}")
         if response.status_code != 200:
-            print(f"[ERROR] 비정상 응답 본문:\n{response.text[:500]}...")
+            log.warning(f"비정상 응답 본문:\n{response.text[:500]}...")
         response.raise_for_status()
         response.encoding = 'utf-8'
-        soup = Soup(response.text, "html.parser")
+        soup = parse_html(response.text, response.url)
 
         content_div = soup.find("div", class_="memo_content")
         if not content_div:
-            print(f"내용 영역을 찾을 수 없습니다: {post_url}")
-            return {"text": "", "images": []}
+            log.warning(f"내용 영역을 찾을 수 없습니다: {post_url}")
+            return {"text": "", "images": [], "failed": True}
 
         text_content = content_div.get_text(separator="\n", strip=True)
         image_urls = []
@@ -103,8 +116,8 @@ def get_post_content(post_url):
 
         return {"text": text_content, "images": image_urls}
     except Exception as e:
-        print(f"게시글 크롤링 실패: {post_url} - {e}")
-        return {"text": "", "images": []}
+        log.warning(f"게시글 크롤링 실패: {post_url} - {e}")
+        return {"text": "", "images": [], "failed": True}
 
 # 게시글 정보 파싱 함수
 def get_post_info(post):
@@ -147,7 +160,7 @@ def get_post_info(post):
             try:
                 views = int(views_elem.text.strip().replace(',', ''))
             except ValueError:
-                print(f"조회수 파싱 오류: {views_elem.text.strip()}")
+                log.warning(f"조회수 파싱 오류: {views_elem.text.strip()}")
         
         # 추천수 찾기
         recommend_elem = post.find("td", class_="listno", width="25")
@@ -160,7 +173,7 @@ def get_post_info(post):
             try:
                 recommend = int(recommend_elem.text.strip())
             except ValueError:
-                print(f"추천수 파싱 오류: {recommend_elem.text.strip()}")
+                log.warning(f"추천수 파싱 오류: {recommend_elem.text.strip()}")
         
         # 댓글 수 파싱
         comment_elem = None
@@ -171,7 +184,7 @@ def get_post_info(post):
             try:
                 comment_count = int(comment_elem.text.strip())
             except ValueError:
-                print(f"댓글 수 파싱 오류: {comment_elem.text.strip()}")
+                log.warning(f"댓글 수 파싱 오류: {comment_elem.text.strip()}")
         
         return {
             "post_id": post_id,
@@ -185,7 +198,7 @@ def get_post_info(post):
             "comments": comment_count
         }
     except Exception as e:
-        print(f"게시글 정보 파싱 오류: {e}")
+        log.warning(f"게시글 정보 파싱 오류: {e}")
         return None
 
 # 인스티즈 게시판 크롤링 메인 함수
@@ -193,42 +206,50 @@ def instiz_pt_crawl(min_views=1000):
     base_url = 'https://www.instiz.net/pt'
     today = datetime.now().date()
     data = []
-    page = 1
     no_today_count = 0
     max_no_today = 3
     max_retries = 3
     total_posts_collected = 0
+    seen_store = SeenStore("3")  # 이전 실행에서 수집한 게시글 상태
+    sink = RecordSink.for_script(__file__)  # 수집 완료한 게시글을 바로 기록 (중단되어도 남음)
+    checkpoint = Checkpoint.for_script(__file__)  # 중단되면 다음 실행에서 끝낸 게시글은 건너뛰고 이어서 수집
+    page = 1
+    # 중단된 이전 실행이 기록해 두고 DB에 넣지 못한 게시글
+    for post in checkpoint.previous_records():
+        data.append(post)
+        sink.write(post)
+    reached_seen = False
 
-    print(f"크롤링 시작 - 오늘 날짜: {today}, 최소 조회수: {min_views}")
+    log.info(f"크롤링 시작 - 오늘 날짜: {today}, 최소 조회수: {min_views}")
 
-    while no_today_count < max_no_today:
+    while no_today_count < max_no_today and not reached_seen:
         if page > 15:  # 페이지 번호 20을 넘으면 크롤링 종료
             break
         page_url = base_url if page == 1 else f"{base_url}?page={page}"
-        print(f"\n페이지 {page} 크롤링 중: {page_url}", flush=True)
+        log.debug(f"페이지 {page} 크롤링 중: {page_url}")
 
         retry_count = 0
         while retry_count < max_retries:
             try:
                 headers = get_headers()
-                response = requests.get(page_url, headers=headers, timeout=10)
+                response = fetch(page_url, headers=headers)
                 response.raise_for_status()
                 response.encoding = 'utf-8'
-                print(f"응답 상태 코드: {response.status_code}, 응답 길이: {len(response.text)} 바이트")
+                log.debug(f"응답 상태 코드: {response.status_code}, 응답 길이: {len(response.text)} 바이트")
 
-                soup = Soup(response.text, "html.parser")
+                soup = parse_html(response.text, response.url)
                 if len(response.text) < 1000:
-                    print(f"비정상 응답 감지: {response.text[:500]}")
+                    log.warning(f"비정상 응답 감지: {response.text[:500]}")
                     retry_count += 1
                     if retry_count < max_retries:
-                        print(f"재시도 {retry_count}/{max_retries}...")
-                        time.sleep(random.uniform(2, 5))
+                        delay = wait_before_retry(retry_count)
+                        log.info(f"재시도 {retry_count}/{max_retries} ({delay:.1f}초 대기)...")
                         continue
                     else:
                         no_today_count += 1
                         break
                 
-                print("HTML 파싱 완료", flush=True)
+                log.debug("HTML 파싱 완료")
                 all_detours = []
                 
                 # mboard 테이블에서 detour 찾기
@@ -236,31 +257,32 @@ def instiz_pt_crawl(min_views=1000):
                 if mboard_table:
                     detours = mboard_table.find_all("tr", id="detour", recursive=True)
                     all_detours.extend(detours)
-                    print(f"mboard에서 찾은 detour 개수: {len(detours)}", flush=True)
+                    log.debug(f"mboard에서 찾은 detour 개수: {len(detours)}")
                 else:
-                    print("mboard 테이블을 찾을 수 없습니다")
+                    log.warning("mboard 테이블을 찾을 수 없습니다")
 
                 # green_mainboard 테이블에서 detour 찾기
                 green_tables = soup.find_all("table", id=re.compile("green_mainboard[0-2]?"))
-                print(f"green_mainboard 테이블 개수: {len(green_tables)}", flush=True)
+                log.debug(f"green_mainboard 테이블 개수: {len(green_tables)}")
                 for green_table in green_tables:
                     green_detours = green_table.find_all("tr", id="detour")
                     all_detours.extend(green_detours)
-                    print(f"{green_table.get('id')}에서 찾은 detour 개수: {len(green_detours)}")
+                    log.debug(f"{green_table.get('id')}에서 찾은 detour 개수: {len(green_detours)}")
 
                 if not all_detours:
-                    print("id='detour'를 가진 게시물이 없습니다.")
+                    log.warning("id='detour'를 가진 게시물이 없습니다.")
                     no_today_count += 1
                     break
 
-                print(f"총 detour 게시글 개수: {len(all_detours)}", flush=True)
+                log.debug(f"총 detour 게시글 개수: {len(all_detours)}")
                 has_today_post = False
                 page_posts_collected = 0
+                page_posts = []
                 
                 for post in all_detours:
                     post_info = get_post_info(post)
                     if not post_info:
-                        print("게시글 정보 파싱 실패, 다음 게시글로 넘어갑니다.")
+                        log.warning("게시글 정보 파싱 실패, 다음 게시글로 넘어갑니다.")
                         continue
                     
                     # 날짜 처리
@@ -268,24 +290,19 @@ def instiz_pt_crawl(min_views=1000):
                     post_date = parse_date_str(date_str, today)
                     
                     if post_date is None:
-                        print("날짜 파싱 실패, 다음 게시글로 넘어갑니다.")
+                        log.warning("날짜 파싱 실패, 다음 게시글로 넘어갑니다.")
                         continue
                         
                     if post_date == today:
                         has_today_post = True
-                        print(f"오늘 날짜 게시글 발견: {post_info['title']} (조회수: {post_info['views']})", flush=True)
+                        log.debug(f"오늘 날짜 게시글 발견: {post_info['title']} (조회수: {post_info['views']})")
                         
                         # 조회수 필터링
                         if post_info["views"] < min_views:
-                            print(f"조회수 부족 ({post_info['views']} < {min_views}), 건너뜁니다.")
+                            log.debug(f"조회수 부족 ({post_info['views']} < {min_views}), 건너뜁니다.")
                             continue
                         
-                        # 내용 크롤링
-                        print(f"게시글 내용 크롤링 중: {post_info['link']}", flush=True)
-                        content_data = get_post_content(post_info["link"])
-                        
-                        # 데이터 추가
-                        data.append({
+                        page_posts.append({
                             "Post ID": post_info["post_id"],
                             "Community": "3",
                             "Category": post_info["category"],
@@ -295,50 +312,75 @@ def instiz_pt_crawl(min_views=1000):
                             "Date": date_str,
                             "Recommend": post_info["recommend"],
                             "Views": post_info["views"],
-                            "Comments": post_info["comments"],
-                            "Content": content_data["text"],
-                            "Images": content_data["images"]
+                            "Comments": post_info["comments"]
                         })
-                        
-                        page_posts_collected += 1
-                        total_posts_collected += 1
-                        print(f"게시물 수집 완료: {post_info['title']} (ID: {post_info['post_id']}, Views: {post_info['views']})", flush=True)
                     else:
-                        print(f"오늘 날짜가 아닌 게시글: {post_info['title']} (날짜: {post_date})", flush=True)
+                        log.debug(f"오늘 날짜가 아닌 게시글: {post_info['title']} (날짜: {post_date})")
+
+                page_posts = checkpoint.remaining(page_posts)
+                # 이전 실행 이후 조회수/추천수가 바뀌지 않은 게시글은 상세 수집 생략
+                reached_seen = seen_store.reached_seen_territory([seen_store.post_key(post) for post in page_posts])
+                page_posts = seen_store.filter_changed(page_posts)
+                checkpoint.save(page, [post["Link"] for post in page_posts])
+
+                # 게시글 내용 병렬 수집 (목록 순서 유지)
+                log.debug(f"게시글 내용 크롤링 중: {len(page_posts)}개")
+                kept_posts = []
+                contents = checkpoint.fetch_contents(get_post_content, [post["Link"] for post in page_posts])
+                for post, content_data in zip(page_posts, contents):
+                    post["Content"] = content_data["text"]
+                    post["Images"] = content_data["images"]
+                    data.append(post)
+                    sink.write(post)
+                    checkpoint.done(post["Link"], content_data)
+                    kept_posts.append(post)
+                    page_posts_collected += 1
+                    total_posts_collected += 1
+                    log.debug(f"게시물 수집 완료: {post['Title']} (ID: {post['Post ID']}, Views: {post['Views']})")
+                seen_store.mark_posts_seen(kept_posts)
+                if reached_seen:
+                    log.info("이전 실행에서 수집한 구간에 도달하여 크롤링을 종료합니다.")
+                    break
                 
-                print(f"이 페이지에서 수집한 게시글 수: {page_posts_collected}")
-                print(f"지금까지 총 수집한 게시글 수: {total_posts_collected}")
+                log.debug(f"이 페이지에서 수집한 게시글 수: {page_posts_collected}")
+                log.debug(f"지금까지 총 수집한 게시글 수: {total_posts_collected}")
                 
                 if has_today_post:
                     no_today_count = 0  # 오늘 날짜 게시글이 하나라도 있으면 카운터 초기화
-                    print(f"오늘 날짜 게시글을 찾았습니다. 연속 카운터 초기화: {no_today_count}", flush=True)
+                    log.debug(f"오늘 날짜 게시글을 찾았습니다. 연속 카운터 초기화: {no_today_count}")
                 else:
                     no_today_count += 1
-                    print(f"오늘 날짜 게시글 없음. 연속 카운트: {no_today_count}/{max_no_today}", flush=True)
+                    log.debug(f"오늘 날짜 게시글 없음. 연속 카운트: {no_today_count}/{max_no_today}")
                 
                 if no_today_count >= max_no_today:
-                    print(f"오늘 날짜 게시글이 없는 페이지가 {max_no_today}번 연속으로 나와 크롤링을 종료합니다.")
+                    log.info(f"오늘 날짜 게시글이 없는 페이지가 {max_no_today}번 연속으로 나와 크롤링을 종료합니다.")
                     break
                 
                 page += 1
-                time.sleep(random.uniform(2, 5))
                 break  # 성공적으로 처리했으므로 재시도 루프 종료
                 
             except Exception as e:
-                print(f"페이지 로드 오류: {e}")
+                log.warning(f"페이지 로드 오류: {e}")
                 retry_count += 1
                 if retry_count < max_retries:
-                    print(f"재시도 {retry_count}/{max_retries}...")
-                    time.sleep(random.uniform(3, 7))
+                    delay = wait_before_retry(retry_count)
+                    log.info(f"재시도 {retry_count}/{max_retries} ({delay:.1f}초 대기)...")
                 else:
                     no_today_count += 1
                     page += 1
                     break
 
-    print(f"크롤링 종료 - 총 수집한 게시글 수: {total_posts_collected}")
+    log.info(f"크롤링 종료 - 총 수집한 게시글 수: {total_posts_collected}")
+    sink.close()
+    checkpoint.clear()
+    checkpoint.close()
     df = pd.DataFrame(data)
     return df if not df.empty else None
 
+def run():
+    """스케줄러 수집 설정으로 크롤링 실행 (DataFrame 또는 None 반환)"""
+    return instiz_pt_crawl(min_views=500)
+
 # 메인 실행부
 if __name__ == "__main__":
     base_data_folder = os.path.join('/code/data')
@@ -348,20 +390,19 @@ if __name__ == "__main__":
     if not os.path.exists(today_folder):
         try:
             os.makedirs(today_folder, exist_ok=True)
-            print(f"'{today_folder}' 폴더를 생성했습니다.")
+            log.info(f"'{today_folder}' 폴더를 생성했습니다.")
         except Exception as e:
-            print(f"폴더 생성 중 오류 발생: {e}")
+            log.warning(f"폴더 생성 중 오류 발생: {e}")
     
-    df = instiz_pt_crawl(min_views=500)
+    df = run()
     if df is not None and not df.empty:
         available_cols = [col for col in ["Post_ID", "Category", "Title", "Writer", "Date", "Views", "Recommend", "Comments", "Content", "Images"] if col in df.columns]
-        print(f"수집된 데이터 미리보기:")
-        print(df[available_cols].head())
-        print(f"총 수집된 게시글 수: {len(df)}")
+        log.info("수집 데이터 미리보기:\n%s", df[available_cols].head())
+        log.info(f"총 수집된 게시글 수: {len(df)}")
         
         file_name = f"instiz_issue_{today}.csv"
         file_path = os.path.join(today_folder, file_name)
         df.to_csv(file_path, index=False, encoding="utf-8-sig")
-        print(f"데이터가 '{file_path}' 파일로 저장되었습니다.")
+        log.info(f"데이터가 '{file_path}' 파일로 저장되었습니다.")
     else:
-        print("수집된 데이터가 없습니다.")
+        log.info("수집된 데이터가 없습니다.")
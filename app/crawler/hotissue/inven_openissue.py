@@ -1,10 +1,24 @@
 import pandas as pd
 from datetime import datetime
-import time
 import requests
-from bs4 import BeautifulSoup as Soup
 import random
 import os
+import sys
+
+# 공용 모듈 경로 추가 (app/crawler)
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common import metrics
+from common.http_client import fetch
+from common.parser import parse_html
+from common.seen_store import SeenStore, is_failed_content
+from common.record_sink import RecordSink
+from common.checkpoint import Checkpoint
+from common.crawl_log import get_logger
+
+log = get_logger("inven_openissue", community="10")
+
+# 스케줄러 등록 정보 (common.registry가 import 없이 읽음)
+CRAWLER_INFO = {"community": "10", "host": "www.inven.co.kr", "priority": 2, "interval": 720}
 
 # 헤더 설정 함수
 def get_headers():
@@ -30,28 +44,28 @@ def is_valid_post_url(url):
     return url.startswith("http")
 
 # 게시글 내용 크롤링 함수 (BeautifulSoup만 사용)
-def get_post_content(post_url, delay=2):
-    print(f"\n[게시글 접근] URL: {post_url}")
+def get_post_content(post_url):
+    log.debug(f"[게시글 접근] URL: {post_url}")
     
     if not is_valid_post_url(post_url):
-        print(f"[유효하지 않은 URL] 건너뜀: {post_url}")
-        return {"text": "유효하지 않은 URL", "images": [], "actual_date": None}
+        log.warning(f"[유효하지 않은 URL] 건너뜀: {post_url}")
+        return {"text": "유효하지 않은 URL", "images": [], "actual_date": None, "failed": True}
 
     try:
         headers = get_headers()
-        print(f"[요청 전송] User-Agent: {headers['User-Agent'][:30]}...")
-        response = requests.get(post_url, headers=headers, timeout=10)
+        log.debug(f"[요청 전송] User-Agent: {headers['User-Agent'][:30]}...")
+        response = fetch(post_url, headers=headers)
         response.raise_for_status()
         response.encoding = 'utf-8'  # 인코딩 명시
-        print(f"[응답 성공] 상태 코드 {response.status_code}, 응답 크기 {len(response.text)} 바이트")
+        log.debug(f"[응답 성공] 상태 코드 {response.status_code}, 응답 크기 {len(response.text)} 바이트")
         
-        soup = Soup(response.text, "html.parser")
+        soup = parse_html(response.text, response.url)
     except requests.exceptions.Timeout:
-        print(f"[요청 타임아웃] URL: {post_url}")
-        return {"text": "요청 타임아웃", "images": [], "actual_date": None}
+        log.debug(f"[요청 타임아웃] URL: {post_url}")
+        return {"text": "요청 타임아웃", "images": [], "actual_date": None, "failed": True}
     except Exception as e:
-        print(f"[페이지 로드 오류] URL: {post_url} - {str(e)}")
-        return {"text": f"로드 오류: {str(e)}", "images": [], "actual_date": None}
+        log.warning(f"[페이지 로드 오류] URL: {post_url} - {str(e)}")
+        return {"text": f"로드 오류: {str(e)}", "images": [], "actual_date": None, "failed": True}
 
     # 게시글 실제 날짜 확인
     actual_date = None
@@ -60,18 +74,18 @@ def get_post_content(post_url, delay=2):
         date_str = date_elem.text.strip()
         try:
             actual_date = datetime.strptime(date_str, "%Y-%m-%d %H:%M")
-            print(f"[날짜 확인] 게시글 실제 날짜: {actual_date}")
+            log.debug(f"[날짜 확인] 게시글 실제 날짜: {actual_date}")
         except ValueError:
-            print(f"[날짜 파싱 오류] 날짜 문자열: {date_str}")
+            log.warning(f"[날짜 파싱 오류] 날짜 문자열: {date_str}")
     
     # 게시글 내용 영역 찾기
     content_div = soup.find("div", id="powerbbsContent") or soup.find("div", class_="contentBody")
     if not content_div:
-        print(f"[내용 영역 없음] URL: {post_url}")
-        return {"text": "내용을 찾을 수 없습니다.", "images": [], "actual_date": actual_date}
+        log.debug(f"[내용 영역 없음] URL: {post_url}")
+        return {"text": "내용을 찾을 수 없습니다.", "images": [], "actual_date": actual_date, "failed": True}
 
     text_content = content_div.get_text(separator="\n", strip=True)
-    print(f"[텍스트 추출 성공] 글자 수: {len(text_content)}")
+    log.debug(f"[텍스트 추출 성공] 글자 수: {len(text_content)}")
     
     # 이미지 URL 추출
     image_urls = []
@@ -90,9 +104,8 @@ def get_post_content(post_url, delay=2):
     
     # 모든 미디어 URL 합치기
     all_media_urls = image_urls + video_urls
-    print(f"[미디어 추출 성공] 이미지 수: {len(image_urls)}, 비디오 수: {len(video_urls)}")
+    log.debug(f"[미디어 추출 성공] 이미지 수: {len(image_urls)}, 비디오 수: {len(video_urls)}")
     
-    time.sleep(delay)
     return {
         "text": text_content,
         "images": all_media_urls,
@@ -100,49 +113,56 @@ def get_post_content(post_url, delay=2):
     }
 
 # 인벤 게시판 크롤링 함수 (오늘 날짜만)
-def inven_board_crawl(url='https://www.inven.co.kr/board/webzine/2097', delay=2, min_views=2000, max_pages=5, max_consecutive_not_today=3):
+def inven_board_crawl(url='https://www.inven.co.kr/board/webzine/2097', min_views=2000, max_pages=5, max_consecutive_not_today=3):
     today = datetime.now().date()
     data = []
+    seen_store = SeenStore("10")  # 이전 실행에서 수집한 게시글 상태 (링크 기준)
+    sink = RecordSink.for_script(__file__)  # 수집 완료한 게시글을 바로 기록 (중단되어도 남음)
+    checkpoint = Checkpoint.for_script(__file__)  # 중단되면 다음 실행에서 끝낸 게시글은 건너뛰고 이어서 수집
+    # 중단된 이전 실행이 기록해 두고 DB에 넣지 못한 게시글
+    for post in checkpoint.previous_records():
+        data.append(post)
+        sink.write(post)
     
     page = 1
     consecutive_empty_pages = 0  # 연속 빈 페이지 카운터
     max_consecutive_empty = 3  # 연속 빈 페이지 제한
     consecutive_not_today_posts = 0  # 오늘 날짜가 아닌 게시글 연속 카운터
 
-    print(f"\n[크롤링 시작] 오늘 날짜: {today}, 최소 조회수: {min_views}")
-    print(f"[설정] 연속 오늘 날짜 아닌 게시글 제한: {max_consecutive_not_today}개")
+    log.info(f"[크롤링 시작] 오늘 날짜: {today}, 최소 조회수: {min_views}")
+    log.info(f"[설정] 연속 오늘 날짜 아닌 게시글 제한: {max_consecutive_not_today}개")
 
     while page <= max_pages:
         page_url = f"{url}?p={page}"
-        print(f"\n[페이지 접근] 페이지 {page}: {page_url}")
+        log.debug(f"[페이지 접근] 페이지 {page}: {page_url}")
 
         try:
             headers = get_headers()
-            response = requests.get(page_url, headers=headers, timeout=10)
+            response = fetch(page_url, headers=headers)
             response.raise_for_status()
             response.encoding = 'utf-8'
-            soup = Soup(response.text, 'html.parser')
-            print(f"[페이지 로드 성공] 상태 코드: {response.status_code}")
+            soup = parse_html(response.text, response.url)
+            log.debug(f"[페이지 로드 성공] 상태 코드: {response.status_code}")
             
             # 게시판 테이블 찾기
             board_table = soup.find('table', class_='board_list')
             if not board_table:
-                print("[게시판 테이블 없음] 다른 선택자로 시도합니다.")
+                log.debug("[게시판 테이블 없음] 다른 선택자로 시도합니다.")
                 board_table = soup.find('table')
                 
             tbody = board_table.find('tbody') if board_table else None
             
             if not tbody:
-                print("[HTML 구조 확인] 테이블 구조 출력:")
+                log.debug("[HTML 구조 확인] 테이블 구조 출력:")
                 if board_table:
-                    print(board_table.prettify()[:500])
+                    log.debug("%s", board_table.prettify()[:500])
                 else:
-                    print(soup.prettify()[:500])
+                    log.debug("%s", soup.prettify()[:500])
                     
                 consecutive_empty_pages += 1
-                print(f"[빈 페이지 발견] 연속 빈 페이지 수: {consecutive_empty_pages}/{max_consecutive_empty}")
+                log.debug(f"[빈 페이지 발견] 연속 빈 페이지 수: {consecutive_empty_pages}/{max_consecutive_empty}")
                 if consecutive_empty_pages >= max_consecutive_empty:
-                    print("[크롤링 종료] 빈 페이지가 연속으로 발생했습니다.")
+                    log.info("[크롤링 종료] 빈 페이지가 연속으로 발생했습니다.")
                     break
                 page += 1
                 continue
@@ -150,34 +170,35 @@ def inven_board_crawl(url='https://www.inven.co.kr/board/webzine/2097', delay=2,
             consecutive_empty_pages = 0  # 빈 페이지 카운터 초기화
             
             all_posts = tbody.find_all('tr')
-            print(f"[게시글 목록] 발견된 총 게시글 수: {len(all_posts)}개")
+            log.debug(f"[게시글 목록] 발견된 총 게시글 수: {len(all_posts)}개")
             
+            candidates = []
             for post in all_posts:
                 # 공지사항 제외
                 if post.get('class') and ('notice' in post.get('class') or 'notice_pop' in post.get('class')):
-                    print("[공지사항 제외]")
+                    log.debug("[공지사항 제외]")
                     continue
                 
                 # 조회수 확인
                 views_elem = post.find('td', class_='hit') or post.find('td', class_='view')
                 if not views_elem:
-                    print("[조회수 요소 없음]")
+                    log.debug("[조회수 요소 없음]")
                     continue
                     
                 views_text = views_elem.text.strip().replace(',', '')
                 if not views_text.isdigit():
-                    print(f"[조회수 형식 오류] {views_text}")
+                    log.warning(f"[조회수 형식 오류] {views_text}")
                     continue
                 
                 views = int(views_text)
                 if views < min_views:
-                    print(f"[조회수 미달] {views} < {min_views}")
+                    log.debug(f"[조회수 미달] {views} < {min_views}")
                     continue
                 
                 # 제목 및 링크
                 title_elem = post.find('a', class_='subject-link') or post.find('td', class_='tit').find('a')
                 if not title_elem or not title_elem.get('href'):
-                    print("[제목 요소 없음]")
+                    log.debug("[제목 요소 없음]")
                     continue
                 
                 title = title_elem.text.strip()
@@ -185,31 +206,46 @@ def inven_board_crawl(url='https://www.inven.co.kr/board/webzine/2097', delay=2,
                 if not link.startswith('http'):
                     link = f"https://www.inven.co.kr{link}"
                 
-                print(f"[게시글 발견] 제목: {title}, 조회수: {views}")
-                
-                # 게시글 내용 및 실제 날짜 확인
-                content_data = get_post_content(link, delay=delay)
+                log.debug(f"[게시글 발견] 제목: {title}, 조회수: {views}")
                 
+                candidates.append((post, title, link, views))
+            
+            # 이전 실행 이후 조회수가 바뀌지 않은 게시글은 상세 수집 생략 (날짜는 상세 페이지에서만 확인 가능하므로 목록 탐색 종료 조건은 그대로 둠)
+            changed = [candidate for candidate in candidates if not seen_store.is_unchanged(candidate[2], candidate[3])]
+            crawler = metrics.current_crawler()
+            metrics.inc("crawler_posts_found_total", len(candidates), crawler=crawler)
+            metrics.inc("crawler_posts_unchanged_total", len(candidates) - len(changed), crawler=crawler)
+            if len(changed) < len(candidates):
+                log.info(f"[증분 수집] 변화 없는 게시글 {len(candidates) - len(changed)}개 상세 수집 건너뜀")
+            candidates = changed
+            candidates = checkpoint.remaining(candidates, key=lambda candidate: candidate[2])
+            checkpoint.save(page, [candidate[2] for candidate in candidates])
+
+            # 게시글 내용 및 실제 날짜 병렬 확인 (목록 순서 유지)
+            contents = checkpoint.fetch_contents(get_post_content, [candidate[2] for candidate in candidates])
+            for (post, title, link, views), content_data in zip(candidates, contents):
                 # 실제 날짜가 오늘인지 확인
                 actual_date = content_data['actual_date']
                 if not actual_date:
-                    print(f"[날짜 확인 불가] 게시글: {title}")
+                    log.debug(f"[날짜 확인 불가] 게시글: {title}")
                     consecutive_not_today_posts += 1
-                    print(f"[연속 오늘 아닌 게시글] {consecutive_not_today_posts}/{max_consecutive_not_today}")
+                    log.debug(f"[연속 오늘 아닌 게시글] {consecutive_not_today_posts}/{max_consecutive_not_today}")
                     
                     if consecutive_not_today_posts >= max_consecutive_not_today:
-                        print(f"[크롤링 종료] 연속 {max_consecutive_not_today}개의 오늘 날짜 아닌 게시글 발견")
+                        log.info(f"[크롤링 종료] 연속 {max_consecutive_not_today}개의 오늘 날짜 아닌 게시글 발견")
                         break
+                    checkpoint.done(link, content_data)
                     continue
                 
                 if actual_date.date() != today:
-                    print(f"[오늘 날짜 아님] 게시글 날짜: {actual_date.date()}, 오늘 날짜: {today}")
+                    log.debug(f"[오늘 날짜 아님] 게시글 날짜: {actual_date.date()}, 오늘 날짜: {today}")
                     consecutive_not_today_posts += 1
-                    print(f"[연속 오늘 아닌 게시글] {consecutive_not_today_posts}/{max_consecutive_not_today}")
+                    log.debug(f"[연속 오늘 아닌 게시글] {consecutive_not_today_posts}/{max_consecutive_not_today}")
                     
                     if consecutive_not_today_posts >= max_consecutive_not_today:
-                        print(f"[크롤링 종료] 연속 {max_consecutive_not_today}개의 오늘 날짜 아닌 게시글 발견")
+                        log.info(f"[크롤링 종료] 연속 {max_consecutive_not_today}개의 오늘 날짜 아닌 게시글 발견")
                         break
+                    checkpoint.done(link, content_data)
                     continue
                 
                 # 오늘 날짜 게시글 처리
@@ -248,42 +284,48 @@ def inven_board_crawl(url='https://www.inven.co.kr/board/webzine/2097', delay=2,
                     'Content': content_data['text'],
                     'Images': content_data['images'],
                 })
-                print(f"[게시글 추가됨] 제목: {title}, 조회수: {views}, 날짜: {actual_date}")
+                sink.write(data[-1])
+                checkpoint.done(link, content_data)
+                log.debug(f"[게시글 추가됨] 제목: {title}, 조회수: {views}, 날짜: {actual_date}")
+                if not is_failed_content(content_data["text"]):
+                    seen_store.mark_seen(link, views, content=content_data["text"])
             
             # 연속 오늘 날짜 아닌 게시글 제한 초과 확인
             if consecutive_not_today_posts >= max_consecutive_not_today:
                 break
             
             page += 1
-            time.sleep(random.uniform(3, 7))
         
         except Exception as e:
             consecutive_empty_pages += 1
-            print(f"[페이지 로드 오류] 페이지 {page}: {str(e)}")
+            log.warning(f"[페이지 로드 오류] 페이지 {page}: {str(e)}")
             if consecutive_empty_pages >= max_consecutive_empty:
-                print("[크롤링 종료] 빈 페이지가 연속으로 발생했습니다.")
+                log.info("[크롤링 종료] 빈 페이지가 연속으로 발생했습니다.")
                 break
-            time.sleep(random.uniform(3, 7))
     
-    print(f"\n[크롤링 완료] 총 수집된 게시글: {len(data)}개")
+    sink.close()
+    checkpoint.clear()
+    checkpoint.close()
+    log.info(f"[크롤링 완료] 총 수집된 게시글: {len(data)}개")
     
     df = pd.DataFrame(data)
     return df
 
-if __name__ == '__main__':
-    inven_url = 'https://www.inven.co.kr/board/webzine/2097'
-    
-    df = inven_board_crawl(
-        url=inven_url, 
-        delay=2, 
+def run():
+    """스케줄러 수집 설정으로 크롤링 실행 (DataFrame 또는 None 반환)"""
+    return inven_board_crawl(
+        url='https://www.inven.co.kr/board/webzine/2097', 
         min_views=2000, 
         max_pages=5,
         max_consecutive_not_today=3  # 오늘 날짜가 아닌 게시글이 연속 3개 이상이면 종료
     )
+
+if __name__ == '__main__':
+    df = run()
     
     if df is not None and not df.empty:
         available_cols = [col for col in ["Post_ID", "Category", "Title", "Writer", "Date", "Views", "Recommend", "Content", "Images"] if col in df.columns]
-        print(df[available_cols])
+        log.info("수집 데이터 미리보기:\n%s", df[available_cols])
         today_str = datetime.now().strftime('%Y%m%d')
         
         save_path = f'/code/data/{today_str}/inven_openissue_{today_str}.csv'
@@ -292,4 +334,4 @@ if __name__ == '__main__':
         
         df.to_csv(save_path, index=False, encoding='utf-8-sig')
         
-        print(f"[크롤링 완료] 데이터 저장 경로: {save_path}")
+        log.info(f"[크롤링 완료] 데이터 저장 경로: {save_path}")
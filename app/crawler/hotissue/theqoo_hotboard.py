@@ -1,11 +1,23 @@
-import requests
-from bs4 import BeautifulSoup as Soup
 import pandas as pd
 from datetime import datetime
-import time
 import random
 import os
 import re
+import sys
+
+# 공용 모듈 경로 추가 (app/crawler)
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common.http_client import fetch
+from common.parser import parse_html
+from common.seen_store import SeenStore
+from common.record_sink import RecordSink
+from common.checkpoint import Checkpoint
+from common.crawl_log import get_logger
+
+log = get_logger("theqoo_hotboard", community="2")
+
+# 스케줄러 등록 정보 (common.registry가 import 없이 읽음)
+CRAWLER_INFO = {"community": "2", "host": "theqoo.net", "priority": 2, "interval": 180, "deadline": 60}
 
 # 헤더 설정 함수
 def get_headers():
@@ -28,15 +40,15 @@ def get_headers():
 def get_post_content(post_url):
     try:
         headers = get_headers()
-        response = requests.get(post_url, headers=headers, timeout=10)
+        response = fetch(post_url, headers=headers)
         response.raise_for_status()
         response.encoding = 'utf-8'
-        soup = Soup(response.text, "html.parser")
+        soup = parse_html(response.text, response.url)
 
         content_div = soup.find("div", class_="rd_body clear") or soup.find("article", itemprop="articleBody")
         if not content_div:
-            print(f"내용 영역을 찾을 수 없습니다: {post_url}")
-            return {"text": "", "images": []}
+            log.warning(f"내용 영역을 찾을 수 없습니다: {post_url}")
+            return {"text": "", "images": [], "failed": True}
 
         text_content = content_div.get_text(separator="\n", strip=True)
 
@@ -50,93 +62,101 @@ def get_post_content(post_url):
 
         return {"text": text_content, "images": image_urls}
     except Exception as e:
-        print(f"게시글 크롤링 실패: {post_url} - {e}")
-        return {"text": "", "images": []}
+        log.warning(f"게시글 크롤링 실패: {post_url} - {e}")
+        return {"text": "", "images": [], "failed": True}
 
 # 더쿠 핫 게시판 크롤링 메인 함수
 def theqoo_hotboard_crawl(min_views=10000, max_page=3):
     base_url = 'https://theqoo.net/hot?filter_mode=normal'
     today = datetime.now().date()
     data = []
+    seen_store = SeenStore("2")  # 이전 실행에서 수집한 게시글 상태
+    sink = RecordSink.for_script(__file__)  # 수집 완료한 게시글을 바로 기록 (중단되어도 남음)
+    checkpoint = Checkpoint.for_script(__file__)  # 중단되면 다음 실행에서 끝낸 게시글은 건너뛰고 이어서 수집
+    # 중단된 이전 실행이 기록해 두고 DB에 넣지 못한 게시글
+    for post in checkpoint.previous_records():
+        data.append(post)
+        sink.write(post)
 
     for page in range(1, max_page + 1):
         page_url = f"{base_url}&page={page}"
-        print(f"페이지 {page} 크롤링 중: {page_url}")
+        log.debug(f"페이지 {page} 크롤링 중: {page_url}")
 
         try:
             headers = get_headers()
-            response = requests.get(page_url, headers=headers, timeout=10)
+            response = fetch(page_url, headers=headers)
             response.raise_for_status()
             response.encoding = 'utf-8'
-            soup = Soup(response.text, "html.parser")
+            soup = parse_html(response.text, response.url)
 
             # 디버깅: HTML 일부 출력
-            print(f"페이지 HTML (처음 1000자): {soup.prettify()[:1000]}")
+            log.debug(f"페이지 HTML (처음 1000자): {soup.prettify()[:1000]}")
 
             # 테이블 찾기
             board_table = soup.find("table", class_="bd_lst bd_tb_lst bd_tb theqoo_board_table")
             if not board_table:
-                print("게시판 테이블을 찾을 수 없습니다.")
+                log.warning("게시판 테이블을 찾을 수 없습니다.")
                 continue
 
             # tbody 찾기
             tbody = board_table.find("tbody", class_="hide_notice")
             if not tbody:
-                print("tbody를 찾을 수 없습니다.")
+                log.warning("tbody를 찾을 수 없습니다.")
                 continue
 
             # 모든 <tr> 요소 가져오기
             posts = tbody.find_all("tr")
-            print(f"페이지 {page}에서 찾은 게시글 수: {len(posts)}")
+            log.debug(f"페이지 {page}에서 찾은 게시글 수: {len(posts)}")
 
+            page_posts = []
             for post in posts:
                 # 공지사항 필터링
                 post_classes = post.get("class", [])
                 if "notice" in post_classes or "nofn" in post_classes:
-                    print(f"공지사항 제외: {post.get_text(strip=True)[:50]}...")
+                    log.debug(f"공지사항 제외: {post.get_text(strip=True)[:50]}...")
                     continue
 
                 # 날짜
                 date_elem = post.find("td", class_="time")
                 date_str = date_elem.text.strip() if date_elem else ""
-                print(f"게시글 날짜: {date_str}")
+                log.debug(f"게시글 날짜: {date_str}")
                 if ":" not in date_str:
-                    print(f"오늘 날짜 아님, 제외됨: {date_str}")
+                    log.debug(f"오늘 날짜 아님, 제외됨: {date_str}")
                     continue
 
                 # 조회수
                 views_elem = post.find("td", class_="m_no")
                 views_text = views_elem.text.strip().replace(',', '') if views_elem else "0"
                 views = int(views_text) if views_text.isdigit() else 0
-                print(f"게시글 조회수: {views}")
+                log.debug(f"게시글 조회수: {views}")
                 if views < min_views:
-                    print(f"조회수 {views} < {min_views}, 제외됨")
+                    log.debug(f"조회수 {views} < {min_views}, 제외됨")
                     continue
 
                 # 제목과 링크
                 title_td = post.find("td", class_="title")
                 if not title_td:
-                    print("제목 td 요소를 찾을 수 없음, 제외됨")
+                    log.warning("제목 td 요소를 찾을 수 없음, 제외됨")
                     continue
                 title_elem = title_td.find("a")  # 첫 번째 <a> 태그 찾기
                 if not title_elem:
-                    print("제목 a 요소를 찾을 수 없음, 제외됨")
+                    log.warning("제목 a 요소를 찾을 수 없음, 제외됨")
                     continue
                 title = title_elem.text.strip()
                 link = title_elem["href"]
                 if not link.startswith('http'):
                     link = f"https://theqoo.net{link}"
-                print(f"게시글 제목: {title}, 링크: {link}")
+                log.debug(f"게시글 제목: {title}, 링크: {link}")
 
                 # 게시글 ID
                 post_elem = post.find("td", class_="no")
                 post_id = post_elem.text.strip() if post_elem else ""
-                print(f"게시글 ID: {post_id}")
+                log.debug(f"게시글 ID: {post_id}")
 
                 # 카테고리
                 category_elem = post.find("td", class_="cate")
                 category = category_elem.text.strip() if category_elem else ""
-                print(f"게시글 카테고리: {category}")
+                log.debug(f"게시글 카테고리: {category}")
 
                 # 작성자
                 writer = "무명의 더쿠"
@@ -144,12 +164,9 @@ def theqoo_hotboard_crawl(min_views=10000, max_page=3):
                 # 댓글 수
                 reply_elem = post.find("a", class_="replyNum")
                 reply_count = int(reply_elem.text.strip()) if reply_elem and reply_elem.text.strip().isdigit() else 0
-                print(f"게시글 댓글 수: {reply_count}")
+                log.debug(f"게시글 댓글 수: {reply_count}")
 
-                # 게시글 내용 크롤링
-                content_data = get_post_content(link)
-
-                data.append({
+                page_posts.append({
                     "Post ID": post_id,
                     "Community": "2",
                     "Category": category,
@@ -158,23 +175,48 @@ def theqoo_hotboard_crawl(min_views=10000, max_page=3):
                     "Writer": writer,
                     "Date": f"{today} {date_str}",
                     "Recommend": reply_count,
-                    "Views": str(views),
-                    "Content": content_data["text"],
-                    "Images": content_data["images"]
+                    "Views": str(views)
                 })
 
-                print(f"게시물 수집 완료: {title} (ID: {post_id})")
+            page_posts = checkpoint.remaining(page_posts)
+            # 이전 실행 이후 조회수/추천수가 바뀌지 않은 게시글은 상세 수집 생략
+            reached_seen = seen_store.reached_seen_territory([seen_store.post_key(post) for post in page_posts])
+            page_posts = seen_store.filter_changed(page_posts)
+            checkpoint.save(page, [post["Link"] for post in page_posts])
+
+            # 게시글 내용 병렬 수집 (목록 순서 유지)
+            kept_posts = []
+            contents = checkpoint.fetch_contents(get_post_content, [post["Link"] for post in page_posts])
+            for post, content_data in zip(page_posts, contents):
+                post["Content"] = content_data["text"]
+                post["Images"] = content_data["images"]
+                data.append(post)
+                sink.write(post)
+                checkpoint.done(post["Link"], content_data)
+                kept_posts.append(post)
+                log.debug(f"게시물 수집 완료: {post['Title']} (ID: {post['Post ID']})")
+            seen_store.mark_posts_seen(kept_posts)
+
+            if reached_seen:
+                log.info("이전 실행에서 수집한 구간에 도달하여 크롤링을 종료합니다.")
+                break
 
-            time.sleep(random.uniform(5, 10))  # 요청 간격 늘림
 
         except Exception as e:
-            print(f"페이지 로드 오류: {e}")
+            log.warning(f"페이지 로드 오류: {e}")
             continue
 
+    sink.close()
+    checkpoint.clear()
+    checkpoint.close()
     df = pd.DataFrame(data)
-    print(f"총 수집된 게시글 수: {len(data)}")
+    log.info(f"총 수집된 게시글 수: {len(data)}")
     return df if not df.empty else None
 
+def run():
+    """스케줄러 수집 설정으로 크롤링 실행 (DataFrame 또는 None 반환)"""
+    return theqoo_hotboard_crawl(min_views=7000, max_page=3)
+
 # 메인 실행부
 if __name__ == "__main__":
     base_data_folder = os.path.join('/code/data')
@@ -184,17 +226,17 @@ if __name__ == "__main__":
     if not os.path.exists(today_folder):
         try:
             os.makedirs(today_folder, exist_ok=True)
-            print(f"'{today_folder}' 폴더를 생성했습니다.")
+            log.info(f"'{today_folder}' 폴더를 생성했습니다.")
         except Exception as e:
-            print(f"폴더 생성 중 오류 발생: {e}")
+            log.warning(f"폴더 생성 중 오류 발생: {e}")
     
-    df = theqoo_hotboard_crawl(min_views=7000, max_page=3)
+    df = run()
     if df is not None:
         available_cols = [col for col in ["Post ID", "Category", "Title", "Writer", "Date", "Views", "Recommend", "Content", "Images"] if col in df.columns]
-        print(df[available_cols])
+        log.info("수집 데이터 미리보기:\n%s", df[available_cols])
         file_name = f"theqoo_hotboard_{today}.csv"
         file_path = os.path.join(today_folder, file_name)
         df.to_csv(file_path, index=False, encoding="utf-8-sig")
-        print(f"데이터가 '{file_path}' 파일로 저장되었습니다.")
+        log.info(f"데이터가 '{file_path}' 파일로 저장되었습니다.")
     else:
-        print("크롤링된 데이터가 없습니다.")
\ No newline at end of file
+        log.info("크롤링된 데이터가 없습니다.")
\ No newline at end of file
@@ -1,237 +1,65 @@
-import pandas as pd
 from datetime import datetime
-import time
-import requests
-from bs4 import BeautifulSoup as Soup
-import random
 import html
 import os
+import sys
 
-# 헤더 설정
-def get_headers():
-    user_agents = [
-        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36",
-        "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/14.0 Safari/605.1.15",
-        "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/88.0.4324.96 Safari/537.36"
-    ]
-    return {
-        "User-Agent": random.choice(user_agents),
-        "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
-        "Accept-Language": "ko-KR,ko;q=0.8,en-US;q=0.5,en;q=0.3",
-        "Connection": "keep-alive",
-        "Upgrade-Insecure-Requests": "1"
-    }
+# 공용 모듈 경로 추가 (app/crawler)
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common import crawl_engine
+from common.site_spec import Field, SiteSpec
+from common.crawl_log import get_logger
 
-# 유효한 URL 확인
-def is_valid_post_url(url):
-    if not url or "javascript:" in url:
-        return False
-    return url.startswith("http")
+log = get_logger("mlbpark_politics", community="9p")
 
-# 게시글 내용 크롤링 (BeautifulSoup만 사용)
-def get_post_content(post_url, delay=5):
-    if not is_valid_post_url(post_url):
-        print(f"유효하지 않은 URL 건너뜀: {post_url}")
-        return {"text": "유효하지 않은 URL", "images": [], "recommend": "0"}
+# 스케줄러 등록 정보 (common.registry가 import 없이 읽음)
+CRAWLER_INFO = {"community": "9p", "host": "mlbpark.donga.com", "priority": 1}
 
-    try:
-        headers = get_headers()
-        response = requests.get(post_url, headers=headers, timeout=10)
-        response.encoding = 'utf-8'
-        soup = Soup(response.text, "html.parser")
-        print(f"크롤링 중: {post_url}")
-    except Exception as e:
-        print(f"게시글 페이지 로드 오류: {post_url} - {str(e)}")
-        return {"text": f"로드 오류: {str(e)}", "images": [], "recommend": "0"}
+# 정치 검색 결과 목록 URL
+LIST_URL = "https://mlbpark.donga.com/mp/b.php?m=search&b=bullpen&query=%EC%A0%95%EC%B9%98&select=spf&subquery=&subselect=&user="
 
-    # 추천수 추출
-    recommend_elem = soup.find("span", {"id": "likeCnt"})
-    recommend = recommend_elem.text if recommend_elem else "0"
+# 게시판 수집 설정 (목록: table.tbl_type01의 tr, 본문: div.view_context의 div.ar_txt, 추천수는 상세 페이지에서)
+SPEC = SiteSpec(
+    __file__,
+    community="9p",
+    list_url=LIST_URL,
+    page_url=lambda url, page: f"{url}&p={(page - 1) * 30 + 1}",  # 1페이지: p=1, 2페이지: p=31, 3페이지: p=61...
+    max_pages=None,  # 오늘 글이 없는 페이지가 이어질 때까지
+    row_selector="table.tbl_type01 tr:not(.notice)",
+    fields={
+        "Post ID": Field("td.t_left[id]", attr="id"),
+        "Category": Field("span.category", default="정치"),
+        "Title": Field("div.tit a", convert=html.unescape, default=None),
+        "Link": Field("div.tit a", attr="href", default=None),
+        "Writer": Field("span.nick", convert=html.unescape),
+        "Date": Field("span.date", default=None),  # 오늘 글은 "14:36:47", 이전 글은 "2025-03-17"
+        "Views": Field("span.viewV", convert="int", default=None),
+    },
+    constants={"Recommend": "0"},
+    date_formats=("%H:%M:%S", "%Y-%m-%d"),
+    today_only=True,
+    stop_after_empty_pages=3,
+    detail_fields={"Recommend": Field("span#likeCnt", default="0")},
+    content_selectors=("div.view_context",),
+    text_selector="div.ar_txt",
+    text_separator="\n",
+    # 광고 이미지 제외
+    image_exclude='img[src*="yellow.contentsfeed.com"], div[style="background:#f8f7f7;"] img',
+    drop_failed=True,
+)
 
-    # 게시글 내용 추출
-    content_div = soup.find("div", class_="view_context")
-    if not content_div:
-        print(f"내용 영역을 찾을 수 없습니다: {post_url}")
-        return {"text": "내용을 찾을 수 없습니다.", "images": [], "recommend": recommend}
 
-    text_content = content_div.find("div", class_="ar_txt").get_text(separator="\n", strip=True)
-    print(f"추출된 텍스트 (처음 100자): {text_content[:100]}")
+# 게시글 내용 크롤링 (추천수 포함)
+def get_post_content(post_url):
+    return crawl_engine.get_post_content(post_url, SPEC)
 
-    # 이미지 URL 추출 (광고 및 yellow.contentsfeed.com 제외)
-    image_urls = []
-    for img in content_div.find_all("img"):
-        src = img.get("src")
-        if src and "yellow.contentsfeed.com" not in src:
-            # 광고 div 내부의 이미지 제외
-            if not img.find_parent("div", style="background:#f8f7f7;"):
-                image_urls.append(src)
-    
-    image_urls = ["https:" + url if url.startswith("//") else url for url in image_urls]
-    print(f"추출된 이미지 URL: {len(image_urls)}개")
-
-    time.sleep(delay)
-    return {"text": text_content, "images": image_urls, "recommend": recommend}
-
-def clean_text(text):
-    """텍스트 내의 불필요한 공백과 특수 문자를 제거합니다."""
-    text = text.strip()
-    text = html.unescape(text)  # HTML 엔티티 디코딩
-    return text
-
-def get_next_page_url(page_num):
-    # 정치 게시판 URL 구조
-    base_url = "https://mlbpark.donga.com/mp/b.php?m=search&b=bullpen&query=%EC%A0%95%EC%B9%98&select=spf&subquery=&subselect=&user="
-    # 페이지 번호 계산 (1페이지: p=1, 2페이지: p=31, 3페이지: p=61...)
-    p_value = (page_num - 1) * 30 + 1
-    next_url = f"{base_url}&p={p_value}"
-    return next_url
-
-def mlbpark_politics_crawl(url: str = 'https://mlbpark.donga.com/mp/b.php?m=search&b=bullpen&query=%EC%A0%95%EC%B9%98&select=spf&subquery=&subselect=&user=',
-                        delay: int = 5,
-                        min_views: int = 300):  # 조회수 300 이상으로 설정
-    today = datetime.now().date()
-    data = []
-    
-    # 중복 체크를 위한 집합
-    post_ids_set = set()
-    post_links_set = set()
-    
-    # 오늘 날짜 게시물을 찾지 못한 연속 페이지 수
-    consecutive_empty_pages = 0
-    max_consecutive_empty = 3  # 연속 3페이지 동안 오늘 게시글 없으면 종료
-    
-    # 페이지 번호 (1부터 시작)
-    page_num = 1
-    
-    while True:
-        page_url = get_next_page_url(page_num)
-        print(f"페이지 {page_num} 크롤링 중 (p={(page_num-1)*30+1}): {page_url}")
-        
-        try:
-            headers = get_headers()
-            response = requests.get(page_url, headers=headers, timeout=10)
-            response.encoding = 'utf-8'
-            soup = Soup(response.text, "html.parser")
-            print(f"목록 페이지 로드 완료: {page_url}")
-        except Exception as e:
-            print(f"페이지 로드 오류: {str(e)}")
-            break
 
-        board = soup.find("table", class_="tbl_type01")
-        if not board:
-            print("게시판 데이터를 찾을 수 없습니다.")
-            break
-            
-        today_posts_found = False
-        
-        for post in board.find_all("tr"):
-            if "notice" in post.get("class", []):
-                continue
-            
-            try:
-                # 날짜 확인
-                date_elem = post.find("span", class_="date")
-                if not date_elem:
-                    continue
-                
-                date_str = date_elem.text.strip()
-                
-                # 오늘 날짜 게시물만 처리 (HH:MM:SS 형식)
-                if ":" in date_str:
-                    today_posts_found = True
-                    
-                    # 조회수 확인
-                    views_elem = post.find("span", class_="viewV")
-                    if not views_elem or not views_elem.text.strip().isdigit():
-                        continue
-                    
-                    views = int(views_elem.text.strip())
-                    if views < min_views:
-                        continue  # 최소 조회수보다 작으면 제외
-                    
-                    # 게시물 정보 추출
-                    title_elem = post.find("div", class_="tit")
-                    if not title_elem or not title_elem.find("a"):
-                        continue
-                    
-                    title_a = title_elem.find("a")
-                    title = clean_text(title_a.text)
-                    link = title_a["href"]
-                    
-                    # 중복 체크
-                    if link in post_links_set:
-                        print(f"중복된 링크 건너뜀: {link}")
-                        continue
-                    
-                    post_id_elem = post.find("td", class_="t_left")
-                    if not post_id_elem:
-                        continue
-                    
-                    post_id = post_id_elem['id'] if post_id_elem.has_attr('id') else "N/A"
-                    
-                    if post_id in post_ids_set and post_id != "N/A":
-                        print(f"중복된 Post ID 건너뜀: {post_id}")
-                        continue
-                    
-                    writer_elem = post.find("span", class_="nick")
-                    writer = clean_text(writer_elem.text) if writer_elem else "N/A"
-                    
-                    post_date = datetime.strptime(f"{today.strftime('%Y-%m-%d')} {date_str}", "%Y-%m-%d %H:%M:%S")
-                    
-                    print(f"조회수 {views}의 게시물 발견: {title}")
-                    
-                    # 카테고리 추가 (없으면 "정치")
-                    category_elem = post.find("span", class_="category")
-                    category = category_elem.text.strip() if category_elem else "정치"
-                    
-                    # 게시글 내용 크롤링
-                    content_data = get_post_content(link, delay=delay)
-                    if content_data["text"] not in ["내용을 찾을 수 없습니다.", "유효하지 않은 URL"] and not content_data["text"].startswith("로드 오류"):
-                        post_ids_set.add(post_id)
-                        post_links_set.add(link)
-                        
-                        data.append({
-                            "Post ID": post_id,
-                            "Community": "9p",
-                            "Category": category,
-                            "Title": title,
-                            "Link": link,
-                            "Writer": writer,
-                            "Date": post_date,
-                            "Recommend": content_data["recommend"],
-                            "Views": views,
-                            "Content": content_data["text"],
-                            "Images": content_data["images"]
-                        })
-                    else:
-                        print(f"게시글 내용 추출 실패, 제외됨: {link}")
-                    
-                    time.sleep(random.uniform(1, 3))
-                    
-            except Exception as e:
-                print(f"데이터 추출 중 오류 발생: {e}")
-                continue
-        
-        print(f"페이지 {page_num} 처리 완료")
-        
-        # 오늘 날짜 게시물이 없으면 카운터 증가
-        if not today_posts_found:
-            consecutive_empty_pages += 1
-            print(f"페이지 {page_num}에서 오늘 날짜 게시글을 찾을 수 없습니다. ({consecutive_empty_pages}/{max_consecutive_empty})")
-            if consecutive_empty_pages >= max_consecutive_empty:
-                print(f"연속 {max_consecutive_empty}페이지 동안 오늘 날짜 게시글을 찾을 수 없어 크롤링을 종료합니다.")
-                break
-        else:
-            consecutive_empty_pages = 0  # 오늘 날짜 게시물 찾으면 카운터 초기화
-        
-        page_num += 1
-        time.sleep(random.uniform(2, 5))
+def mlbpark_politics_crawl(url: str = LIST_URL,
+                           min_views: int = 300):  # 조회수 300 이상으로 설정
+    return crawl_engine.crawl(SPEC, list_url=url, min_views=min_views)
 
-    if data:
-        df = pd.DataFrame(data)
-        df = df.sort_values(by="Date", ascending=False)
-        return df
-    return None
+def run():
+    """스케줄러 수집 설정으로 크롤링 실행 (DataFrame 또는 None 반환)"""
+    return mlbpark_politics_crawl(min_views=500)  # 조회수 300 이상으로 설정
 
 if __name__ == "__main__":
     # 오늘 날짜 폴더 경로 설정
@@ -243,17 +71,17 @@ if __name__ == "__main__":
     if not os.path.exists(today_folder):
         try:
             os.makedirs(today_folder, exist_ok=True)
-            print(f"'{today_folder}' 폴더를 생성했습니다.")
+            log.info(f"'{today_folder}' 폴더를 생성했습니다.")
         except Exception as e:
-            print(f"폴더 생성 중 오류 발생: {e}")
+            log.warning(f"폴더 생성 중 오류 발생: {e}")
     
-    df = mlbpark_politics_crawl(delay=5, min_views=500)  # 조회수 300 이상으로 설정
+    df = run()
     if df is not None:
         available_cols = [col for col in ["Post ID", "Category", "Title", "Writer", "Date", "Views", "Recommend", "Content", "Images"] if col in df.columns]
-        print(df[available_cols])
+        log.info("수집 데이터 미리보기:\n%s", df[available_cols])
         
         # 오늘 날짜 폴더에 CSV 파일 저장
         file_name = f"mlbpark_politics_{today}.csv"
         file_path = os.path.join(today_folder, file_name)
         df.to_csv(file_path, index=False, encoding="utf-8-sig")
-        print(f"데이터가 '{file_path}' 파일로 저장되었습니다.")
+        log.info(f"데이터가 '{file_path}' 파일로 저장되었습니다.")
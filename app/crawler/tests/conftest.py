@@ -0,0 +1,61 @@
+import os
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+# 크롤러 모듈은 app/crawler 기준으로 import (common.*)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+class ScriptedServer:
+    """경로별로 정해 둔 응답 (상태 코드, 헤더, 본문)을 차례로 돌려주는 로컬 HTTP 서버 (마지막 응답은 반복)"""
+
+    def __init__(self):
+        self.responses = {}
+        self.requests = []
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                server.requests.append((self.path, dict(self.headers)))
+                script = server.responses.get(self.path) or [(404, {}, b"")]
+                status, headers, body = script.pop(0) if len(script) > 1 else script[0]
+                self.send_response(status)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+
+    def url(self, path):
+        return f"http://127.0.0.1:{self.httpd.server_address[1]}{path}"
+
+    def script(self, path, *responses):
+        self.responses[path] = [(status, headers, body.encode("utf-8") if isinstance(body, str) else body)
+                                for status, headers, body in responses]
+
+    def close(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+@pytest.fixture
+def scripted_server(monkeypatch):
+    """fetch()가 요청할 로컬 서버 (요청 간격 제한 / 재시도 대기 / HTTP 캐시 / 카세트 없이)"""
+    from common import backoff, http_cache, rate_limiter
+
+    monkeypatch.setitem(rate_limiter.SITE_RATE_LIMITS, "127.0.0.1", {"rate": 1000.0, "burst": 100, "jitter": 0.0})
+    monkeypatch.setattr(rate_limiter, "_limiters", {})
+    monkeypatch.setattr(backoff.time, "sleep", lambda seconds: None)
+    monkeypatch.setattr(http_cache, "HTTP_CACHE_ENABLED", False)
+    server = ScriptedServer()
+    yield server
+    server.close()
@@ -0,0 +1,52 @@
+import threading
+import time
+
+from common import async_fetch
+from common.async_fetch import fetch_post_contents
+
+
+def test_results_keep_input_order_and_failures_stay_in_place():
+    def get_post_content(url):
+        if url.endswith("/3"):
+            raise ValueError("boom")
+        time.sleep(0.01 if url.endswith("/0") else 0)
+        return {"text": url}
+
+    urls = [f"https://a.example.com/{index}" for index in range(6)]
+    results = fetch_post_contents(get_post_content, urls)
+    assert [result["text"] for result in results[:3]] == urls[:3]
+    assert results[3]["text"].startswith("로드 오류")
+    assert [result["text"] for result in results[4:]] == urls[4:]
+
+
+def test_concurrency_is_limited_per_host():
+    lock = threading.Lock()
+    active = {}
+    peak = {}
+
+    def get_post_content(url):
+        host = url.split("/")[2]
+        with lock:
+            active[host] = active.get(host, 0) + 1
+            peak[host] = max(peak.get(host, 0), active[host])
+        time.sleep(0.02)
+        with lock:
+            active[host] -= 1
+        return {"text": url}
+
+    urls = [f"https://h{index % 3}.example.com/{index}" for index in range(24)]
+    fetch_post_contents(get_post_content, urls, max_per_host=2)
+    assert peak == {"h0.example.com": 2, "h1.example.com": 2, "h2.example.com": 2}
+
+
+def test_on_result_runs_in_calling_thread_and_pool_is_reused():
+    calls = []
+    urls = [f"https://a.example.com/{index}" for index in range(5)]
+    fetch_post_contents(lambda url: {"text": url}, urls,
+                        on_result=lambda url, result: calls.append((url, threading.current_thread())))
+    executor = async_fetch.get_executor()
+    fetch_post_contents(lambda url: {"text": url}, urls)
+
+    assert sorted(url for url, _ in calls) == sorted(urls)
+    assert {thread for _, thread in calls} == {threading.current_thread()}
+    assert async_fetch.get_executor() is executor
@@ -0,0 +1,58 @@
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+
+import pytest
+import requests
+
+from common import backoff
+from common.backoff import backoff_delay, parse_retry_after
+from common.http_client import fetch
+
+
+def test_parse_retry_after_seconds_and_http_date():
+    assert parse_retry_after("120") == 120.0
+    assert parse_retry_after(None) is None
+    assert parse_retry_after("soon") is None
+    retry_at = datetime.now(timezone.utc) + timedelta(seconds=30)
+    assert 25 <= parse_retry_after(format_datetime(retry_at, usegmt=True)) <= 30
+    # 이미 지난 시각이면 바로 재시도
+    assert parse_retry_after(format_datetime(retry_at - timedelta(hours=1), usegmt=True)) == 0.0
+
+
+def test_backoff_delay_grows_exponentially_with_jitter_and_cap(monkeypatch):
+    monkeypatch.setattr(backoff, "BASE_DELAY", 1.0)
+    monkeypatch.setattr(backoff, "MAX_DELAY", 60.0)
+    for attempt, delay in ((1, 1.0), (2, 2.0), (3, 4.0), (10, 60.0)):
+        for _ in range(20):
+            assert delay / 2 <= backoff_delay(attempt) <= delay
+    # Retry-After가 있으면 그 값 (최대 지연 이내)
+    assert backoff_delay(1, retry_after=7) == 7
+    assert backoff_delay(1, retry_after=600) == 60.0
+
+
+def test_fetch_retries_throttled_and_server_errors(scripted_server):
+    scripted_server.script("/list", (429, {"Retry-After": "1"}, ""), (503, {}, ""), (200, {}, "목록"))
+    response = fetch(scripted_server.url("/list"), max_retries=2)
+    assert response.status_code == 200
+    assert response.text == "목록"
+    assert len(scripted_server.requests) == 3
+
+
+def test_fetch_returns_last_response_when_retries_run_out(scripted_server):
+    scripted_server.script("/down", (502, {}, "오류"))
+    response = fetch(scripted_server.url("/down"), max_retries=1)
+    assert response.status_code == 502
+    assert len(scripted_server.requests) == 2
+
+
+def test_fetch_does_not_retry_client_errors(scripted_server):
+    scripted_server.script("/missing", (404, {}, ""))
+    assert fetch(scripted_server.url("/missing"), max_retries=3).status_code == 404
+    assert len(scripted_server.requests) == 1
+
+
+def test_fetch_retries_connection_errors_then_raises(scripted_server):
+    url = scripted_server.url("/gone")
+    scripted_server.close()
+    with pytest.raises(requests.ConnectionError):
+        fetch(url, max_retries=1)
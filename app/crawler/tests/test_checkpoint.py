@@ -0,0 +1,108 @@
+import sqlite3
+import time
+
+import pytest
+
+from common import checkpoint as checkpoint_module
+from common.checkpoint import Checkpoint, resumable_crawlers
+from common.record_sink import RUN_ID_ENV
+
+
+@pytest.fixture
+def db_path(tmp_path, monkeypatch):
+    monkeypatch.setattr(checkpoint_module, "CHECKPOINT_ENABLED", True)
+    monkeypatch.setenv(RUN_ID_ENV, "test-run")
+    return str(tmp_path / "state.db")
+
+
+def links(*numbers):
+    return [f"https://example.com/{number}" for number in numbers]
+
+
+def test_interrupted_run_resumes_without_refetching(db_path):
+    fetched = []
+
+    def get_post_content(url):
+        fetched.append(url)
+        if url.endswith("/3"):
+            return {"text": "요청 타임아웃", "images": []}
+        return {"text": f"본문 {url}", "images": []}
+
+    first = Checkpoint("/crawler/sample_board.py", path=db_path)
+    first.save(1, links(1, 2, 3, 4))
+    contents = first.fetch_contents(get_post_content, links(1, 2, 3, 4))
+    first.done(links(1)[0], contents[0])
+    first.done(links(3)[0], contents[2])  # 수집 실패는 끝낸 게시글로 기록하지 않음
+    first.close()  # clear() 없이 중단
+
+    assert resumable_crawlers(db_path) == {"sample_board"}
+    fetched.clear()
+    second = Checkpoint("/crawler/sample_board.py", path=db_path)
+    posts = [{"Link": link} for link in links(1, 2, 3, 4, 5)]
+    remaining = [post["Link"] for post in second.remaining(posts)]
+    assert remaining == links(2, 3, 4, 5)
+
+    second.save(1, remaining)
+    contents = second.fetch_contents(get_post_content, remaining)
+    # 2, 4는 이전 실행의 상세 수집 결과를 재사용하고 실패했던 3과 새 글 5만 다시 요청
+    assert sorted(fetched) == links(3, 5)
+    assert contents[0]["text"] == f"본문 {links(2)[0]}"
+
+    second.clear()
+    second.close()
+    assert resumable_crawlers(db_path) == set()
+    third = Checkpoint("/crawler/sample_board.py", path=db_path)
+    assert third.resumed is None
+    assert third.remaining(posts) == posts
+    third.close()
+
+
+def test_posts_are_stored_one_row_each(db_path):
+    checkpoint = Checkpoint("/crawler/sample_board.py", path=db_path)
+    checkpoint.save(1, links(1, 2))
+    checkpoint.fetch_contents(lambda url: {"text": "본문", "images": []}, links(1, 2))
+    checkpoint.done(links(1)[0])
+    checkpoint.close()
+
+    conn = sqlite3.connect(db_path)
+    rows = conn.execute("SELECT link, done, result IS NOT NULL FROM crawl_checkpoint_posts ORDER BY link").fetchall()
+    conn.close()
+    assert rows == [(links(1)[0], 1, 0), (links(2)[0], 0, 1)]
+
+
+def test_failed_fetch_flag_is_not_checkpointed(db_path):
+    checkpoint = Checkpoint("/crawler/sample_board.py", path=db_path)
+    checkpoint.save(1, links(1))
+    result = checkpoint.fetch_contents(lambda url: {"text": "본문", "images": [], "failed": True}, links(1))[0]
+    checkpoint.done(links(1)[0], result)
+    assert checkpoint.fetched == {}
+    assert checkpoint.done_links == set()
+    checkpoint.close()
+
+
+def test_expired_checkpoint_is_discarded(db_path, monkeypatch):
+    checkpoint = Checkpoint("/crawler/sample_board.py", path=db_path)
+    checkpoint.save(2, links(1))
+    checkpoint.done(links(1)[0])
+    checkpoint.close()
+
+    later = time.time() + (checkpoint_module.CHECKPOINT_MAX_AGE_MINUTES + 1) * 60
+    monkeypatch.setattr(checkpoint_module.time, "time", lambda: later)
+    assert resumable_crawlers(db_path) == set()
+    resumed = Checkpoint("/crawler/sample_board.py", path=db_path)
+    assert resumed.resumed is None
+    assert resumed.done_links == set()
+    resumed.close()
+
+
+def test_disabled_checkpoint_records_nothing(db_path, monkeypatch):
+    monkeypatch.setattr(checkpoint_module, "CHECKPOINT_ENABLED", False)
+    checkpoint = Checkpoint("/crawler/sample_board.py", path=db_path)
+    checkpoint.save(1, links(1))
+    checkpoint.done(links(1)[0])
+    checkpoint.close()
+
+    conn = sqlite3.connect(db_path)
+    assert conn.execute("SELECT COUNT(*) FROM crawl_checkpoints").fetchone()[0] == 0
+    assert conn.execute("SELECT COUNT(*) FROM crawl_checkpoint_posts").fetchone()[0] == 0
+    conn.close()
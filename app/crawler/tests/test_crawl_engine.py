@@ -0,0 +1,129 @@
+import pytest
+
+from common import checkpoint, record_sink, seen_store
+from common.crawl_engine import crawl
+from common.record_sink import read_records, sink_path
+from common.site_spec import Field, SiteSpec
+
+TODAY = "09:30"
+OLD = "2020.01.01"
+
+
+@pytest.fixture
+def state(tmp_path, monkeypatch):
+    monkeypatch.setattr(seen_store, "STATE_DB_PATH", str(tmp_path / "state.db"))
+    monkeypatch.setattr(seen_store, "INCREMENTAL", False)
+    monkeypatch.setattr(checkpoint, "CHECKPOINT_DB_PATH", str(tmp_path / "state.db"))
+    monkeypatch.setattr(checkpoint, "CHECKPOINT_ENABLED", False)
+    monkeypatch.setattr(record_sink, "SINK_DIR", str(tmp_path / "sink"))
+    monkeypatch.setenv(record_sink.RUN_ID_ENV, "test-run")
+    return tmp_path
+
+
+def make_spec(server, state, **options):
+    settings = dict(
+        list_url=server.url("/list"), page_url="{url}?page={page}", max_pages=None,
+        date_formats=("%Y.%m.%d", "%H:%M"), today_only=True, stop_after_empty_pages=1,
+    )
+    settings.update(options)
+    return SiteSpec(
+        str(state / "sample_board.py"), community="t",
+        row_selector="tr.post",
+        fields={"Post ID": Field("td.num"), "Title": Field("td.title a"), "Link": Field("td.title a", attr="href"),
+                "Date": Field("td.date"), "Views": Field("td.views", convert="int")},
+        content_selectors=("div.content",),
+        **settings,
+    )
+
+
+def list_page(*rows):
+    cells = "".join(f'<tr class="post"><td class="num">{post_id}</td><td class="title"><a href="/post/{post_id}">'
+                    f'제목 {post_id}</a></td><td class="date">{date}</td><td class="views">{views}</td></tr>'
+                    for post_id, date, views in rows)
+    return f"<table>{cells}</table>"
+
+
+def detail_page(post_id):
+    return f'<div class="content"><p>본문 {post_id}</p><img src="/img/{post_id}.png"></div>'
+
+
+def script_details(server, *post_ids):
+    for post_id in post_ids:
+        server.script(f"/post/{post_id}", (200, {}, detail_page(post_id)))
+
+
+def requested(server):
+    return [path for path, _ in server.requests]
+
+
+def test_crawl_collects_today_posts_until_an_empty_page(scripted_server, state):
+    scripted_server.script("/list", (200, {}, list_page(("1", TODAY, 300), ("2", TODAY, 50))))
+    scripted_server.script("/list?page=2", (200, {}, list_page(("3", TODAY, 500), ("4", OLD, 900))))
+    scripted_server.script("/list?page=3", (200, {}, list_page(("5", OLD, 900))))
+    script_details(scripted_server, "1", "3")
+    spec = make_spec(scripted_server, state, min_views=100)
+
+    df = crawl(spec)
+    assert sorted(df["Post ID"]) == ["1", "3"]
+    row = df[df["Post ID"] == "1"].iloc[0]
+    assert row["Content"] == "본문 1"
+    assert row["Images"] == [scripted_server.url("/img/1.png")]
+    assert row["Link"] == scripted_server.url("/post/1")
+    assert row["Community"] == "t"
+    assert "/list?page=4" not in requested(scripted_server)
+    assert {record["Post ID"] for record in read_records(sink_path(spec.script, "test-run"))} == {"1", "3"}
+
+
+def test_empty_without_posts_counts_pages_without_kept_posts(scripted_server, state):
+    # 오늘 글은 있지만 조회수 기준을 넘는 글이 없는 페이지 (fmkorea)
+    scripted_server.script("/list", (200, {}, list_page(("1", TODAY, 10))))
+    scripted_server.script("/list?page=2", (200, {}, list_page(("2", TODAY, 900))))
+    script_details(scripted_server, "2")
+
+    assert crawl(make_spec(scripted_server, state, min_views=100)) is not None
+    assert "/list?page=2" in requested(scripted_server)
+
+    scripted_server.requests.clear()
+    spec = make_spec(scripted_server, state, min_views=100, empty_without_posts=True)
+    assert crawl(spec) is None
+    assert requested(scripted_server) == ["/list"]
+
+
+def test_drop_failed_excludes_posts_whose_detail_failed(scripted_server, state):
+    scripted_server.script("/list", (200, {}, list_page(("1", TODAY, 300), ("2", TODAY, 300))))
+    scripted_server.script("/list?page=2", (200, {}, list_page(("3", OLD, 300))))
+    script_details(scripted_server, "1")
+    scripted_server.script("/post/2", (404, {}, ""))
+
+    df = crawl(make_spec(scripted_server, state))
+    assert df[df["Post ID"] == "2"].iloc[0]["Content"].startswith("로드 오류")
+
+    assert list(crawl(make_spec(scripted_server, state, drop_failed=True))["Post ID"]) == ["1"]
+
+
+def test_unchanged_posts_skip_detail_fetch_on_next_run(scripted_server, state, monkeypatch):
+    monkeypatch.setattr(seen_store, "INCREMENTAL", True)
+    scripted_server.script("/list", (200, {}, list_page(("1", TODAY, 300), ("2", TODAY, 300))),
+                           (200, {}, list_page(("1", TODAY, 300), ("2", TODAY, 450))))
+    scripted_server.script("/list?page=2", (200, {}, list_page(("3", OLD, 300))))
+    script_details(scripted_server, "1", "2")
+    spec = make_spec(scripted_server, state)
+
+    assert len(crawl(spec)) == 2
+    scripted_server.requests.clear()
+    df = crawl(spec)
+    # 조회수가 바뀐 게시글만 다시 수집
+    assert list(df["Post ID"]) == ["2"]
+    assert "/post/1" not in requested(scripted_server)
+    assert "/post/2" in requested(scripted_server)
+
+
+def test_overrides_replace_spec_settings(scripted_server, state):
+    scripted_server.script("/list", (200, {}, list_page(("1", TODAY, 300))))
+    scripted_server.script("/list?page=2", (200, {}, list_page(("2", TODAY, 300))))
+    script_details(scripted_server, "1", "2")
+    spec = make_spec(scripted_server, state)
+
+    assert list(crawl(spec, max_pages=1)["Post ID"]) == ["1"]
+    assert "/list?page=2" not in requested(scripted_server)
+    assert spec.max_pages is None
@@ -0,0 +1,36 @@
+from common.cycle_budget import CycleBudget
+from common.registry import CrawlerInfo
+from common.site_scheduler import SiteJob
+
+
+def make_job(name, group, deadline_minutes, start, run_id="test"):
+    info = CrawlerInfo(f"/{group}/{name}.py", group, host=f"{name}.example.com", priority=2,
+                       interval=deadline_minutes, deadline=deadline_minutes)
+    return SiteJob(info, start, run_id)
+
+
+def test_long_deadline_job_is_not_limited_by_short_deadline_job(monkeypatch):
+    monkeypatch.setattr("common.cycle_budget.CYCLE_BUDGET_SECONDS", 330 * 60)
+    start = 1_000_000.0
+    short = [make_job(f"short_{index}", "hotissue", 60, start) for index in range(2)]
+    long = [make_job(f"long_{index}", "hotissue", 720, start) for index in range(8)]
+    stats = {job.info.name: {"avg_seconds": 900, "avg_records": 10} for job in short + long}
+    budget = CycleBudget(short + long, start, workers=4, stats=stats)
+
+    # 짧은 마감의 작업은 자기 마감(60분)까지만
+    assert budget.admit(short[0], start) == 3600
+    # 긴 마감의 작업은 건너뛰거나 60분으로 줄이지 않고 주기 예산까지
+    allowance = budget.admit(long[0], start)
+    assert allowance is not None
+    assert allowance == 330 * 60
+    assert budget.entries[long[0].info.name]["status"] == "run"
+
+
+def test_default_budget_ignores_job_deadlines(monkeypatch):
+    monkeypatch.setattr("common.cycle_budget.CYCLE_BUDGET_SECONDS", 330 * 60)
+    start = 1_000_000.0
+    jobs = [make_job("short", "hotissue", 60, start), make_job("long", "politics", 720, start)]
+    budget = CycleBudget(jobs, start, workers=4)
+    assert budget.budget_seconds == 330 * 60
+    assert budget.job_deadline(jobs[0]) == start + 3600
+    assert budget.job_deadline(jobs[1]) == start + 330 * 60
@@ -0,0 +1,83 @@
+import os
+import subprocess
+import sys
+from datetime import datetime
+
+from crawler_schedule import upsert_site_info_batch
+
+
+class FakeCursor:
+    """조회 결과를 미리 정해 두고 실행한 문장을 기록하는 커서"""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.executed = []
+
+    def execute(self, query, params=None):
+        self.executed.append((query, params))
+
+    def executemany(self, query, values_list):
+        self.executed.append((query, values_list))
+
+    def fetchall(self):
+        return self.rows
+
+
+def site_row(key, use_title_writer=False, reg_date="2025-03-18 15:00:00", views="10"):
+    if use_title_writer:
+        values = ("", "1", "", key[0], "https://example.com/1", key[1], reg_date, views, "1", "본문", "[]")
+    else:
+        values = (key[0], key[1], "", "제목", f"https://example.com/{key[0]}", "작성자", reg_date, views, "1", "본문", "[]")
+    return {"key": key, "use_title_writer": use_title_writer, "values": values}
+
+
+def test_rows_are_matched_by_the_key_index_mysql_returns():
+    rows = [site_row(("Title ", "Writer"), use_title_writer=True)]
+    # DB가 콜레이션으로 찾은 행 (키 값은 달라도 파생 테이블의 번호로 대응됨)
+    cursor = FakeCursor([(0, 7, datetime(2025, 3, 18, 15), 5, 1, "본문", "[]")])
+
+    inserted, updated, skipped = upsert_site_info_batch(cursor, "pgm_hot_site", rows)
+
+    select_query, select_params = cursor.executed[0]
+    assert "JOIN pgm_hot_site AS t ON t.title = k.k1 AND t.writer = k.k2" in select_query
+    assert select_params == [0, "Title ", "Writer"]
+    assert (inserted, updated, skipped) == (0, 1, 0)
+    assert cursor.executed[-1][1] == [(7,) + rows[0]["values"]]
+
+
+def test_new_keys_are_inserted_with_duplicate_key_update():
+    rows = [site_row(("1", "9")), site_row(("2", "9")), site_row(("1", "9"), views="11")]
+    cursor = FakeCursor([])
+
+    assert upsert_site_info_batch(cursor, "pgm_hot_site", rows) == (2, 0, 0)
+    insert_query, inserted = cursor.executed[1]
+    assert "ON DUPLICATE KEY UPDATE" in insert_query
+    # 같은 배치에 다시 나온 게시글은 먼저 삽입할 행의 값을 갱신
+    assert [values[0] for values in inserted] == ["1", "2"]
+    assert inserted[0][7] == "11"
+
+
+def test_existing_datetime_reg_date_is_compared_as_before():
+    rows = [site_row(("1", "9"))]
+    # DB가 돌려준 reg_date(datetime)는 예전처럼 변환하지 않고 비교하므로 업데이트됨
+    cursor = FakeCursor([(0, 3, datetime(2025, 3, 18, 15), 10, 1, "본문", "[]")])
+    assert upsert_site_info_batch(cursor, "pgm_hot_site", rows) == (0, 1, 0)
+
+    cursor = FakeCursor([(0, 3, "2025-03-18 15:00:00", 10, 1, "본문", "[]")])
+    assert upsert_site_info_batch(cursor, "pgm_hot_site", rows) == (0, 0, 1)
+
+
+def test_keys_matching_the_same_record_update_it_once():
+    rows = [site_row(("A1", "9"), views="11"), site_row(("a1", "9"), views="12")]
+    cursor = FakeCursor([(0, 3, "2025-03-18 15:00:00", 10, 1, "본문", "[]"),
+                         (1, 3, "2025-03-18 15:00:00", 10, 1, "본문", "[]")])
+
+    assert upsert_site_info_batch(cursor, "pgm_hot_site", rows) == (0, 1, 0)
+    assert cursor.executed[-1][1] == [(3,) + rows[1]["values"]]
+
+
+def test_import_does_not_create_log_files(tmp_path):
+    crawler_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    subprocess.run([sys.executable, "-c", f"import sys; sys.path.insert(0, {crawler_dir!r}); import crawler_schedule"],
+                   cwd=tmp_path, check=True)
+    assert not (tmp_path / "logs").exists()
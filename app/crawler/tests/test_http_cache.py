@@ -0,0 +1,75 @@
+import pytest
+
+from common import http_cache
+from common.http_cache import HttpCache
+from common.http_client import fetch
+
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch, scripted_server):
+    cache = HttpCache(str(tmp_path / "http_cache.db"))
+    monkeypatch.setattr(http_cache, "HTTP_CACHE_ENABLED", True)
+    monkeypatch.setattr(http_cache, "_cache", cache)
+    return cache
+
+
+def sent_header(server, index, name):
+    return {key.lower(): value for key, value in server.requests[index][1].items()}.get(name.lower())
+
+
+def test_revalidates_with_etag_and_fills_304_from_cache(cache, scripted_server):
+    scripted_server.script("/post/1",
+                           (200, {"ETag": '"v1"', "Content-Type": "text/html; charset=utf-8"}, "<p>본문</p>"),
+                           (304, {"ETag": '"v1"'}, ""))
+    url = scripted_server.url("/post/1")
+
+    first = fetch(url)
+    assert first.text == "<p>본문</p>"
+    assert not getattr(first, "from_cache", False)
+    assert sent_header(scripted_server, 0, "If-None-Match") is None
+
+    second = fetch(url)
+    assert sent_header(scripted_server, 1, "If-None-Match") == '"v1"'
+    assert second.status_code == 200
+    assert second.from_cache
+    assert second.text == "<p>본문</p>"
+
+
+def test_sends_if_modified_since_for_last_modified(cache, scripted_server):
+    modified = "Sat, 17 Oct 2026 09:00:00 GMT"
+    scripted_server.script("/list", (200, {"Last-Modified": modified}, "목록"), (304, {}, ""))
+    url = scripted_server.url("/list")
+
+    fetch(url)
+    assert fetch(url).text == "목록"
+    assert sent_header(scripted_server, 1, "If-Modified-Since") == modified
+
+
+def test_changed_body_replaces_cache_entry(cache, scripted_server):
+    scripted_server.script("/post/2", (200, {"ETag": '"v1"'}, "이전"), (200, {"ETag": '"v2"'}, "수정됨"))
+    url = scripted_server.url("/post/2")
+
+    fetch(url)
+    assert fetch(url).text == "수정됨"
+    assert cache.lookup(url)["etag"] == '"v2"'
+    assert bytes(cache.lookup(url)["body"]).decode("utf-8") == "수정됨"
+
+
+def test_entry_removed_when_validators_disappear(cache, scripted_server):
+    scripted_server.script("/post/3", (200, {"ETag": '"v1"'}, "본문"), (200, {}, "본문"))
+    url = scripted_server.url("/post/3")
+
+    fetch(url)
+    assert cache.lookup(url) is not None
+    fetch(url)
+    assert cache.lookup(url) is None
+
+
+def test_requests_with_params_bypass_cache(cache, scripted_server):
+    scripted_server.script("/search?q=1", (200, {"ETag": '"v1"'}, "검색"))
+    url = scripted_server.url("/search")
+
+    fetch(url, params={"q": "1"})
+    fetch(url, params={"q": "1"})
+    assert sent_header(scripted_server, 1, "If-None-Match") is None
+    assert cache.lookup(url) is None
@@ -0,0 +1,74 @@
+import pytest
+
+from common import rate_limiter
+from common.rate_limiter import TokenBucket, get_limiter, get_site_key
+
+
+class FakeClock:
+    """time.monotonic / time.sleep 대체 (sleep하면 시간이 그만큼 흐름)"""
+
+    def __init__(self):
+        self.now = 1000.0
+        self.slept = []
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.slept.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(rate_limiter.time, "monotonic", clock.monotonic)
+    monkeypatch.setattr(rate_limiter.time, "sleep", clock.sleep)
+    return clock
+
+
+def test_burst_then_waits_for_tokens(clock):
+    bucket = TokenBucket(rate=2.0, burst=2)
+    assert bucket.acquire() == 0.0
+    assert bucket.acquire() == 0.0
+    # 토큰이 없으면 다음 토큰이 찰 때까지 (1 / rate초) 대기
+    assert bucket.acquire() == pytest.approx(0.5)
+    assert clock.slept == [pytest.approx(0.5)]
+
+
+def test_pause_blocks_until_retry_after(clock):
+    bucket = TokenBucket(rate=10.0, burst=5)
+    bucket.pause(30)
+    assert bucket.acquire() == pytest.approx(30)
+
+
+def test_throttled_responses_halve_rate_and_healthy_streak_recovers(clock):
+    bucket = TokenBucket(rate=1.0, burst=1)
+    bucket.record_response(429, 0.1)
+    assert bucket.rate == 0.5
+    # 같은 간격 안의 실패는 한 번만 감속
+    bucket.record_response(503, 0.1)
+    assert bucket.rate == 0.5
+    clock.now += 2
+    bucket.record_response(None, 0.0)
+    assert bucket.rate == 0.25
+    clock.now += 10
+    for _ in range(20):
+        bucket.record_response(200, 0.1)
+    # RECOVERY_STREAK(5)번 연속 정상 응답마다 최대 속도의 10%씩 회복
+    assert bucket.rate == pytest.approx(0.25 + 4 * 0.1)
+
+
+def test_rate_never_drops_below_minimum(clock):
+    bucket = TokenBucket(rate=1.0, burst=1)
+    for _ in range(10):
+        clock.now += 100
+        bucket.record_response(200, rate_limiter.SLOW_LATENCY + 1)
+    assert bucket.rate == rate_limiter.MIN_RATE_RATIO
+
+
+def test_subdomains_share_the_site_limiter():
+    assert get_site_key("https://gall.dcinside.com/board/lists?id=x") == "dcinside.com"
+    assert get_site_key("https://m.ruliweb.com:443/best") == "ruliweb.com"
+    assert get_site_key("https://unknown.example.com/") == "unknown.example.com"
+    assert get_limiter("https://gall.dcinside.com/a") is get_limiter("https://www.dcinside.com/b")
@@ -0,0 +1,61 @@
+import os
+from datetime import datetime
+
+from common import record_sink
+from common.record_sink import RecordSink, read_records, remove_sink, sink_path
+
+
+def post(post_id):
+    return {"Post ID": post_id, "Title": f"제목 {post_id}", "Date": datetime(2026, 10, 18, 9, 30)}
+
+
+def test_rows_are_buffered_until_flush_every(tmp_path):
+    path = str(tmp_path / "run" / "clien_politics.jsonl")
+    sink = RecordSink(path, flush_every=3, flush_seconds=3600)
+    sink.write(post("1"))
+    sink.write(post("2"))
+    assert read_records(path) == []
+
+    sink.write(post("3"))
+    assert [row["Post ID"] for row in read_records(path)] == ["1", "2", "3"]
+    assert read_records(path)[0]["Date"] == "2026-10-18 09:30:00"
+
+    sink.write(post("4"))
+    sink.close()
+    assert len(read_records(path)) == 4
+    assert sink.count == 4
+
+
+def test_flushes_after_flush_seconds(tmp_path):
+    path = str(tmp_path / "inven_openissue.jsonl")
+    sink = RecordSink(path, flush_every=100, flush_seconds=0)
+    sink.write(post("1"))
+    assert len(read_records(path)) == 1
+    sink.close()
+
+
+def test_truncated_last_line_is_skipped(tmp_path):
+    path = str(tmp_path / "theqoo_politics.jsonl")
+    with RecordSink(path, flush_every=1) as sink:
+        sink.write(post("1"))
+    with open(path, "a", encoding="utf-8") as f:
+        f.write('{"Post ID": "2", "Ti')
+
+    assert [row["Post ID"] for row in read_records(path)] == ["1"]
+    assert read_records(str(tmp_path / "missing.jsonl")) == []
+
+
+def test_sink_path_uses_run_id_and_script_name(tmp_path, monkeypatch):
+    monkeypatch.setattr(record_sink, "SINK_DIR", str(tmp_path))
+    monkeypatch.setenv(record_sink.RUN_ID_ENV, "20261018_090000")
+    path = RecordSink.for_script("/code/app/crawler/dcinside_politics.py").path
+    assert path == sink_path("dcinside_politics.py", "20261018_090000")
+    assert path == os.path.join(str(tmp_path), "20261018_090000", "dcinside_politics.jsonl")
+
+
+def test_remove_sink_deletes_file_and_empty_run_dir(tmp_path):
+    path = str(tmp_path / "20261018_090000" / "clien_politics.jsonl")
+    with RecordSink(path) as sink:
+        sink.write(post("1"))
+    remove_sink(path)
+    assert not os.path.exists(os.path.dirname(path))
@@ -0,0 +1,74 @@
+from common import metrics, seen_store
+from common.seen_store import SeenStore, is_failed_content
+
+
+def make_store(tmp_path, monkeypatch, community="1"):
+    monkeypatch.setattr(seen_store, "INCREMENTAL", True)
+    return SeenStore(community, path=str(tmp_path / "state.db"))
+
+
+def post(post_id, views, content="본문", recommend="0"):
+    return {"Post ID": post_id, "Link": f"https://example.com/{post_id}", "Views": views,
+            "Recommend": recommend, "Content": content}
+
+
+def counter(name, crawler):
+    return metrics.registry.values.get((name, (("crawler", crawler),)), 0)
+
+
+def test_failed_content_includes_timeouts():
+    for text in ("", None, "로드 오류: 500", "요청 타임아웃", "내용을 찾을 수 없습니다.", "유효하지 않은 URL"):
+        assert is_failed_content(text)
+    assert not is_failed_content("정상 본문")
+
+
+def test_filter_changed_skips_unchanged_posts(tmp_path, monkeypatch):
+    store = make_store(tmp_path, monkeypatch)
+    store.mark_posts_seen([post("1", 10), post("2", 20)])
+
+    changed = store.filter_changed([post("1", 10), post("2", 21), post("3", 5)])
+    assert [row["Post ID"] for row in changed] == ["2", "3"]
+    # 추천수 비교를 끄면 조회수만 봄
+    assert store.filter_changed([post("1", 10, recommend="5")], compare_recommend=False) == []
+    assert store.filter_changed([post("1", 10, recommend="5")]) != []
+
+
+def test_failed_posts_are_not_marked_seen(tmp_path, monkeypatch):
+    store = make_store(tmp_path, monkeypatch)
+    store.mark_posts_seen([post("1", 10, content="요청 타임아웃"), post("2", 10, content=""), post("3", 10)])
+    assert store.get("1") is None
+    assert store.get("2") is None
+    assert store.get("3")["views"] == "10"
+
+
+def test_found_posts_are_counted_once_per_list_row(tmp_path, monkeypatch):
+    monkeypatch.setattr(metrics, "_current_crawler", "seen_store_test")
+    store = make_store(tmp_path, monkeypatch)
+    store.mark_posts_seen([post("1", 10)])
+    found = counter("crawler_posts_found_total", "seen_store_test")
+    unchanged = counter("crawler_posts_unchanged_total", "seen_store_test")
+
+    store.filter_changed([post("1", 10), post("2", 10)])
+    # is_unchanged만 호출하는 것은 발견 게시글로 세지 않음
+    store.is_unchanged("1", 10)
+    assert counter("crawler_posts_found_total", "seen_store_test") == found + 2
+    assert counter("crawler_posts_unchanged_total", "seen_store_test") == unchanged + 1
+
+
+def test_reached_seen_territory_after_consecutive_seen_pages(tmp_path, monkeypatch):
+    monkeypatch.setattr(seen_store, "SEEN_STOP_PAGES", 2)
+    store = make_store(tmp_path, monkeypatch)
+    store.mark_posts_seen([post("1", 10), post("2", 10)])
+
+    assert not store.reached_seen_territory(["1", "2"])
+    assert not store.reached_seen_territory(["2", "3"])  # 새 글이 있으면 연속 횟수 초기화
+    assert not store.reached_seen_territory(["1"])
+    assert store.reached_seen_territory(["2"])
+
+
+def test_stores_are_separate_per_community(tmp_path, monkeypatch):
+    first = make_store(tmp_path, monkeypatch, community="1")
+    second = make_store(tmp_path, monkeypatch, community="2")
+    first.mark_posts_seen([post("1", 10)])
+    assert first.get("1") is not None
+    assert second.get("1") is None
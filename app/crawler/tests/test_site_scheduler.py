@@ -0,0 +1,95 @@
+import threading
+import time
+
+from common import checkpoint, registry
+from common.checkpoint import Checkpoint
+from common.registry import CrawlerInfo
+from common.site_scheduler import ScheduleState, SiteScheduler
+
+SCRIPT = "/hotissue/fmkorea_funnyboard.py"
+
+
+def make_scheduler(tmp_path, monkeypatch, info):
+    monkeypatch.setattr(checkpoint, "CHECKPOINT_DB_PATH", str(tmp_path / "state.db"))
+    monkeypatch.setattr(checkpoint, "CHECKPOINT_ENABLED", True)
+    monkeypatch.setattr(registry, "enabled_crawlers", lambda: [info])
+    state = ScheduleState(str(tmp_path / "state.db"))
+    return state, SiteScheduler(lambda job: True, state=state)
+
+
+def test_restart_resumes_interrupted_run_from_checkpoint(tmp_path, monkeypatch):
+    info = CrawlerInfo(SCRIPT, "hotissue", host="www.fmkorea.com", interval=360)
+    state, _ = make_scheduler(tmp_path, monkeypatch, info)
+
+    # 10분 전에 시작한 실행이 게시글 하나를 끝내고 중단됨 (종료 기록 없음)
+    now = time.time()
+    state.started(info.name, now - 600)
+    interrupted = Checkpoint.for_script(SCRIPT)
+    interrupted.save(1, ["https://www.fmkorea.com/1", "https://www.fmkorea.com/2"])
+    interrupted.done("https://www.fmkorea.com/1")
+    interrupted.close()
+
+    # 재시작한 스케줄러는 간격(360분)을 기다리지 않고 바로 실행
+    scheduler = SiteScheduler(lambda job: True, state=state)
+    jobs = scheduler.enqueue_due(now)
+    assert [job.info.name for job in jobs] == [info.name]
+
+    resumed = Checkpoint.for_script(SCRIPT)
+    assert resumed.resumed is not None
+    posts = [{"Link": "https://www.fmkorea.com/1"}, {"Link": "https://www.fmkorea.com/2"}]
+    assert resumed.remaining(posts) == [{"Link": "https://www.fmkorea.com/2"}]
+    resumed.close()
+    state.close()
+
+
+def test_restart_resumes_when_checkpoint_left_by_finished_run(tmp_path, monkeypatch):
+    info = CrawlerInfo(SCRIPT, "hotissue", host="www.fmkorea.com", interval=360)
+    state, scheduler = make_scheduler(tmp_path, monkeypatch, info)
+
+    # 타임아웃으로 끝난 실행 (종료 기록은 있지만 체크포인트가 남음)
+    now = time.time()
+    state.started(info.name, now - 600)
+    state.finished(info.name, now - 300, "failed")
+    interrupted = Checkpoint.for_script(SCRIPT)
+    interrupted.save(1, ["https://www.fmkorea.com/1"])
+    interrupted.close()
+
+    assert [job.info.name for job in scheduler.enqueue_due(now)] == [info.name]
+    state.close()
+
+
+def test_restart_waits_for_interval_after_completed_run(tmp_path, monkeypatch):
+    info = CrawlerInfo(SCRIPT, "hotissue", host="www.fmkorea.com", interval=360)
+    state, scheduler = make_scheduler(tmp_path, monkeypatch, info)
+
+    now = time.time()
+    state.started(info.name, now - 600)
+    state.finished(info.name, now - 300, "success")
+
+    assert scheduler.enqueue_due(now) == []
+    assert scheduler.next_due_time() == now - 600 + info.interval
+    state.close()
+
+
+def test_run_forever_picks_up_crawlers_added_later(tmp_path, monkeypatch):
+    info = CrawlerInfo(SCRIPT, "hotissue", host="www.fmkorea.com", interval=360)
+    crawlers = []
+    monkeypatch.setattr(checkpoint, "CHECKPOINT_DB_PATH", str(tmp_path / "state.db"))
+    monkeypatch.setattr(registry, "enabled_crawlers", lambda: list(crawlers))
+    ran = threading.Event()
+
+    def run_job(job):
+        ran.set()
+        return True
+
+    # 등록된 크롤러가 없어 타이머가 없어도 registry_poll_seconds마다 레지스트리를 다시 읽음
+    scheduler = SiteScheduler(run_job, max_workers=1, registry_poll_seconds=0.05)
+    thread = threading.Thread(target=scheduler.run_forever, daemon=True)
+    thread.start()
+    try:
+        time.sleep(0.1)
+        crawlers.append(info)
+        assert ran.wait(2)
+    finally:
+        scheduler.stop()
+        thread.join(2)
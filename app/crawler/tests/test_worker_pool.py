@@ -0,0 +1,77 @@
+import textwrap
+
+import pytest
+
+from common.worker_pool import CrawlerFailed, CrawlerTimeout, CrawlerWorkerPool
+
+
+def write_script(tmp_path, name, body):
+    path = tmp_path / f"{name}.py"
+    path.write_text(textwrap.dedent(body), encoding="utf-8")
+    return str(path)
+
+
+@pytest.fixture
+def pool(tmp_path, monkeypatch):
+    # 워커는 spawn으로 시작하므로 환경 변수로 넘긴 로그 위치를 씀
+    monkeypatch.setenv("CRAWLER_LOG_DIR", str(tmp_path / "crawler_logs"))
+    monkeypatch.chdir(tmp_path)
+    pool = CrawlerWorkerPool(1)
+    yield pool
+    pool.close()
+
+
+def test_worker_returns_records_and_reuses_the_process(tmp_path, pool):
+    script = write_script(tmp_path, "sample_crawler", """
+        import os
+
+        def run():
+            return [{"Title": "제목", "pid": os.getpid()}]
+    """)
+    first = pool.run(script, timeout_seconds=60)
+    second = pool.run(script, timeout_seconds=60)
+    assert first[0]["Title"] == "제목"
+    assert first[0]["pid"] == second[0]["pid"]
+
+
+def test_worker_logs_go_to_the_crawler_log_file(tmp_path, pool):
+    script = write_script(tmp_path, "logging_crawler", """
+        import logging
+
+        def run():
+            print("출력 한 줄")
+            logging.info("공용 모듈 기록")
+            return []
+    """)
+    assert pool.run(script, timeout_seconds=60) == []
+
+    log_files = list((tmp_path / "crawler_logs").glob("logging_crawler_*.log"))
+    assert len(log_files) == 1
+    text = log_files[0].read_text(encoding="utf-8")
+    assert "출력 한 줄" in text
+    assert "공용 모듈 기록" in text
+    # 워커는 스케줄러의 로그 파일을 만들지 않음
+    assert not (tmp_path / "logs").exists()
+
+
+def test_failures_and_timeouts(tmp_path, pool):
+    failing = write_script(tmp_path, "failing_crawler", """
+        def run():
+            raise ValueError("크롤러 오류")
+    """)
+    slow = write_script(tmp_path, "slow_crawler", """
+        import time
+
+        def run():
+            time.sleep(30)
+    """)
+    with pytest.raises(CrawlerFailed, match="크롤러 오류"):
+        pool.run(failing, timeout_seconds=60)
+    with pytest.raises(CrawlerTimeout):
+        pool.run(slow, timeout_seconds=1)
+    # 제한 시간을 넘긴 워커는 버리고 새 워커로 계속 실행
+    ok = write_script(tmp_path, "ok_crawler", """
+        def run():
+            return [{"Title": "다시"}]
+    """)
+    assert pool.run(ok, timeout_seconds=60) == [{"Title": "다시"}]